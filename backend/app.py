@@ -1,95 +1,293 @@
 from flask import Flask, jsonify, request
 from flask_cors import CORS
+import atexit
 import json
+import logging
 import os
+import threading
+from crew_journal import CrewJournal
+from listing import MAX_LIMIT, NUMBER, TEXT, paginate, parse_list_query
+from log_config import configure_logging
+from data_structures import FlightAggregates, FlightRouteIndex, assigned_flights, minute_of_day
 from recommendation_engine import CrewRecommendationEngine
+from recompute_pool import RecomputePool
+from response_cache import ResponseCache
+from shared_state import SharedCrewState, StaleStateError
+
+# CREWSYNC_TRACE=1 turns on the step-by-step data structure trace
+configure_logging()
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 CORS(app)
 
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+# Crew mutations are logged here and periodically compacted into crew_data.json.
+# 'sqlite' (default) is shared by all gunicorn workers; 'journal' is an
+# append-only file for single-process deployments.
+STATE_BACKEND = os.environ.get('CREWSYNC_STATE_BACKEND', 'sqlite')
+
+def open_crew_state():
+    snapshot_path = os.path.join(DATA_DIR, 'crew_data.json')
+    if STATE_BACKEND == 'journal':
+        return CrewJournal(snapshot_path)
+    return SharedCrewState(snapshot_path)
+
+CREW_STATE = open_crew_state()
+
+# Seed for the deterministic jitter in recommendation scores; every worker
+# must use the same value to return the same rankings
+SCORE_SEED = int(os.environ.get('CREWSYNC_SCORE_SEED', '0'))
+
+# Threads used to recompute recommendations for flights hit by a disruption.
+# Scoring is mostly pure Python, so more threads mainly help when the GIL is
+# released elsewhere (e.g. NumPy on large rosters); 1 computes inline.
+DISRUPTION_WORKERS = int(os.environ.get('CREWSYNC_DISRUPTION_WORKERS', '1'))
+
+# Processes that recompute disrupted flights instead, in a spawned pool that
+# maps the score matrix from shared memory; 0 or 1 (the default) keeps the
+# work in this process. Only the disruption endpoint uses it: a roster reload
+# rebuilds the engine and recommendations are computed again on demand. Each
+# gunicorn worker gets its own pool: keep workers × processes within the
+# core count, and measure with `benchmark.py scaling` on the target machine.
+RECOMPUTE_PROCESSES = int(os.environ.get('CREWSYNC_RECOMPUTE_PROCESSES', '0'))
+RECOMPUTE_POOL = RecomputePool(RECOMPUTE_PROCESSES) if RECOMPUTE_PROCESSES > 1 else None
+if RECOMPUTE_POOL is not None:
+    atexit.register(RECOMPUTE_POOL.close)
+
+# Order in which backup crew are called out: 'fifo' or 'fatigue' (most rested first)
+BACKUP_PRIORITY = os.environ.get('CREWSYNC_BACKUP_PRIORITY', 'fifo')
+
 # Load data
-def load_json_data(filename):
-    """Load JSON data from data directory"""
-    filepath = os.path.join(os.path.dirname(__file__), 'data', filename)
+def load_json_data(filename, journal=None):
+    """Load JSON data from data directory, replaying journaled changes if given"""
+    filepath = os.path.join(DATA_DIR, filename)
     with open(filepath, 'r') as f:
-        return json.load(f)
+        data = json.load(f)
+    if journal is not None:
+        journal.replay(data)
+    return data
 
-CREW_DATA = load_json_data('crew_data.json')
 FLIGHT_DATA = load_json_data('flights_data.json')
+ROUTE_DATA = load_json_data('routes_data.json')  # Directed legs with travel time in minutes
+
+# Primary-key index for O(1) single-flight lookups; it holds the same dicts as
+# FLIGHT_DATA. Crew live only in the engine as slotted records, indexed by
+# normalized emp_id (recommendation_engine.get_crew) and kept current by
+# update_crew; crew JSON is built from them at the API boundary.
+FLIGHT_INDEX = {f['flightNumber']: f for f in FLIGHT_DATA}
+
+# Flights by origin / destination airport and by departure time, for disruptions
+FLIGHT_ROUTES = FlightRouteIndex(FLIGHT_DATA)
+
+def get_flight(flight_number):
+    """O(1) flight lookup by flight number"""
+    return FLIGHT_INDEX.get(flight_number)
 
 # Initialize recommendation engine
-recommendation_engine = CrewRecommendationEngine(CREW_DATA)
+recommendation_engine = CrewRecommendationEngine(
+    load_json_data('crew_data.json', journal=CREW_STATE),
+    seed=SCORE_SEED, routes=ROUTE_DATA, backup_priority=BACKUP_PRIORITY, flights=FLIGHT_DATA
+)
+
+# Running flight counters for the dashboard, counting crew assigned since the
+# schedule from the roster; crew changes go through apply_crew_change so the
+# flights they touch stay current
+FLIGHT_STATS = FlightAggregates(FLIGHT_DATA, recommendation_engine.aggregates.assigned_by_flight)
+
+_reload_lock = threading.Lock()
+_data_generation = 0  # Bumped by every reload, since a new engine restarts data_version
+
+def reload_crew_data():
+    """Rebuild the engine from the snapshot plus the change log"""
+    global recommendation_engine, _data_generation
+    with _reload_lock:
+        crew_data = load_json_data('crew_data.json', journal=CREW_STATE)
+        recommendation_engine = CrewRecommendationEngine(
+            crew_data, seed=SCORE_SEED, routes=ROUTE_DATA, backup_priority=BACKUP_PRIORITY,
+            flights=FLIGHT_DATA
+        )
+        FLIGHT_STATS.sync(FLIGHT_DATA, recommendation_engine.aggregates.assigned_by_flight)
+        _data_generation += 1
+
+# Read endpoints serve pre-serialized bytes until the crew data changes
+response_cache = ResponseCache()
+
+def data_version():
+    """Changes whenever anything a cached response depends on may have changed"""
+    return (_data_generation, recommendation_engine.data_version)
+
+@app.before_request
+def sync_crew_state():
+    """Apply crew changes committed by other workers before serving a request"""
+    try:
+        changes = CREW_STATE.poll()
+    except StaleStateError:
+        logger.warning("Crew log compacted by another worker; reloading snapshot")
+        reload_crew_data()
+        return
+    for _, emp_id, fields in changes:
+        apply_crew_change(emp_id, fields)
+
+# Serializes crew changes so each flight's count is read from the engine and
+# written to FLIGHT_STATS without another change landing in between
+_crew_change_lock = threading.Lock()
+
+def apply_crew_change(emp_id, changes):
+    """Update a crew member in the engine and the counters of every flight they leave or join"""
+    with _crew_change_lock:
+        engine = recommendation_engine
+        crew = engine.get_crew(emp_id)
+        before = assigned_flights(crew) if crew else []
+        engine.update_crew(emp_id, changes)
+        if crew:
+            assigned_by_flight = engine.aggregates.assigned_by_flight
+            for number in set(before) | set(assigned_flights(crew)):
+                flight = get_flight(number)
+                if flight:
+                    FLIGHT_STATS.update_flight(flight, assigned_by_flight.get(number, 0))
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'crew_count': len(CREW_DATA),
+        'crew_count': len(recommendation_engine.crew_members),
         'flight_count': len(FLIGHT_DATA)
     })
 
 @app.route('/api/dashboard/stats', methods=['GET'])
+@response_cache.cached(data_version)
 def get_dashboard_stats():
-    """Get dashboard statistics"""
+    """Get dashboard statistics in O(1) from the running aggregates"""
     try:
-        # Count available crew (case-insensitive)
-        available_crew = sum(
-            1 for crew in CREW_DATA 
-            if crew.get('availability', '').lower() == 'available'
-        )
+        crew_stats = recommendation_engine.aggregates
         
-        # Count flights needing crew
-        needs_assignment = sum(
-            1 for flight in FLIGHT_DATA 
-            if flight.get('crewAssigned', 0) < flight.get('crewRequired', 6)
-        )
-        
-        # Calculate average performance
-        total_performance = sum(crew.get('performanceScore', 0) for crew in CREW_DATA)
-        avg_performance = round((total_performance / len(CREW_DATA)) / 20, 1) if CREW_DATA else 0
+        # Average performance on a 5-point scale
+        avg_performance = round(crew_stats.average('performanceScore') / 20, 1)
         
         return jsonify({
-            'totalFlights': len(FLIGHT_DATA),
-            'availableCrew': available_crew,
-            'needsAssignment': needs_assignment,
+            'totalFlights': FLIGHT_STATS.count,
+            'availableCrew': crew_stats.available,
+            'needsAssignment': FLIGHT_STATS.needs_assignment,
             'avgPerformance': avg_performance
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/dashboard/distribution', methods=['GET'])
+@response_cache.cached(data_version)
+def get_roster_distribution():
+    """Crew counts by availability, designation, base and certification"""
+    return jsonify(recommendation_engine.aggregates.snapshot())
+
+FLIGHT_SORT_FIELDS = {
+    **dict.fromkeys(['flightNumber', 'departure', 'origin', 'destination', 'aircraft', 'status', 'priority'], TEXT),
+    **dict.fromkeys(['crewRequired', 'crewAssigned'], NUMBER),
+}
+
 @app.route('/api/flights', methods=['GET'])
+@response_cache.cached(data_version)
 def get_all_flights():
-    """Get all flights"""
-    return jsonify(FLIGHT_DATA)
+    """
+    Get flights, one page at a time
+    Query: limit, cursor, sort (prefix '-' for descending), fields=a,b,c,
+    and filters origin, destination, aircraft, status, priority
+    """
+    try:
+        query = parse_list_query(request.args, FLIGHT_SORT_FIELDS, default_sort='flightNumber', id_field='flightNumber')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    filters = {
+        field: request.args[field]
+        for field in ('origin', 'destination', 'aircraft', 'status', 'priority')
+        if field in request.args
+    }
+    # An airport filter narrows the scan to that airport's flights in the route index
+    airport = filters.get('origin') or filters.get('destination')
+    candidates = FLIGHT_ROUTES.by_airport.get(airport, {}).values() if airport else FLIGHT_DATA
+    flights = (
+        f for f in candidates
+        if all(f.get(field) == value for field, value in filters.items())
+    )
+    return jsonify(paginate(flights, 'flightNumber', **query))
 
 @app.route('/api/flights/<flight_number>', methods=['GET'])
 def get_flight_by_number(flight_number):
     """Get specific flight details"""
-    flight = next((f for f in FLIGHT_DATA if f['flightNumber'] == flight_number), None)
+    flight = get_flight(flight_number)
     if not flight:
         return jsonify({'error': 'Flight not found'}), 404
     return jsonify(flight)
 
+CREW_SORT_FIELDS = {
+    **dict.fromkeys(['name', 'designation', 'baseLocation', 'availability'], TEXT),
+    **dict.fromkeys(['emp_id', 'yearsExperience', 'totalFlightHours', *CrewRecommendationEngine.WEIGHTS], NUMBER),
+}
+
 @app.route('/api/crew', methods=['GET'])
+@response_cache.cached(data_version)
 def get_all_crew():
-    """Get all crew members"""
-    return jsonify(CREW_DATA)
+    """
+    Get crew members, one page at a time
+    Query: limit, cursor, sort (prefix '-' for descending), fields=a,b,c,
+    and filters availability, base, designation, certification
+    """
+    try:
+        query = parse_list_query(request.args, CREW_SORT_FIELDS, default_sort='emp_id', id_field='emp_id')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # All filters are ANDed bitsets from the engine's bitmap index
+    engine = recommendation_engine
+    bits = engine.bitmap_index.query(
+        certification=request.args.get('certification') or None,
+        availability=request.args.get('availability') or None,
+        base=request.args.get('base') or None,
+        designation=request.args.get('designation') or None,
+    )
+    members = engine.crew_members
+    crew = (members[row] for row in engine.bitmap_index.rows(bits))
+    return jsonify(paginate(crew, 'emp_id', **query))
+
+@app.route('/api/crew/rested', methods=['GET'])
+@response_cache.cached(data_version)
+def get_rested_crew():
+    """
+    The most rested available crew, highest fatigueScore first
+    Query: limit (default 10). Served from the engine's fatigue heap in
+    O(limit log limit), whatever the roster size.
+    """
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    if not 1 <= limit <= MAX_LIMIT:
+        return jsonify({'error': f'limit must be between 1 and {MAX_LIMIT}'}), 400
+    
+    engine = recommendation_engine
+    return jsonify({
+        'items': [crew.to_dict() for crew, _ in engine.most_rested(limit)],
+        'total': engine.fatigue_heap.size(),
+    })
 
 @app.route('/api/crew/<emp_id>', methods=['GET'])
 def get_crew_by_id(emp_id):
     """Get specific crew member details"""
-    crew = next((c for c in CREW_DATA if str(c['emp_id']) == str(emp_id)), None)
+    crew = recommendation_engine.get_crew(emp_id)
     if not crew:
         return jsonify({'error': 'Crew member not found'}), 404
-    return jsonify(crew)
+    return jsonify(crew.to_dict())
 
 @app.route('/api/recommendations/<flight_number>', methods=['GET'])
+@response_cache.cached(data_version)
 def get_recommendations(flight_number):
     """Get crew recommendations for a specific flight"""
     try:
         # Find flight
-        flight = next((f for f in FLIGHT_DATA if f['flightNumber'] == flight_number), None)
+        flight = get_flight(flight_number)
         if not flight:
             return jsonify({'error': f'Flight {flight_number} not found'}), 404
         
@@ -98,9 +296,193 @@ def get_recommendations(flight_number):
         
         return jsonify(recommendations)
     except Exception as e:
-        print(f"Error getting recommendations: {str(e)}")
+        logger.error("Error getting recommendations: %s", e)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Hit/miss/eviction counters of the response and recommendation caches (per worker)"""
+    return jsonify({
+        'responses': response_cache.stats(),
+        'recommendations': recommendation_engine.recommendation_cache.stats()
+    })
+
+MAX_BATCH_TOP_K = 50
+
+@app.route('/api/recommendations/batch', methods=['POST'])
+def get_batch_recommendations():
+    """
+    Crew recommendations for many flights in one call
+    Body: {"flights": ["AI-202", ...] or "needs_crew", "top_k": 5}
+    """
+    data = request.get_json(silent=True) or {}
+    requested = data.get('flights', 'needs_crew')
+    top_k = data.get('top_k', 5)
+    if not isinstance(top_k, int) or not 1 <= top_k <= MAX_BATCH_TOP_K:
+        return jsonify({'error': f'top_k must be an integer between 1 and {MAX_BATCH_TOP_K}'}), 400
+    
+    if requested == 'needs_crew':
+        flights = [f for f in FLIGHT_DATA if FLIGHT_STATS.needs_crew(f)]
+        not_found = []
+    elif isinstance(requested, list) and all(isinstance(n, str) for n in requested):
+        flight_numbers = list(dict.fromkeys(requested))  # Dedupe, keep order
+        flights = [get_flight(n) for n in flight_numbers if get_flight(n)]
+        not_found = [n for n in flight_numbers if not get_flight(n)]
+    else:
+        return jsonify({'error': 'flights must be a list of flight numbers or "needs_crew"'}), 400
+    
+    try:
+        recommendations = recommendation_engine.get_batch_recommendations(flights, top_k=top_k)
+    except Exception as e:
+        logger.error("Error getting batch recommendations: %s", e)
+        return jsonify({'error': str(e)}), 500
+    
+    return jsonify({'recommendations': recommendations, 'notFound': not_found})
+
+# Striped per-crew locks: a booking's schedule check, claim and engine update
+# run under its crew member's lock, so two threads of this worker cannot both
+# fit the same crew member onto overlapping flights
+_BOOKING_LOCKS = [threading.Lock() for _ in range(64)]
+
+def booking_lock(crew):
+    return _BOOKING_LOCKS[hash(crew.key) % len(_BOOKING_LOCKS)]
+
+def claim_assignment(crew, flight):
+    """
+    Book one crew member onto a flight
+    Under the crew member's booking lock: check the flight fits their status
+    and duty timeline, then compare-and-set against the shared log so no
+    other worker can book them meanwhile, then update the engine's record
+    and indexes. A first duty claims on availability; later ones on the duty
+    list itself, so a concurrent booking in another worker makes this one fail.
+    Returns None on success, else why the crew member cannot be booked
+    """
+    flight_number = flight['flightNumber']
+    with booking_lock(crew):
+        conflict = recommendation_engine.schedule_conflict(crew, flight)
+        if conflict:
+            return conflict
+        
+        duties = assigned_flights(crew)
+        changes = {
+            'availability': 'Assigned',
+            'assignedFlight': flight_number,
+            'assignedFlights': duties + [flight_number]
+        }
+        if duties:
+            listed = crew.get('assignedFlights')  # None for records from before duty lists
+            claimed, _ = CREW_STATE.claim(
+                crew.emp_id, changes, expected=listed, current=listed, field='assignedFlights'
+            )
+            current_status = crew.availability
+        else:
+            claimed, current_status = CREW_STATE.claim(
+                crew.emp_id, changes, current=crew.availability
+            )
+        if not claimed:
+            return f'is not available (current status: {current_status})'
+        apply_crew_change(crew.emp_id, changes)
+    return None
+
+def compact_crew_state():
+    """Fold the change log into crew_data.json once it has grown long enough"""
+    if CREW_STATE.needs_compaction():
+        sync_crew_state()
+        CREW_STATE.compact(recommendation_engine.export_crew())
+
+@app.route('/api/assignments/optimize', methods=['POST'])
+def optimize_assignments():
+    """
+    Fill open seats across many flights at once
+    Body: {"flights": [...] or "needs_crew", "method": "optimal" | "greedy", "apply": false}
+    With apply=true every planned assignment is booked; crew a concurrent
+    request has taken or rostered onto a clashing duty in the meantime are
+    reported under 'conflicts'.
+    """
+    data = request.get_json(silent=True) or {}
+    requested = data.get('flights', 'needs_crew')
+    if requested == 'needs_crew':
+        flights = [f for f in FLIGHT_DATA if FLIGHT_STATS.needs_crew(f)]
+    elif isinstance(requested, list) and all(isinstance(n, str) for n in requested):
+        flights = [get_flight(n) for n in dict.fromkeys(requested) if get_flight(n)]
+    else:
+        return jsonify({'error': 'flights must be a list of flight numbers or "needs_crew"'}), 400
+    
+    engine = recommendation_engine
+    try:
+        plan = engine.plan_assignments(flights, method=data.get('method', 'optimal'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if data.get('apply'):
+        plan['conflicts'] = []
+        for assignment in plan['assignments']:
+            crew = engine.get_crew(assignment['emp_id'])
+            conflict = claim_assignment(crew, get_flight(assignment['flightNumber']))
+            assignment['applied'] = conflict is None
+            if conflict:
+                plan['conflicts'].append({
+                    'emp_id': crew.emp_id, 'availability': crew.availability, 'reason': conflict
+                })
+        compact_crew_state()
+        logger.info("✓ APPLIED SCHEDULE PLAN: %d of %d assignments booked",
+                    len(plan['assignments']) - len(plan['conflicts']), len(plan['assignments']))
+    
+    return jsonify(plan)
+
+@app.route('/api/disruptions/impact', methods=['POST'])
+def disruption_impact():
+    """
+    Re-plan the flights a disruption touches
+    Body: {"airport": "BOM", "start": "06:00", "end": "09:00", "top_k": 5}
+    An airport, a departure window, or both. Affected flights come from the
+    route index; only their recommendations are recomputed, in parallel,
+    without the crew stranded at a closed airport.
+    """
+    data = request.get_json(silent=True) or {}
+    airport = data.get('airport') or None
+    if airport is not None and not isinstance(airport, str):
+        return jsonify({'error': 'airport must be an airport code such as "BOM"'}), 400
+    top_k = data.get('top_k', 5)
+    if not isinstance(top_k, int) or not 1 <= top_k <= MAX_BATCH_TOP_K:
+        return jsonify({'error': f'top_k must be an integer between 1 and {MAX_BATCH_TOP_K}'}), 400
+    
+    window = None
+    if data.get('start') or data.get('end'):
+        window = (minute_of_day(data.get('start')), minute_of_day(data.get('end')))
+        if None in window:
+            return jsonify({'error': 'start and end must both be HH:MM times'}), 400
+    if airport is None and window is None:
+        return jsonify({'error': 'a disruption needs an airport, a start/end window, or both'}), 400
+    
+    flights = FLIGHT_ROUTES.affected(airport, *(window or (None, None)))
+    engine = recommendation_engine
+    stranded = 0
+    if airport:
+        index = engine.bitmap_index
+        stranded = index.count(index.bitset('base', airport) & index.bitset('availability', 'available'))
+    try:
+        exclude_bases = [airport] if airport else ()
+        if RECOMPUTE_POOL is not None:
+            recommendations = RECOMPUTE_POOL.recompute(engine, flights, top_k=top_k, exclude_bases=exclude_bases)
+        else:
+            recommendations = engine.recompute_recommendations(
+                flights, top_k=top_k, exclude_bases=exclude_bases, workers=DISRUPTION_WORKERS
+            )
+    except Exception as e:
+        logger.error("Error recomputing disrupted flights: %s", e)
+        return jsonify({'error': str(e)}), 500
+    
+    logger.info("Disruption at %s %s: %d flights re-planned, %d crew stranded",
+                airport or 'all airports', f"{data['start']}-{data['end']}" if window else 'all day', len(flights), stranded)
+    return jsonify({
+        'airport': airport,
+        'window': {'start': data['start'], 'end': data['end']} if window else None,
+        'affectedFlights': [f['flightNumber'] for f in flights],
+        'strandedCrew': stranded,
+        'recommendations': recommendations,
+    })
+
 # ✅ NEW ENDPOINT - ASSIGN CREW TO FLIGHT
 @app.route('/api/crew/<emp_id>/assign', methods=['POST'])
 def assign_crew_to_flight(emp_id):
@@ -113,64 +495,45 @@ def assign_crew_to_flight(emp_id):
         if not flight_number:
             return jsonify({'error': 'flight_number is required'}), 400
         
-        # Load current crew data
-        crew_file_path = os.path.join(os.path.dirname(__file__), 'data', 'crew_data.json')
-        with open(crew_file_path, 'r') as f:
-            crew_data = json.load(f)
+        flight = get_flight(flight_number)
+        if not flight:
+            return jsonify({'error': f'Flight {flight_number} not found'}), 404
         
         # Find the crew member by emp_id (handle both string and int IDs)
-        crew_member = None
-        crew_index = None
-        for idx, crew in enumerate(crew_data):
-            if str(crew.get('emp_id')) == str(emp_id):
-                crew_member = crew
-                crew_index = idx
-                break
-        
-        if not crew_member:
+        crew = recommendation_engine.get_crew(emp_id)
+        if not crew:
             return jsonify({'error': f'Crew member {emp_id} not found'}), 404
         
-        # Check if already assigned
-        if crew_member.get('availability', '').lower() != 'available':
-            return jsonify({
-                'error': f'{crew_member["name"]} is not available (current status: {crew_member.get("availability")})'
-            }), 400
-        
-        # Update crew member status
-        crew_data[crew_index]['availability'] = 'Assigned'
-        crew_data[crew_index]['assignedFlight'] = flight_number
-        
-        # Save updated data back to JSON file
-        with open(crew_file_path, 'w') as f:
-            json.dump(crew_data, f, indent=2)
-        
-        # Update global CREW_DATA variable
-        global CREW_DATA
-        CREW_DATA = crew_data
+        # Book only if status and the duties already rostered allow the flight
+        conflict = claim_assignment(crew, flight)
+        if conflict:
+            return jsonify({'error': f'{crew.name} {conflict}'}), 400
+        compact_crew_state()
         
-        print(f"\n✓ ASSIGNMENT SUCCESSFUL: {crew_member['name']} (ID: {emp_id}) → Flight {flight_number}")
-        print(f"  Status changed: Available → Assigned\n")
+        logger.info("✓ ASSIGNMENT SUCCESSFUL: %s (ID: %s) → Flight %s", crew.name, emp_id, flight_number)
+        logger.debug("  Duties now: %s\n", ', '.join(assigned_flights(crew)))
         
         return jsonify({
             'success': True,
-            'message': f'{crew_member["name"]} assigned to flight {flight_number}',
+            'message': f'{crew.name} assigned to flight {flight_number}',
             'crew': {
-                'emp_id': crew_member['emp_id'],
-                'name': crew_member['name'],
+                'emp_id': crew.emp_id,
+                'name': crew.name,
                 'availability': 'Assigned',
-                'assignedFlight': flight_number
+                'assignedFlight': flight_number,
+                'assignedFlights': assigned_flights(crew)
             }
         }), 200
         
     except Exception as e:
-        print(f"Error assigning crew: {str(e)}")
+        logger.error("Error assigning crew: %s", e)
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
     print("\n" + "="*70)
     print("CREWSYNC BACKEND SERVER")
     print("="*70)
-    print(f"Loaded {len(CREW_DATA)} crew members")
+    print(f"Loaded {len(recommendation_engine.crew_members)} crew members")
     print(f"Loaded {len(FLIGHT_DATA)} flights")
     print("\nServer starting on http://localhost:5000")
     print("="*70 + "\n")
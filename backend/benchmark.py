@@ -0,0 +1,1174 @@
+"""
+CrewSync performance benchmarks
+
+Usage:
+    python benchmark.py scoring [--sizes 1000 10000 100000]
+    python benchmark.py logging [--crew 5000]
+    python benchmark.py assignment [--crew 1000 10000] [--assignments 200]
+    python benchmark.py concurrency [--workers 1 2 4] [--crew 500]
+    python benchmark.py threads [--readers 8] [--writers 4] [--seconds 3]
+    python benchmark.py topk [--sizes 1000 10000 100000] [--k 5 50 500]
+    python benchmark.py ranking [--sizes 500 5000 50000]
+    python benchmark.py lookup [--sizes 100 10000 100000]
+    python benchmark.py listing [--sizes 1000 10000 100000]
+    python benchmark.py responses [--crew 10000]
+    python benchmark.py stats [--sizes 1000 10000 100000]
+    python benchmark.py batch [--crew 10000] [--flights 10 100 1000]
+    python benchmark.py optimize [--crew 2000 5000] [--flights 100 300]
+    python benchmark.py determinism [--crew 10000] [--flights 200]
+    python benchmark.py reccache [--crew 10000] [--flights 300] [--requests 5000] [--write-every 20]
+    python benchmark.py routes [--airports 100 300 1000] [--legs-per-airport 10]
+    python benchmark.py bitmap [--sizes 1000 10000 100000]
+    python benchmark.py memory [--sizes 10000 100000]
+    python benchmark.py backup [--sizes 1000 10000 100000]
+    python benchmark.py fatigue [--sizes 1000 10000 100000] [--k 10 100]
+    python benchmark.py disruption [--crew 10000] [--flights 1000 5000] [--workers 1 4]
+    python benchmark.py schedule [--crew 2000] [--flights 200 500]
+    python benchmark.py scaling [--crew 10000] [--flights 1000] [--processes 1 2 4]
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+import numpy as np
+
+from crew_journal import CrewJournal
+from data_structures import (
+    BackupCrewQueue, CrewMember, FlightAggregates, FlightRouteIndex, LocationGraph, ParameterTable,
+    RankingSkipList, RecommendationCache, TopKSelector, assigned_flights, minute_of_day
+)
+from recommendation_engine import CrewRecommendationEngine
+from recompute_pool import RecomputePool
+from shared_state import SharedCrewState
+
+LOCATIONS = ['DEL', 'BOM', 'BLR', 'HYD', 'GOI']
+AIRCRAFT = ['Boeing 737', 'Airbus A320', 'Airbus A321', 'Boeing 787']
+DESIGNATIONS = ['Pilot', 'Co-Pilot', 'Cabin Crew', 'Flight Engineer']
+
+
+def make_synthetic_crew(n, seed=42):
+    """Generate n crew records shaped like data/crew_data.json"""
+    rng = random.Random(seed)
+    crew = []
+    for i in range(n):
+        record = {
+            'emp_id': 1000 + i,
+            'name': f'Crew {i}',
+            'designation': rng.choice(DESIGNATIONS),
+            'availability': rng.choice(['Available', 'Available', 'Available', 'Backup', 'On Leave']),
+            'certifications': rng.sample(AIRCRAFT, rng.randint(1, 2)),
+            'baseLocation': rng.choice(LOCATIONS),
+        }
+        for param in CrewRecommendationEngine.WEIGHTS:
+            record[param] = rng.randint(50, 100)
+        crew.append(record)
+    return crew
+
+
+def make_synthetic_flights(n, seed=7):
+    """Generate n flight records shaped like data/flights_data.json"""
+    rng = random.Random(seed)
+    flights = []
+    for i in range(n):
+        origin, destination = rng.sample(LOCATIONS, 2)
+        assigned = rng.randint(0, 6)
+        flights.append({
+            'flightNumber': f'AI-{1000 + i}',
+            'route': f'{origin} → {destination}',
+            'origin': origin,
+            'destination': destination,
+            'aircraft': rng.choice(AIRCRAFT),
+            'departure': f'{rng.randint(0, 23):02d}:{rng.choice([0, 15, 30, 45]):02d}',
+            'status': 'Fully Assigned' if assigned == 6 else 'Crew Needed',
+            'priority': rng.choice(['High', 'Medium', 'Low']),
+            'crewRequired': 6,
+            'crewAssigned': assigned,
+        })
+    return flights
+
+
+def load_app():
+    """Import the Flask app without touching the shared SQLite state file"""
+    os.environ.setdefault('CREWSYNC_STATE_BACKEND', 'journal')
+    import app as crewsync_app
+    logging.getLogger().setLevel(logging.WARNING)
+    return crewsync_app
+
+
+def use_dataset(crewsync_app, crew_data, flight_data):
+    """Point the app's globals at a synthetic dataset"""
+    crewsync_app.FLIGHT_DATA = flight_data
+    crewsync_app.FLIGHT_INDEX = {f['flightNumber']: f for f in flight_data}
+    crewsync_app.FLIGHT_ROUTES = FlightRouteIndex(flight_data)
+    crewsync_app.recommendation_engine = build_engine(crew_data, flight_data)
+    crewsync_app.FLIGHT_STATS = FlightAggregates(
+        flight_data, crewsync_app.recommendation_engine.aggregates.assigned_by_flight
+    )
+    crewsync_app._data_generation += 1  # Invalidate cached responses, as a reload would
+
+
+def clear_caches(crewsync_app):
+    """Drop cached responses and recommendations so a request does the full work"""
+    crewsync_app.response_cache.entries.clear()
+    crewsync_app.recommendation_engine.recommendation_cache.clear()
+
+
+def build_engine(crew_data, flights=None):
+    """Build an engine in quiet mode (trace lines disabled)"""
+    logging.getLogger().setLevel(logging.WARNING)
+    return CrewRecommendationEngine(crew_data, flights=flights)
+
+
+def sample_flight():
+    """A flight shaped like data/flights_data.json"""
+    return {
+        'flightNumber': 'AI-202',
+        'route': 'DEL → BOM',
+        'origin': 'DEL',
+        'destination': 'BOM',
+        'aircraft': 'Boeing 737',
+    }
+
+
+def best_of(fn, repeat=5):
+    """Best wall-clock time of fn() over repeat runs, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_scoring(sizes):
+    """Per-dict composite scoring loop vs the vectorized score matrix vs the static score cache"""
+    print(f"{'crew':>8} {'dict loop (ms)':>16} {'matrix (ms)':>12} {'cached (ms)':>12} {'speedup':>8}")
+    for n in sizes:
+        engine = build_engine(make_synthetic_crew(n))
+        crews = engine.crew_members
+        rows = np.arange(n)
+
+        dicts = engine.export_crew()
+        loop_scores = [engine.calculate_composite_score(c) for c in dicts]
+        assert loop_scores == engine.compute_composite_scores(rows), "vectorized scores diverge from the dict loop"
+        assert loop_scores == engine.calculate_composite_scores(crews), "cached scores diverge from the dict loop"
+
+        loop_time = best_of(lambda: [engine.calculate_composite_score(c) for c in dicts])
+        matrix_time = best_of(lambda: engine.compute_composite_scores(rows))
+        cached_time = best_of(lambda: engine.calculate_composite_scores(crews))
+        print(f"{n:>8} {loop_time * 1000:>16.2f} {matrix_time * 1000:>12.2f} {cached_time * 1000:>12.2f} "
+              f"{loop_time / cached_time:>7.1f}x")
+
+
+def bench_logging(n):
+    """Recommendation latency with trace logging off vs on (trace written to /dev/null)"""
+    engine = build_engine(make_synthetic_crew(n))
+    flight = sample_flight()
+    root = logging.getLogger()
+
+    quiet_time = best_of(lambda: engine.compute_recommendations(flight))
+
+    with open(os.devnull, 'w') as devnull:
+        handler = logging.StreamHandler(devnull)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        root.addHandler(handler)
+        root.setLevel(logging.DEBUG)
+        try:
+            trace_time = best_of(lambda: engine.compute_recommendations(flight))
+        finally:
+            root.removeHandler(handler)
+            root.setLevel(logging.WARNING)
+
+    print(f"crew: {n}")
+    print(f"  quiet mode: {quiet_time * 1000:8.2f} ms / request")
+    print(f"  trace mode: {trace_time * 1000:8.2f} ms / request ({trace_time / quiet_time:.1f}x slower)")
+
+
+def bench_assignment(sizes, assignments):
+    """Assignment throughput: whole-file JSON rewrite vs journal append (replay is covered by test_crew_journal.py)"""
+    print(f"{'crew':>8} {'rewrite (assign/s)':>20} {'journal (assign/s)':>20}")
+    for n in sizes:
+        crew_data = make_synthetic_crew(n)
+        changes = {'availability': 'Assigned', 'assignedFlight': 'AI-202'}
+        with tempfile.TemporaryDirectory() as tmp:
+            snapshot = os.path.join(tmp, 'crew_data.json')
+            with open(snapshot, 'w') as f:
+                json.dump(crew_data, f, indent=2)
+
+            start = time.perf_counter()
+            for i in range(assignments):
+                crew_data[i % n].update(changes)
+                with open(snapshot, 'w') as f:
+                    json.dump(crew_data, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+            rewrite_rate = assignments / (time.perf_counter() - start)
+
+            journal = CrewJournal(snapshot, compact_every=assignments + 1)
+            start = time.perf_counter()
+            for i in range(assignments):
+                journal.append(crew_data[i % n]['emp_id'], changes)
+            journal_rate = assignments / (time.perf_counter() - start)
+
+        print(f"{n:>8} {rewrite_rate:>20.1f} {journal_rate:>20.1f}")
+
+
+def _claim_all(snapshot, emp_ids, seed):
+    """Worker process: try to book every crew member, in its own random order"""
+    state = SharedCrewState(snapshot)
+    order = list(emp_ids)
+    random.Random(seed).shuffle(order)
+    won = []
+    for emp_id in order:
+        claimed, _ = state.claim(emp_id, {'availability': 'Assigned'}, current='Available')
+        if claimed:
+            won.append(emp_id)
+    return won
+
+
+def bench_concurrency(worker_counts, n):
+    """Conflicting assignments from several processes (exactly-once booking is covered by test_shared_state.py)"""
+    print(f"{'workers':>8} {'attempts':>10} {'booked':>8} {'attempts/s':>12}")
+    emp_ids = [c['emp_id'] for c in make_synthetic_crew(n)]
+    for workers in worker_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            snapshot = os.path.join(tmp, 'crew_data.json')
+            SharedCrewState(snapshot)  # Create the schema before the workers race
+
+            start = time.perf_counter()
+            with multiprocessing.Pool(workers) as pool:
+                results = pool.starmap(_claim_all, [(snapshot, emp_ids, seed) for seed in range(workers)])
+            elapsed = time.perf_counter() - start
+
+            booked = sum(len(won) for won in results)
+
+        attempts = workers * n
+        print(f"{workers:>8} {attempts:>10} {booked:>8} {attempts / elapsed:>12.1f}")
+
+
+def bench_threads(readers, writers, seconds, n=2000):
+    """Concurrent recommendation and fatigue reads against assignments and queue churn (index checks: test_recommendation_engine.py)"""
+    engine = build_engine(make_synthetic_crew(n))
+    flight = sample_flight()
+    stop = threading.Event()
+    errors = []
+    counts = Counter()
+
+    def reader():
+        while not stop.is_set():
+            engine.get_recommendations(flight)
+            engine.most_rested(5)
+            counts['reads'] += 1
+
+    def writer(seed):
+        rng = random.Random(seed)
+        while not stop.is_set():
+            crew = rng.choice(engine.crew_members)
+            engine.update_crew(crew.emp_id, {
+                'availability': rng.choice(['Available', 'Assigned', 'Backup']),
+                'certifications': rng.sample(AIRCRAFT, rng.randint(1, 2)),
+                'fatigueScore': rng.randint(50, 100),
+            })
+            standby = engine.backup_queue.dequeue()
+            if standby is not None:
+                engine.backup_queue.enqueue(standby)
+            counts['writes'] += 1
+
+    def guarded(fn, *args):
+        try:
+            fn(*args)
+        except Exception as e:  # Any exception here is a race
+            errors.append(repr(e))
+            stop.set()
+
+    threads = [threading.Thread(target=guarded, args=(reader,)) for _ in range(readers)]
+    threads += [threading.Thread(target=guarded, args=(writer, seed)) for seed in range(writers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    if errors:
+        raise RuntimeError(f"{len(errors)} thread errors, first: {errors[0]}")
+
+    print(f"{readers} readers / {writers} writers for {seconds}s: "
+          f"{counts['reads'] / seconds:.0f} reads/s, {counts['writes'] / seconds:.0f} writes/s, no errors")
+
+
+def bench_topk(sizes, ks):
+    """Full sort + slice vs streaming bounded-heap selection over a candidate generator"""
+    print(f"{'n':>8} {'k':>6} {'sort (ms)':>10} {'heap (ms)':>10} {'speedup':>8}")
+    for n in sizes:
+        rng = random.Random(n)
+        scores = [rng.uniform(50, 125) for _ in range(n)]
+
+        def sort_top(k):
+            ranked = [(i, score) for i, score in enumerate(scores)]
+            ranked.sort(key=lambda x: x[1], reverse=True)
+            return ranked[:k]
+
+        def stream_top(k):
+            selector = TopKSelector(k)
+            selector.push_all(enumerate(scores))
+            return selector.results()
+
+        for k in ks:
+            assert sort_top(k) == stream_top(k), "top-K selection diverges from sort"
+            sort_time = best_of(lambda: sort_top(k))
+            heap_time = best_of(lambda: stream_top(k))
+            print(f"{n:>8} {k:>6} {sort_time * 1000:>10.2f} {heap_time * 1000:>10.2f} {sort_time / heap_time:>7.1f}x")
+
+
+class _LegacyBST:
+    """The former unbalanced recursive BSTRankingTree, kept only as a baseline"""
+    def __init__(self):
+        self.root = None
+
+    def insert(self, crew, score):
+        self.root = self._insert(self.root, crew, score)
+
+    def _insert(self, node, crew, score):
+        if node is None:
+            return [score, crew, None, None]
+        if score >= node[0]:
+            node[3] = self._insert(node[3], crew, score)
+        else:
+            node[2] = self._insert(node[2], crew, score)
+        return node
+
+
+def bench_ranking(sizes):
+    """Adversarial (sorted) and random insert orders: legacy BST vs ranking skip list"""
+    print(f"{'n':>7} {'order':>10} {'legacy BST (ms)':>16} {'skip list (ms)':>15} {'top-5 (us)':>11} {'rank_of (us)':>13}")
+    for n in sizes:
+        crews = [CrewMember(c) for c in make_synthetic_crew(n)]
+        rng = random.Random(n)
+        base = [rng.uniform(50, 100) for _ in range(n)]
+        orders = {
+            'ascending': sorted(base),
+            'descending': sorted(base, reverse=True),
+            'random': base,
+        }
+        for name, scores in orders.items():
+            def legacy():
+                tree = _LegacyBST()
+                for crew, score in zip(crews, scores):
+                    tree.insert(crew, score)
+            try:
+                legacy_ms = f"{best_of(legacy, repeat=1) * 1000:.1f}"
+            except RecursionError:
+                legacy_ms = 'RecursionErr'
+
+            ranking = RankingSkipList(seed=n)
+            start = time.perf_counter()
+            for crew, score in zip(crews, scores):
+                ranking.insert(crew, score)
+            skip_ms = (time.perf_counter() - start) * 1000
+
+            topk_us = best_of(lambda: ranking.get_top_k(5)) * 1e6
+            probe = crews[n // 2]
+            rank_us = best_of(lambda: ranking.rank_of(probe)) * 1e6
+            print(f"{n:>7} {name:>10} {legacy_ms:>16} {skip_ms:>15.1f} {topk_us:>11.1f} {rank_us:>13.1f}")
+
+
+def bench_lookup(sizes):
+    """
+    Single-entity lookups: primary-key index vs the old linear scan, both in process
+    The endpoint column adds Flask request handling on top of the index; it
+    should stay flat as the dataset grows.
+    """
+    crewsync_app = load_app()
+    client = crewsync_app.app.test_client()
+    print(f"{'records':>8} {'crew index (us)':>16} {'crew scan (us)':>15} {'flight index (us)':>18} "
+          f"{'flight scan (us)':>17} {'GET crew (us)':>14}")
+    for n in sizes:
+        crew_data, flight_data = make_synthetic_crew(n), make_synthetic_flights(n)
+        use_dataset(crewsync_app, crew_data, flight_data)
+        engine = crewsync_app.recommendation_engine
+        last_crew = str(crew_data[-1]['emp_id'])  # Path parameters arrive as strings
+        last_flight = flight_data[-1]['flightNumber']
+
+        def crew_scan():
+            return next(c for c in crew_data if str(c['emp_id']) == last_crew)
+
+        def flight_scan():
+            return next(f for f in flight_data if f['flightNumber'] == last_flight)
+
+        assert engine.get_crew(last_crew).emp_id == crew_scan()['emp_id']
+        assert crewsync_app.get_flight(last_flight) is flight_scan()
+        assert client.get(f'/api/crew/{last_crew}').status_code == 200
+
+        crew_index_us = best_of(lambda: engine.get_crew(last_crew), repeat=50) * 1e6
+        crew_scan_us = best_of(crew_scan) * 1e6
+        flight_index_us = best_of(lambda: crewsync_app.get_flight(last_flight), repeat=50) * 1e6
+        flight_scan_us = best_of(flight_scan) * 1e6
+        endpoint_us = best_of(lambda: client.get(f'/api/crew/{last_crew}'), repeat=50) * 1e6
+        print(f"{n:>8} {crew_index_us:>16.2f} {crew_scan_us:>15.1f} {flight_index_us:>18.2f} "
+              f"{flight_scan_us:>17.1f} {endpoint_us:>14.1f}")
+
+
+def bench_listing(sizes):
+    """GET /api/crew page size and latency: response bytes should stay flat as the roster grows"""
+    crewsync_app = load_app()
+    client = crewsync_app.app.test_client()
+    fields = 'name,designation,baseLocation,availability,performanceScore'
+    print(f"{'crew':>8} {'full list (KB)':>15} {'page (KB)':>10} {'page (ms)':>10} {'filtered page (ms)':>19}")
+    for n in sizes:
+        crew_data = make_synthetic_crew(n)
+        use_dataset(crewsync_app, crew_data, make_synthetic_flights(10))
+
+        full_kb = len(json.dumps(crew_data)) / 1024
+        page = client.get(f'/api/crew?limit=100&fields={fields}')
+        assert page.status_code == 200 and len(page.get_json()['items']) == 100
+        def uncached(url):
+            clear_caches(crewsync_app)
+            return client.get(url)
+        page_ms = best_of(lambda: uncached(f'/api/crew?limit=100&fields={fields}'), repeat=5) * 1000
+        filtered_ms = best_of(
+            lambda: uncached(f'/api/crew?limit=100&fields={fields}&availability=available&sort=-performanceScore'),
+            repeat=5
+        ) * 1000
+        print(f"{n:>8} {full_kb:>15.0f} {len(page.data) / 1024:>10.1f} {page_ms:>10.1f} {filtered_ms:>19.1f}")
+
+
+
+def bench_responses(crew_count):
+    """Repeated dashboard polls: fresh serialization vs cached bytes vs 304 Not Modified"""
+    crewsync_app = load_app()
+    client = crewsync_app.app.test_client()
+    use_dataset(crewsync_app, make_synthetic_crew(crew_count), make_synthetic_flights(500))
+    cache = crewsync_app.response_cache
+
+    print(f"{'endpoint':<44} {'uncached (ms)':>14} {'cached (ms)':>12} {'gzip (ms)':>10} {'304 (ms)':>9}")
+    for url in ('/api/dashboard/stats', '/api/flights?limit=500', '/api/crew?limit=500',
+                '/api/recommendations/' + crewsync_app.FLIGHT_DATA[0]['flightNumber']):
+        def uncached():
+            cache.entries.clear()
+            return client.get(url)
+        uncached_ms = best_of(uncached, repeat=5) * 1000
+        etag = client.get(url).headers['ETag']
+        cached_ms = best_of(lambda: client.get(url), repeat=20) * 1000
+        gzip_ms = best_of(lambda: client.get(url, headers={'Accept-Encoding': 'gzip'}), repeat=20) * 1000
+        not_modified = client.get(url, headers={'If-None-Match': etag})
+        assert not_modified.status_code == 304
+        etag_ms = best_of(lambda: client.get(url, headers={'If-None-Match': etag}), repeat=20) * 1000
+        print(f"{url:<44} {uncached_ms:>14.2f} {cached_ms:>12.2f} {gzip_ms:>10.2f} {etag_ms:>9.2f}")
+    print(cache.stats())
+
+
+
+def _scan_dashboard_stats(crew_data, flight_data):
+    """The full-pass computation /api/dashboard/stats used before the running aggregates"""
+    available = sum(1 for c in crew_data if c.get('availability', '').lower() == 'available')
+    assigned = Counter(number for c in crew_data for number in assigned_flights(c))
+    needs = sum(
+        1 for f in flight_data
+        if f.get('crewAssigned', 0) + assigned[f['flightNumber']] < f.get('crewRequired', 6)
+    )
+    total = sum(c.get('performanceScore', 0) for c in crew_data)
+    return available, needs, round((total / len(crew_data)) / 20, 1) if crew_data else 0
+
+
+def bench_stats(sizes):
+    """Dashboard stats: three full scans vs O(1) running aggregates (equal results: test_app.py)"""
+    crewsync_app = load_app()
+    client = crewsync_app.app.test_client()
+    print(f"{'crew':>8} {'full scan (ms)':>15} {'endpoint (ms)':>14} {'update_crew (us)':>17}")
+    for n in sizes:
+        crew_data, flight_data = make_synthetic_crew(n), make_synthetic_flights(n // 10)
+        use_dataset(crewsync_app, crew_data, flight_data)
+        engine = crewsync_app.recommendation_engine
+
+        def uncached():
+            clear_caches(crewsync_app)
+            return client.get('/api/dashboard/stats').get_json()
+
+        # Assign a few crew members, so some flights fill up
+        for i, crew in enumerate(crew_data[:n // 10]):
+            number = flight_data[i % 7]['flightNumber']
+            crewsync_app.apply_crew_change(crew['emp_id'], {
+                'availability': 'Assigned', 'assignedFlights': [number], 'performanceScore': 77
+            })
+        records = engine.export_crew()
+
+        scan_ms = best_of(lambda: _scan_dashboard_stats(records, flight_data)) * 1000
+        endpoint_ms = best_of(uncached, repeat=20) * 1000
+        probe = crew_data[-1]['emp_id']
+        flip = iter(range(10 ** 9))
+        update_us = best_of(
+            lambda: engine.update_crew(probe, {'availability': 'Available' if next(flip) % 2 else 'Standby'}),
+            repeat=50
+        ) * 1e6
+        print(f"{n:>8} {scan_ms:>15.2f} {endpoint_ms:>14.2f} {update_us:>17.1f}")
+
+
+
+def bench_batch(crew_count, flight_counts):
+    """N single recommendation calls vs one batch call, in the engine and over HTTP"""
+    crewsync_app = load_app()
+    client = crewsync_app.app.test_client()
+    crew_data = make_synthetic_crew(crew_count)
+    print(f"{'flights':>8} {'N engine calls (ms)':>20} {'engine batch (ms)':>18} "
+          f"{'N HTTP calls (ms)':>18} {'HTTP batch (ms)':>16}")
+    for n in flight_counts:
+        flights = make_synthetic_flights(n)
+        use_dataset(crewsync_app, crew_data, flights)
+        engine = crewsync_app.recommendation_engine
+        numbers = [f['flightNumber'] for f in flights]
+
+        # Same recommendations either way
+        batch = engine.get_batch_recommendations(flights)
+        assert all(batch[f['flightNumber']] == engine.get_recommendations(f) for f in flights)
+
+        def batch_uncached():
+            engine.recommendation_cache.clear()
+            return engine.get_batch_recommendations(flights)
+        single_ms = best_of(lambda: [engine.compute_recommendations(f) for f in flights], repeat=3) * 1000
+        batch_ms = best_of(batch_uncached, repeat=3) * 1000
+
+        def single_http():
+            clear_caches(crewsync_app)
+            for number in numbers:
+                client.get(f'/api/recommendations/{number}')
+        single_http_ms = best_of(single_http, repeat=3) * 1000
+        def batch_http():
+            clear_caches(crewsync_app)
+            return client.post('/api/recommendations/batch', json={'flights': numbers})
+        batch_http_ms = best_of(batch_http, repeat=3) * 1000
+        print(f"{n:>8} {single_ms:>20.1f} {batch_ms:>18.1f} {single_http_ms:>18.1f} {batch_http_ms:>16.1f}")
+
+
+
+def bench_optimize(crew_counts, flight_counts):
+    """Schedule-wide assignment: greedy baseline vs optimal matching, time and total score"""
+    print(f"{'crew':>6} {'flights':>8} {'seats':>6} {'greedy (ms)':>12} {'greedy score':>13} "
+          f"{'optimal (ms)':>13} {'optimal score':>14} {'gain':>7}")
+    for crew_count in crew_counts:
+        engine = build_engine(make_synthetic_crew(crew_count))
+        for flight_count in flight_counts:
+            flights = make_synthetic_flights(flight_count)
+            plans = {}
+            times = {}
+            for method in ('greedy', 'optimal'):
+                times[method] = best_of(lambda: plans.__setitem__(method, engine.plan_assignments(flights, method)),
+                                        repeat=3) * 1000
+            greedy, optimal = plans['greedy'], plans['optimal']
+            assert optimal['totalScore'] >= greedy['totalScore'] - 1e-6
+            assert len({a['emp_id'] for a in optimal['assignments']}) == optimal['filledSeats']
+            print(f"{crew_count:>6} {flight_count:>8} {optimal['openSeats']:>6} {times['greedy']:>12.1f} "
+                  f"{greedy['totalScore']:>13.1f} {times['optimal']:>13.1f} {optimal['totalScore']:>14.1f} "
+                  f"{optimal['totalScore'] - greedy['totalScore']:>7.1f}")
+
+
+
+def bench_determinism(crew_count, flight_count):
+    """Recommendations are a pure function of data, flight and seed: check it and time the jitter"""
+    crew_data = make_synthetic_crew(crew_count)
+    flights = make_synthetic_flights(flight_count)
+    engine = build_engine(crew_data)
+
+    # A second engine, as another worker would build it: separate process
+    # state and a different crew order in every index
+    shuffled = list(crew_data)
+    random.Random(1).shuffle(shuffled)
+    other = build_engine(shuffled)
+    reseeded = CrewRecommendationEngine(crew_data, seed=1)
+
+    def ranking(eng, flight):
+        return [(r['emp_id'], r['compositeScore']) for r in eng.compute_recommendations(flight)]
+
+    same = sum(ranking(engine, f) == ranking(other, f) for f in flights)
+    repeat = sum(ranking(engine, f) == ranking(engine, f) for f in flights)
+    changed = sum(ranking(engine, f) != ranking(reseeded, f) for f in flights)
+    print(f"identical across engines: {same}/{flight_count}, across calls: {repeat}/{flight_count}, "
+          f"changed by a new seed: {changed}/{flight_count}")
+    assert same == repeat == flight_count
+
+    flight = flights[0]
+    candidates = len(next(engine._candidate_pools([flight]))[1])
+    rec_ms = best_of(lambda: engine.compute_recommendations(flight), repeat=10) * 1000
+    jitter_us = best_of(lambda: engine.jitter(flight['flightNumber'], engine.crew_members), repeat=10) * 1e6
+    print(f"get_recommendations: {rec_ms:.2f} ms over {candidates} candidates; "
+          f"jitter for all {crew_count} crew: {jitter_us:.0f} us")
+
+
+
+def bench_reccache(crew_count, flight_count, requests, write_every, cache_sizes=(64, 256, 1024)):
+    """
+    Recommendations page refreshes with assignments mixed in: no cache vs
+    targeted invalidation vs clearing everything on every change
+    """
+    crew_data = make_synthetic_crew(crew_count)
+    flights = make_synthetic_flights(flight_count)
+    rng = random.Random(3)
+    # Popular flights are refreshed far more often than the rest
+    workload = rng.choices(flights, weights=[1 / (i + 1) for i in range(flight_count)], k=requests)
+    writes = [(rng.choice(crew_data)['emp_id'], rng.choice(['Available', 'Assigned'])) for _ in workload]
+
+    def run(engine, mode):
+        start = time.perf_counter()
+        for i, flight in enumerate(workload):
+            if i % write_every == 0:
+                emp_id, availability = writes[i]
+                engine.update_crew(emp_id, {'availability': availability})
+                if mode == 'clear-all':
+                    engine.recommendation_cache.clear()
+            if mode == 'none':
+                engine.compute_recommendations(flight)
+            else:
+                engine.get_recommendations(flight)
+        return (time.perf_counter() - start) * 1000
+
+    print(f"{requests} requests over {flight_count} flights, one assignment every {write_every} requests")
+    print(f"{'mode':>10} {'size':>6} {'total (ms)':>11} {'hit rate':>9} {'evictions':>10} {'invalidations':>14}")
+    baseline = build_engine([dict(c) for c in crew_data])
+    print(f"{'none':>10} {'-':>6} {run(baseline, 'none'):>11.0f} {'-':>9} {'-':>10} {'-':>14}")
+    for mode in ('clear-all', 'targeted'):
+        for size in cache_sizes:
+            engine = build_engine([dict(c) for c in crew_data])
+            engine.recommendation_cache = RecommendationCache(max_entries=size)
+            elapsed = run(engine, mode)
+            stats = engine.recommendation_cache.stats()
+            print(f"{mode:>10} {size:>6} {elapsed:>11.0f} {stats['hitRate']:>9.1%} "
+                  f"{stats['evictions']:>10} {stats['invalidations']:>14}")
+            # Whatever was served from the cache must match a fresh computation
+            for flight in flights[:20]:
+                assert engine.get_recommendations(flight) == engine.compute_recommendations(flight)
+
+
+
+def make_route_network(airports, legs_per_airport, seed=11):
+    """A connected directed network: a ring plus random legs, 30-300 minutes each"""
+    rng = random.Random(seed)
+    codes = [f'A{i:04d}' for i in range(airports)]
+    legs = [(codes[i], codes[(i + 1) % airports], rng.randint(30, 300)) for i in range(airports)]
+    legs += [
+        (rng.choice(codes), rng.choice(codes), rng.randint(30, 300))
+        for _ in range(airports * (legs_per_airport - 1))
+    ]
+    return codes, [(a, b, m) for a, b, m in legs if a != b]
+
+
+def bench_routes(airport_counts, legs_per_airport):
+    """Weighted route graph: Dijkstra per source, cached reachability, deep networks without recursion"""
+    print(f"{'airports':>9} {'legs':>7} {'dijkstra (ms)':>14} {'cached query (us)':>18} "
+          f"{'all sources (ms)':>17} {'DFS (ms)':>9}")
+    for airports in airport_counts:
+        codes, legs = make_route_network(airports, legs_per_airport)
+        graph = LocationGraph()
+        for origin, destination, minutes in legs:
+            graph.add_route(origin, destination, minutes)
+
+        def cold_search():
+            graph._paths = {}
+            return graph.shortest_paths(codes[0])
+        dijkstra_ms = best_of(cold_search) * 1000
+        graph.shortest_paths(codes[0])
+        query_us = best_of(lambda: graph.can_reach(codes[0], codes[-1]), repeat=1000) * 1e6
+
+        graph._paths = {}
+        start = time.perf_counter()
+        for code in codes:
+            graph.shortest_paths(code)
+        all_ms = (time.perf_counter() - start) * 1000
+        dfs_ms = best_of(lambda: graph.downstream_airports(codes[0])) * 1000
+        print(f"{airports:>9} {len(legs):>7} {dijkstra_ms:>14.2f} {query_us:>18.2f} {all_ms:>17.1f} {dfs_ms:>9.2f}")
+
+    # A long chain overflowed the old recursive DFS
+    chain = LocationGraph()
+    for i in range(20000):
+        chain.add_route(f'C{i}', f'C{i + 1}', 60)
+    assert len(chain.downstream_airports('C0')) == 20001
+    assert chain.travel_time('C0', 'C20000') == 20000 * 60
+    print("20000-leg chain: DFS and Dijkstra complete without recursion")
+
+
+
+def bench_bitmap(sizes):
+    """Candidate filtering: a scan with per-crew checks vs bitmap ANDs; time and memory"""
+    print(f"{'crew':>8} {'query':>22} {'scan (ms)':>10} {'bitmap (ms)':>12} {'matches':>8} {'bitmaps (KB)':>13}")
+    for n in sizes:
+        engine = build_engine(make_synthetic_crew(n))
+        bitmap_kb = engine.bitmap_index.memory_bytes() / 1024
+
+        queries = {
+            'aircraft+available': {'certification': 'Airbus A320', 'availability': 'available'},
+            'aircraft+role+base+av': {'certification': 'Airbus A320', 'availability': 'available',
+                                      'designation': 'Pilot', 'base': 'DEL'},
+        }
+        for name, criteria in queries.items():
+            def with_scan():
+                return [
+                    c for c in engine.crew_members
+                    if criteria['certification'] in c.certifications
+                    and (c.availability or '').lower() == 'available'
+                    and ('designation' not in criteria or c.designation.lower() == criteria['designation'].lower())
+                    and ('base' not in criteria or c.base_location == criteria['base'])
+                ]
+
+            def with_bitmap():
+                members = engine.crew_members
+                return [members[row] for row in engine.bitmap_index.rows(engine.bitmap_index.query(**criteria))]
+
+            expected = {c.key for c in with_scan()}
+            assert {c.key for c in with_bitmap()} == expected
+            scan_ms = best_of(with_scan, repeat=10) * 1000
+            bitmap_ms = best_of(with_bitmap, repeat=10) * 1000
+            print(f"{n:>8} {name:>22} {scan_ms:>10.3f} {bitmap_ms:>12.3f} {len(expected):>8} {bitmap_kb:>13.0f}")
+
+
+class DictCrewMember:
+    """The previous crew record: the full JSON dict plus derived attributes"""
+    def __init__(self, data, row):
+        self.emp_id = data['emp_id']
+        self.data = data
+        self.row = row
+        self.name = data['name']
+        self.designation = data['designation']
+        self.base_location = data.get('baseLocation') or data.get('baselocation', 'UNKNOWN')
+
+
+def _retained_bytes(build):
+    """Bytes still allocated once build() has returned, with its result kept alive"""
+    tracemalloc.start()
+    result = build()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, retained
+
+
+def bench_memory(sizes):
+    """Roster memory and per-crew scoring cost: dict-backed records vs slotted records + parameter table"""
+    columns = list(CrewRecommendationEngine.WEIGHTS)
+    print(f"{'crew':>8} {'layout':>8} {'bytes/crew':>11} {'MB per 100k':>12} {'scores/s':>12} {'records/s':>12}")
+    for n in sizes:
+        # Parse from JSON text, as the app does, so no strings are shared with the generator
+        payload = json.dumps(make_synthetic_crew(n))
+
+        def build_dicts():
+            crew_data = json.loads(payload)
+            matrix = np.array([[c.get(p, 0) for p in columns] for c in crew_data], dtype=np.float64)
+            return [DictCrewMember(c, row) for row, c in enumerate(crew_data)], matrix
+
+        def build_slotted():
+            crew_data = json.loads(payload)
+            table = ParameterTable(columns, crew_data)
+            return [CrewMember(c, table, row) for row, c in enumerate(crew_data)], table
+
+        (old_crews, _), old_bytes = _retained_bytes(build_dicts)
+        (new_crews, table), new_bytes = _retained_bytes(build_slotted)
+        assert all(old.data == new.to_dict() for old, new in zip(old_crews, new_crews)), "records diverge"
+
+        weights = CrewRecommendationEngine.WEIGHTS
+        rows = np.arange(n)
+        weight_vector = np.array(list(weights.values()))
+        # Scoring: 17 dict lookups per crew vs one matrix-vector product over the table
+        old_score = best_of(lambda: [sum(c.data.get(p, 0) * w for p, w in weights.items()) for c in old_crews], repeat=3)
+        new_score = best_of(lambda: (table.matrix[rows] @ weight_vector).tolist(), repeat=3)
+        # Recommendation records: snapshot + parameters per crew
+        old_format = best_of(lambda: [{k: dict(c.data).get(k, 0) for k in columns} for c in old_crews], repeat=3)
+        new_format = best_of(lambda: [table.values(c.row) for c in new_crews], repeat=3)
+
+        for layout, retained, score_s, format_s in (
+            ('dict', old_bytes, old_score, old_format), ('slotted', new_bytes, new_score, new_format)
+        ):
+            print(f"{n:>8} {layout:>8} {retained / n:>11.0f} {retained / n * 100000 / 2 ** 20:>12.1f} "
+                  f"{n / score_s:>12,.0f} {n / format_s:>12,.0f}")
+        del old_crews, new_crews, table
+
+
+class _ListBackupQueue:
+    """
+    The previous backup queue: a list popped from the front, with lazy removal
+    Base and priority callouts, which it never had, are the natural list
+    versions: a scan for the crew member to serve, then pop from the middle.
+    """
+    def __init__(self, bucket_of=None):
+        self.queue = []
+        self.members = {}
+        self.counter = 0
+        self.bucket_of = bucket_of
+
+    def enqueue(self, crew):
+        if crew.key not in self.members:
+            bucket = self.bucket_of(crew) if self.bucket_of else 0
+            self.queue.append((self.counter, bucket, crew))
+            self.members[crew.key] = self.counter
+            self.counter += 1
+
+    def remove(self, crew):
+        self.members.pop(crew.key, None)
+
+    def dequeue(self, base=None):
+        if base is None and self.bucket_of is None:
+            while self.queue:
+                ticket, _, crew = self.queue.pop(0)
+                if self.members.get(crew.key) == ticket:
+                    del self.members[crew.key]
+                    return crew
+            return None
+        # First live crew member by (not at base, bucket): crew at base first, lowest bucket first
+        best = best_key = None
+        for i, (ticket, bucket, crew) in enumerate(self.queue):
+            if self.members.get(crew.key) != ticket:
+                continue
+            key = (base is not None and crew.base_location != base, bucket)
+            if best is None or key < best_key:
+                best, best_key = i, key
+                if key == (False, 0):
+                    break  # Nothing can come before it
+        if best is None:
+            return None
+        _, _, crew = self.queue.pop(best)
+        del self.members[crew.key]
+        return crew
+
+
+def bench_backup(sizes, callouts=100):
+    """
+    Standby callouts, list queue vs deque queue
+    Plain FIFO drains the whole queue; base callouts (crew already at DEL
+    first) and most-rested callouts serve `callouts` crew, the disruption
+    workload the deque queue's per-base and per-priority deques are for.
+    """
+    print(f"{'backups':>8} {'fifo list':>10} {'fifo deque':>11} {'base list':>10} {'base deque':>11} "
+          f"{'rested list':>12} {'rested deque':>13} {'remove':>7}   (us per callout)")
+    rested_key = BackupCrewQueue.PRIORITIES['fatigue']
+    for n in sizes:
+        crews = [CrewMember(c) for c in make_synthetic_crew(n)]
+        rng = random.Random(n)
+        removed = rng.sample(crews, n // 10)  # Assigned elsewhere while waiting on backup
+        served = n - len(removed)
+
+        def callout(queue, pop, count):
+            for crew in crews:
+                queue.enqueue(crew)
+            for crew in removed:
+                queue.remove(crew)
+            start = time.perf_counter()
+            order = [pop() for _ in range(count)]
+            return order, (time.perf_counter() - start) / count * 1e6
+
+        timings = []
+        for count, make_list, make_deque, pop in [
+            (served, _ListBackupQueue, BackupCrewQueue, lambda q: q.dequeue),
+            (min(callouts, served), _ListBackupQueue, BackupCrewQueue, lambda q: lambda: q.dequeue(base='DEL')),
+            (min(callouts, served), lambda: _ListBackupQueue(rested_key), lambda: BackupCrewQueue('fatigue'),
+             lambda q: q.dequeue),
+        ]:
+            legacy, queue = make_list(), make_deque()
+            old_order, old_us = callout(legacy, pop(legacy), count)
+            new_order, new_us = callout(queue, pop(queue), count)
+            assert new_order == old_order and None not in new_order, "queues serve crew in a different order"
+            timings += [old_us, new_us]
+
+        queue = BackupCrewQueue()
+        for crew in crews:
+            queue.enqueue(crew)
+        start = time.perf_counter()
+        for crew in crews:
+            queue.remove(crew)
+        remove_us = (time.perf_counter() - start) / n * 1e6
+        assert queue.size() == 0 and queue.dequeue() is None
+
+        print(f"{n:>8} {timings[0]:>10.2f} {timings[1]:>11.2f} {timings[2]:>10.2f} {timings[3]:>11.2f} "
+              f"{timings[4]:>12.2f} {timings[5]:>13.2f} {remove_us:>7.2f}")
+
+
+def bench_fatigue(sizes, ks):
+    """Most rested available crew: filter + sort scan vs fatigue heap peek, and the cost of keeping the heap live"""
+    print(f"{'crew':>8} {'k':>5} {'scan (ms)':>10} {'heap peek (us)':>15} {'update_crew (us)':>17}")
+    for n in sizes:
+        engine = build_engine(make_synthetic_crew(n))
+
+        def scan(k):
+            available = [c for c in engine.crew_members if c.availability.lower() == 'available']
+            return sorted(available, key=lambda c: -c['fatigueScore'])[:k]
+
+        probe = engine.crew_members[-1]
+        flip = iter(range(10 ** 9))
+        update_us = best_of(
+            lambda: engine.update_crew(probe.emp_id, {
+                'availability': 'Available' if next(flip) % 2 else 'Assigned', 'fatigueScore': 60 + next(flip) % 40
+            }),
+            repeat=50
+        ) * 1e6
+        for k in ks:
+            expected = scan(k)
+            rested = engine.most_rested(k)
+            assert [c['fatigueScore'] for c in expected] == [score for _, score in rested], "heap order diverges from scan"
+            # Ties are broken by heap insertion order, so compare scores, then membership above the cut-off
+            cutoff = rested[-1][1] if rested else None
+            assert {c.key for c in expected if c['fatigueScore'] != cutoff} <= {c.key for c, _ in rested}
+
+            scan_ms = best_of(lambda: scan(k)) * 1000
+            peek_us = best_of(lambda: engine.most_rested(k), repeat=20) * 1e6
+            print(f"{n:>8} {k:>5} {scan_ms:>10.2f} {peek_us:>15.1f} {update_us:>17.1f}")
+
+
+def bench_disruption(crew_count, flight_counts, worker_counts, airport='BOM', window=('06:00', '10:00')):
+    """Airport closure: scan + recompute every flight vs route index + parallel recompute of affected flights"""
+    engine = build_engine(make_synthetic_crew(crew_count))
+    start, end = (minute_of_day(t) for t in window)
+    print(f"{crew_count} crew; {airport} closed {window[0]}-{window[1]}")
+    print(f"{'flights':>8} {'affected':>9} {'scan (ms)':>10} {'index (us)':>11} {'recompute all (ms)':>19} "
+          + ' '.join(f"{f'{w} workers (ms)':>16}" for w in worker_counts))
+    for n in flight_counts:
+        flights = make_synthetic_flights(n)
+        routes = FlightRouteIndex(flights)
+
+        def scan():
+            return [
+                f for f in flights
+                if airport in (f['origin'], f['destination']) and start <= minute_of_day(f['departure']) <= end
+            ]
+
+        affected = routes.affected(airport, start, end)
+        assert {f['flightNumber'] for f in affected} == {f['flightNumber'] for f in scan()}, "route index misses flights"
+
+        scan_ms = best_of(scan) * 1000
+        index_us = best_of(lambda: routes.affected(airport, start, end)) * 1e6
+        all_ms = best_of(lambda: [engine.compute_recommendations(f) for f in flights], repeat=1) * 1000
+
+        stranded = {c.key for c in engine.crew_members if c.base_location == airport}
+        timings = []
+        expected = None
+        for workers in worker_counts:
+            def recompute():
+                return engine.recompute_recommendations(affected, exclude_bases=[airport], workers=workers)
+            result = recompute()
+            assert not any(rec['emp_id'] in stranded or str(rec['emp_id']) in stranded
+                           for recs in result.values() for rec in recs), "stranded crew recommended"
+            assert expected is None or result == expected, "parallel recompute diverges"
+            expected = result
+            timings.append(best_of(recompute, repeat=3) * 1000)
+        print(f"{n:>8} {len(affected):>9} {scan_ms:>10.2f} {index_us:>11.1f} {all_ms:>19.0f} "
+              + ' '.join(f"{t:>16.1f}" for t in timings))
+
+
+def _roster_day(engine, flights, seats):
+    """Book the top `seats` recommendations of every flight, in departure order"""
+    booked = 0
+    for flight in sorted(flights, key=lambda f: minute_of_day(f['departure'])):
+        for rec in engine.compute_recommendations(flight, top_k=seats):
+            crew = engine.get_crew(rec['emp_id'])
+            engine.update_crew(crew.emp_id, {
+                'availability': 'Assigned',
+                'assignedFlight': flight['flightNumber'],
+                'assignedFlights': assigned_flights(crew) + [flight['flightNumber']],
+            })
+            booked += 1
+    return booked
+
+
+def bench_schedule(crew_count, flight_counts, seats=3):
+    """A day of flights: one flight per crew member (static availability) vs duty timelines"""
+    crew_data = make_synthetic_crew(crew_count)
+    print(f"{crew_count} crew, top {seats} booked per flight in departure order")
+    print(f"{'flights':>8} {'static seats':>13} {'timed seats':>12} {'multi-duty crew':>16} "
+          f"{'roster (ms)':>12} {'fit (us/crew)':>14}")
+    for n in flight_counts:
+        flights = make_synthetic_flights(n)
+        # Without the schedule no duty can be timed, so crew fly once, as before timelines
+        static = build_engine(crew_data)
+        logging.getLogger().setLevel(logging.ERROR)  # Flights left with no crew are expected here
+        static_booked = _roster_day(static, flights, seats)
+
+        engine = build_engine(crew_data, flights)
+        logging.getLogger().setLevel(logging.ERROR)
+        start = time.perf_counter()
+        booked = _roster_day(engine, flights, seats)
+        roster_ms = (time.perf_counter() - start) * 1000
+        multi = sum(1 for _, duties in engine.timeline.duties.values() if len(duties) > 1)
+
+        pool = [(crew, 0.0) for crew in engine.crew_members]
+        fit_us = best_of(lambda: engine._fit_schedule(flights[0], pool)) / len(pool) * 1e6
+        print(f"{n:>8} {static_booked:>13} {booked:>12} {multi:>16} {roster_ms:>12.0f} {fit_us:>14.2f}")
+
+
+def bench_scaling(crew_count, flight_count, process_counts):
+    """
+    Schedule-wide recompute: one process vs a process pool sharing the score matrix
+    Speedup needs as many free cores as processes; on fewer, expect none
+    """
+    flights = make_synthetic_flights(flight_count)
+    engine = build_engine(make_synthetic_crew(crew_count), flights)
+    serial_s = best_of(lambda: engine.recompute_recommendations(flights), repeat=3)
+    expected = engine.recompute_recommendations(flights)
+    print(f"{crew_count} crew, {flight_count} flights, {os.cpu_count()} cores; "
+          f"score matrix {engine.score_matrix.nbytes} bytes, shared rather than sent with each task")
+    print(f"{'processes':>10} {'cold (ms)':>10} {'warm (ms)':>10} {'speedup':>8} {'efficiency':>11} {'task (bytes)':>13}")
+    print(f"{1:>10} {'-':>10} {serial_s * 1000:>10.0f} {1.0:>8.2f} {1.0:>11.0%} {'-':>13}")
+    for processes in process_counts:
+        if processes <= 1:
+            continue
+        pool = RecomputePool(processes)
+        try:
+            start = time.perf_counter()
+            result = pool.recompute(engine, flights)  # Spawns workers and builds their replicas
+            cold_s = time.perf_counter() - start
+            assert result == expected, "process pool diverges from the in-process recompute"
+            warm_s = best_of(lambda: pool.recompute(engine, flights), repeat=3)
+            chunks = engine.split_flights(flights, processes)
+            task_bytes = sum(len(pickle.dumps((pool._snapshot, chunk, 5, ()))) for chunk in chunks) / len(chunks)
+        finally:
+            pool.close()
+        speedup = serial_s / warm_s
+        print(f"{processes:>10} {cold_s * 1000:>10.0f} {warm_s * 1000:>10.0f} {speedup:>8.2f} "
+              f"{speedup / processes:>11.0%} {task_bytes:>13.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    scoring = sub.add_parser('scoring', help='per-dict vs vectorized vs cached composite scoring')
+    scoring.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+
+    log = sub.add_parser('logging', help='recommendation latency in quiet vs trace logging mode')
+    log.add_argument('--crew', type=int, default=5000)
+
+    assign = sub.add_parser('assignment', help='assignment persistence throughput')
+    assign.add_argument('--crew', type=int, nargs='+', default=[1000, 10000])
+    assign.add_argument('--assignments', type=int, default=200)
+
+    conc = sub.add_parser('concurrency', help='conflicting assignments from several worker processes')
+    conc.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    conc.add_argument('--crew', type=int, default=500)
+
+    thr = sub.add_parser('threads', help='multi-threaded read/write throughput of the engine')
+    thr.add_argument('--readers', type=int, default=8)
+    thr.add_argument('--writers', type=int, default=4)
+    thr.add_argument('--seconds', type=float, default=3)
+
+    topk = sub.add_parser('topk', help='sort-and-slice vs bounded-heap top-K selection')
+    topk.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    topk.add_argument('--k', type=int, nargs='+', default=[5, 50, 500])
+
+    rank = sub.add_parser('ranking', help='sorted-input inserts: legacy BST vs ranking skip list')
+    rank.add_argument('--sizes', type=int, nargs='+', default=[500, 5000, 50000])
+
+    lookup = sub.add_parser('lookup', help='single-entity endpoint latency vs dataset size')
+    lookup.add_argument('--sizes', type=int, nargs='+', default=[100, 10000, 100000])
+
+    listing = sub.add_parser('listing', help='paginated crew list response size and latency vs roster size')
+    listing.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+
+    resp = sub.add_parser('responses', help='read endpoint latency: uncached vs cached bytes vs 304')
+    resp.add_argument('--crew', type=int, default=10000)
+
+    stats = sub.add_parser('stats', help='dashboard stats: full scans vs running aggregates')
+    stats.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+
+    batch = sub.add_parser('batch', help='N single recommendation calls vs one batch call')
+    batch.add_argument('--crew', type=int, default=10000)
+    batch.add_argument('--flights', type=int, nargs='+', default=[10, 100, 1000])
+
+    opt = sub.add_parser('optimize', help='schedule-wide assignment: greedy vs optimal matching')
+    opt.add_argument('--crew', type=int, nargs='+', default=[2000, 5000])
+    opt.add_argument('--flights', type=int, nargs='+', default=[100, 300])
+
+    det = sub.add_parser('determinism', help='recommendations are reproducible across engines and calls')
+    det.add_argument('--crew', type=int, default=10000)
+    det.add_argument('--flights', type=int, default=200)
+
+    rc = sub.add_parser('reccache', help='recommendation result cache: hit rate and latency under assignments')
+    rc.add_argument('--crew', type=int, default=10000)
+    rc.add_argument('--flights', type=int, default=300)
+    rc.add_argument('--requests', type=int, default=5000)
+    rc.add_argument('--write-every', type=int, default=20)
+
+    routes = sub.add_parser('routes', help='weighted route graph: Dijkstra, cached queries, deep networks')
+    routes.add_argument('--airports', type=int, nargs='+', default=[100, 300, 1000])
+    routes.add_argument('--legs-per-airport', type=int, default=10)
+
+    bitmap = sub.add_parser('bitmap', help='candidate filtering: list scans vs bitmap index')
+    bitmap.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+
+    memory = sub.add_parser('memory', help='roster memory and scoring: dict-backed vs slotted crew records')
+    memory.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+
+    backup = sub.add_parser('backup', help='standby callouts: list queue vs deque queue')
+    backup.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+
+    fatigue = sub.add_parser('fatigue', help='most rested available crew: scan vs fatigue heap')
+    fatigue.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    fatigue.add_argument('--k', type=int, nargs='+', default=[10, 100])
+
+    disruption = sub.add_parser('disruption', help='airport closure: full recompute vs indexed, parallel recompute')
+    disruption.add_argument('--crew', type=int, default=10000)
+    disruption.add_argument('--flights', type=int, nargs='+', default=[1000, 5000])
+    disruption.add_argument('--workers', type=int, nargs='+', default=[1, 4])
+
+    schedule = sub.add_parser('schedule', help='a day of flights: static availability vs duty timelines')
+    schedule.add_argument('--crew', type=int, default=2000)
+    schedule.add_argument('--flights', type=int, nargs='+', default=[200, 500])
+
+    scaling = sub.add_parser('scaling', help='schedule-wide recompute: process pool scaling from 1 to N cores')
+    scaling.add_argument('--crew', type=int, default=10000)
+    scaling.add_argument('--flights', type=int, default=1000)
+    scaling.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4])
+
+    args = parser.parse_args()
+    if args.command == 'scoring':
+        bench_scoring(args.sizes)
+    elif args.command == 'logging':
+        bench_logging(args.crew)
+    elif args.command == 'assignment':
+        bench_assignment(args.crew, args.assignments)
+    elif args.command == 'concurrency':
+        bench_concurrency(args.workers, args.crew)
+    elif args.command == 'threads':
+        bench_threads(args.readers, args.writers, args.seconds)
+    elif args.command == 'topk':
+        bench_topk(args.sizes, args.k)
+    elif args.command == 'ranking':
+        bench_ranking(args.sizes)
+    elif args.command == 'lookup':
+        bench_lookup(args.sizes)
+    elif args.command == 'listing':
+        bench_listing(args.sizes)
+    elif args.command == 'responses':
+        bench_responses(args.crew)
+    elif args.command == 'stats':
+        bench_stats(args.sizes)
+    elif args.command == 'batch':
+        bench_batch(args.crew, args.flights)
+    elif args.command == 'optimize':
+        bench_optimize(args.crew, args.flights)
+    elif args.command == 'determinism':
+        bench_determinism(args.crew, args.flights)
+    elif args.command == 'reccache':
+        bench_reccache(args.crew, args.flights, args.requests, args.write_every)
+    elif args.command == 'routes':
+        bench_routes(args.airports, args.legs_per_airport)
+    elif args.command == 'bitmap':
+        bench_bitmap(args.sizes)
+    elif args.command == 'memory':
+        bench_memory(args.sizes)
+    elif args.command == 'backup':
+        bench_backup(args.sizes)
+    elif args.command == 'fatigue':
+        bench_fatigue(args.sizes, args.k)
+    elif args.command == 'disruption':
+        bench_disruption(args.crew, args.flights, args.workers)
+    elif args.command == 'schedule':
+        bench_schedule(args.crew, args.flights)
+    elif args.command == 'scaling':
+        bench_scaling(args.crew, args.flights, args.processes)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,6 @@
 import json
+from itertools import islice
+from data_structures import RosterAggregates
 
 # Load crew data
 with open('data/crew_data.json', 'r', encoding='utf-8') as f:
@@ -14,23 +16,22 @@ print("="*70)
 print(f"\nTotal crew members: {len(crew_data)}")
 print(f"Total flights: {len(flights_data)}")
 
-# Count availability statuses
-availability_counts = {}
+# Count availability statuses (the same running counters the backend keeps)
+aggregates = RosterAggregates(crew_data)
+availability_counts = aggregates.availability_counts
+
+# Name the crew behind any bad statuses
 missing_availability = []
 wrong_case = []
 
-for crew in crew_data:
-    if 'availability' not in crew:
-        missing_availability.append(crew['name'])
-        status = 'MISSING'
-    else:
-        status = crew['availability']
-        
-        # Check for wrong case
-        if status and status.lower() == 'available' and status != 'Available':
-            wrong_case.append((crew['name'], status))
-    
-    availability_counts[status] = availability_counts.get(status, 0) + 1
+if 'MISSING' in availability_counts or any(
+    status.lower() == 'available' and status != 'Available' for status in availability_counts
+):
+    for crew in crew_data:
+        if 'availability' not in crew:
+            missing_availability.append(crew['name'])
+        elif crew['availability'].lower() == 'available' and crew['availability'] != 'Available':
+            wrong_case.append((crew['name'], crew['availability']))
 
 print("\n" + "-"*70)
 print("AVAILABILITY DISTRIBUTION")
@@ -69,31 +70,27 @@ for flight in flights_data:
     print(f"Aircraft: {flight['aircraft']}")
     print(f"Status: {flight['status']}")
     
-    # Find crew certified for this aircraft
-    certified_crew = [
-        c for c in crew_data 
-        if flight['aircraft'] in c.get('certifications', [])
-    ]
-    print(f"Crew with {flight['aircraft']} certification: {len(certified_crew)}")
-    
-    # Find available crew
-    available_certified = [
-        c for c in certified_crew 
-        if c.get('availability', '').lower() == 'available'
-    ]
-    print(f"Available certified crew: {len(available_certified)}")
+    # Certified / available counts come straight from the counters
+    print(f"Crew with {flight['aircraft']} certification: {aggregates.cert_counts.get(flight['aircraft'], 0)}")
+    available_count = aggregates.available_by_cert.get(flight['aircraft'], 0)
+    print(f"Available certified crew: {available_count}")
     
-    if len(available_certified) == 0:
+    if available_count == 0:
         print(f"  ⚠ NO RECOMMENDATIONS POSSIBLE - No available crew!")
-    elif len(available_certified) < 5:
-        print(f"  ⚠ Only {len(available_certified)} recommendations possible")
+    elif available_count < 5:
+        print(f"  ⚠ Only {available_count} recommendations possible")
     else:
         print(f"  ✓ Can provide 5+ recommendations")
     
-    # Show sample crew
-    if len(available_certified) > 0:
+    # Show sample crew (stops after the first three matches)
+    if available_count > 0:
+        available_certified = (
+            c for c in crew_data
+            if flight['aircraft'] in c.get('certifications', [])
+            and c.get('availability', '').lower() == 'available'
+        )
         print(f"\n  Sample available crew:")
-        for crew in available_certified[:3]:
+        for crew in islice(available_certified, 3):
             print(f"    • {crew['name']} ({crew.get('designation', 'N/A')}) - {crew.get('baseLocation', 'N/A')}")
 
 # Summary
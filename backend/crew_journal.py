@@ -0,0 +1,148 @@
+import json
+import logging
+import os
+import threading
+
+from data_structures import normalize_emp_id
+
+logger = logging.getLogger(__name__)
+
+# Fields claim() can compare-and-set on: availability for a crew member's
+# first duty, assignedFlights (their whole duty list) for every later one
+CLAIM_FIELDS = ('availability', 'assignedFlights')
+
+
+def claim_matches(field, seen, expected):
+    """Availability compares case-insensitively, other fields exactly"""
+    if field == 'availability':
+        return (seen or '').lower() == expected.lower()
+    return seen == expected
+
+
+class CrewJournal:
+    """
+    Append-only write-ahead log for crew mutations
+    Complexity: O(1) per change (one small fsync'd append), O(n) compaction
+    Use Case: Persist assignments without rewriting the whole roster
+
+    Each line of the journal is one JSON record {"emp_id": ..., "changes": {...}}.
+    Records set absolute field values, so replaying a record that is already
+    part of the snapshot is harmless. A torn last line (crash mid-append) is
+    discarded on replay.
+    """
+    def __init__(self, snapshot_path, journal_path=None, compact_every=1000):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + '.journal'
+        self.compact_every = compact_every
+        self.pending = 0  # Records written since the last compaction
+        self.claimed = {field: {} for field in CLAIM_FIELDS}  # field -> {emp_id: value written through this journal}
+        self._lock = threading.Lock()
+
+    def replay(self, crew_data):
+        """Apply journal records on top of a freshly loaded snapshot, in order"""
+        if not os.path.exists(self.journal_path):
+            return 0
+
+        crew_by_id = {normalize_emp_id(c['emp_id']): c for c in crew_data}
+        applied = 0
+        good_offset = 0
+
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Torn write from a crash
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                crew = crew_by_id.get(normalize_emp_id(record['emp_id']))
+                if crew is not None:
+                    crew.update(record['changes'])
+                self._track(record['emp_id'], record['changes'])
+                applied += 1
+                good_offset += len(line)
+
+        if good_offset < os.path.getsize(self.journal_path):
+            logger.warning("Discarding torn crew journal tail after %d records", applied)
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(good_offset)
+                f.flush()
+                os.fsync(f.fileno())
+
+        self.pending = applied
+        logger.info("Replayed %d crew journal records", applied)
+        return applied
+
+    def _track(self, emp_id, changes):
+        for field in CLAIM_FIELDS:
+            if field in changes:
+                self.claimed[field][normalize_emp_id(emp_id)] = changes[field]
+
+    def _write(self, emp_id, changes):
+        line = json.dumps({'emp_id': emp_id, 'changes': changes}, separators=(',', ':')) + '\n'
+        with open(self.journal_path, 'ab') as f:
+            f.write(line.encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+        self._track(emp_id, changes)
+        self.pending += 1
+
+    def append(self, emp_id, changes):
+        """Durably record one crew change"""
+        with self._lock:
+            self._write(emp_id, changes)
+
+    def claim(self, emp_id, changes, expected='available', current=None, field='availability'):
+        """
+        Compare-and-set on one CLAIM_FIELDS field within this process
+        The journal is the only writer, so checking the value it last wrote
+        (or `current`, the snapshot value, if it never wrote one) under its
+        lock makes check-then-append atomic.
+        Returns (success, value seen at decision time)
+        """
+        with self._lock:
+            seen = self.claimed[field].get(normalize_emp_id(emp_id), current)
+            if not claim_matches(field, seen, expected):
+                return False, seen
+            self._write(emp_id, changes)
+            return True, seen
+
+    def poll(self):
+        """A single-process journal never has changes from other writers"""
+        return []
+
+    def needs_compaction(self):
+        return self.pending >= self.compact_every
+
+    def compact(self, crew_data):
+        """Write crew_data as the new snapshot atomically, then empty the journal"""
+        with self._lock:
+            tmp_path = self.snapshot_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(crew_data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            _fsync_dir(os.path.dirname(os.path.abspath(self.snapshot_path)))
+
+            # A crash before this point leaves records the snapshot already
+            # contains; replaying them again is a no-op.
+            with open(self.journal_path, 'wb') as f:
+                f.flush()
+                os.fsync(f.fileno())
+
+            logger.info("Compacted %d crew journal records into %s", self.pending, self.snapshot_path)
+            self.pending = 0
+        return True
+
+
+def _fsync_dir(path):
+    """Make a rename durable (no-op where directories can't be opened)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -1,21 +1,204 @@
+import bisect
 import heapq
-from collections import defaultdict
+import logging
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from collections.abc import Mapping
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
 
 # ============================================
 # DATA STRUCTURE IMPLEMENTATIONS
 # ============================================
+#
+# Thread safety: every structure serializes its own mutations with a private
+# lock. Lookups into indexes whose entries are replaced rather than mutated
+# take no lock: bitmap bitsets, route index buckets and departures, duty
+# timelines, the shortest-path memo and the running counters. They read one
+# entry, or copy a container in a single C-level call (list(...) / dict(...)),
+# which the GIL makes atomic with respect to writers. Reads that walk a
+# structure writers reshape take its lock: the fatigue heap
+# (peek_least_fatigued), the ranking skip list (rank_of, get_by_rank,
+# get_top_k), the backup queue (peek) and the recommendation cache (get).
+# Within these structures, computing recommendations locks only in the
+# recommendation cache and when filling a missing shortest-path entry.
+
+def normalize_emp_id(emp_id):
+    """Canonical key for an employee ID (JSON ints and URL strings compare equal)"""
+    return str(emp_id).strip()
+
+
+def assigned_flights(data):
+    """
+    Flights a crew record is on duty for
+    assignedFlights lists every duty; older records only carry the latest
+    one as assignedFlight. Only crew whose status is Assigned are on duty.
+    """
+    if str(data.get('availability', '')).lower() != 'assigned':
+        return []
+    flights = data.get('assignedFlights')
+    if flights is None:
+        flights = [data['assignedFlight']] if data.get('assignedFlight') else []
+    return list(flights)
 
-class CrewMember:
-    """Node representation for crew member"""
-    def __init__(self, data):
+
+class ParameterTable:
+    """
+    Contiguous float64 storage for crew scoring parameters
+    Complexity: O(1) cell read/write, 8 bytes per parameter per crew member
+    Use Case: One array shared by the crew records and the vectorized scorer
+    
+    Row i holds the parameters of the i-th record, columns follow `columns`;
+    a parameter missing from a record is stored as 0. An existing matrix
+    (e.g. a view of shared memory) can be adopted instead of built.
+    """
+    def __init__(self, columns, records, matrix=None):
+        self.columns = tuple(columns)
+        self.index = {name: col for col, name in enumerate(self.columns)}
+        if matrix is not None:
+            if matrix.shape != (len(records), len(self.columns)):
+                raise ValueError(f'matrix shape {matrix.shape} does not fit {len(records)} records')
+            self.matrix = matrix
+            return
+        self.matrix = np.array(
+            [[record.get(p, 0) for p in self.columns] for record in records],
+            dtype=np.float64
+        ).reshape(len(records), len(self.columns))
+    
+    def values(self, row):
+        """Parameters of one row as {name: JSON number}"""
+        return dict(zip(self.columns, map(_json_number, self.matrix[row].tolist())))
+
+
+def _json_number(value):
+    """Matrix cells are floats; integral ones go back to the API as ints"""
+    return int(value) if value.is_integer() else value
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class CrewMember(Mapping):
+    """
+    Slotted crew record
+    Complexity: O(1) field access; ~100 bytes per record plus 8 per parameter
+    Use Case: Hold a large roster without one ~25-key dict per crew member
+    
+    Numeric scoring parameters live in a row of a shared ParameterTable (the
+    engine's score matrix); the descriptive fields are slots, with repeated
+    strings (designation, base, availability, certifications) interned. Keys
+    outside the known record shape (e.g. assignedFlight) go to `extra`.
+    
+    The record reads as a Mapping with the original JSON keys, so code written
+    against crew dicts keeps working; to_dict() rebuilds the JSON record for the
+    API and persistence boundary. Records compare and hash by identity.
+    """
+    __slots__ = ('emp_id', 'name', 'designation', 'base_location', 'availability',
+                 'certifications', 'extra', 'table', 'row')
+    
+    # JSON key -> slot for the descriptive fields
+    FIELDS = {
+        'emp_id': 'emp_id',
+        'name': 'name',
+        'designation': 'designation',
+        'availability': 'availability',
+        'certifications': 'certifications',
+        'baseLocation': 'base_location',
+    }
+    
+    def __init__(self, data, table=None, row=0):
+        if table is None:
+            # Standalone record: a private one-row table of its *Score fields
+            table = ParameterTable([k for k in data if k.endswith('Score')], [data])
+        self.table = table
+        self.row = row  # Row in table.matrix (the engine's score matrix)
         self.emp_id = data['emp_id']
         self.name = data['name']
-        self.designation = data['designation']
+        self.designation = _intern(data['designation'])
         
         # Handle both 'baseLocation' (camelCase) and 'baselocation' (lowercase)
-        self.base_location = data.get('baseLocation') or data.get('baselocation', 'UNKNOWN')
+        self.base_location = _intern(data.get('baseLocation') or data.get('baselocation', 'UNKNOWN'))
+        self.availability = _intern(data.get('availability'))  # None = not recorded
+        self.certifications = tuple(map(_intern, data.get('certifications', ())))
         
-        self.data = data
+        extra = {
+            k: v for k, v in data.items()
+            if k not in self.FIELDS and k != 'baselocation' and k not in table.index
+        }
+        self.extra = extra or None
+    
+    @property
+    def key(self):
+        return normalize_emp_id(self.emp_id)
+    
+    def update(self, changes):
+        """
+        Apply {JSON key: value} changes in place
+        Parameter writes go straight to the shared table, so callers that
+        cache scores must hold their own lock around this call.
+        """
+        for key, value in changes.items():
+            column = self.table.index.get(key)
+            if column is not None:
+                self.table.matrix[self.row, column] = value
+            elif key == 'certifications':
+                self.certifications = tuple(map(_intern, value))
+            elif key in ('baseLocation', 'baselocation'):
+                self.base_location = _intern(value)
+            elif key in ('designation', 'availability'):
+                setattr(self, key, _intern(value))
+            elif key == 'name':
+                self.name = value
+            elif key != 'emp_id':  # The ID is the record's identity
+                if self.extra is None:
+                    self.extra = {}
+                self.extra[key] = value
+    
+    def to_dict(self):
+        """The JSON record, in the key order of the source data"""
+        record = {'emp_id': self.emp_id, 'name': self.name, 'designation': self.designation}
+        record.update(self.table.values(self.row))
+        if self.availability is not None:
+            record['availability'] = self.availability
+        record['certifications'] = list(self.certifications)
+        record['baseLocation'] = self.base_location
+        if self.extra:
+            record.update(self.extra)
+        return record
+    
+    def __getitem__(self, key):
+        column = self.table.index.get(key)
+        if column is not None:
+            return _json_number(self.table.matrix[self.row, column].item())
+        slot = self.FIELDS.get(key)
+        if slot is not None:
+            value = getattr(self, slot)
+            if value is not None:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+    
+    def __iter__(self):
+        yield from ('emp_id', 'name', 'designation')
+        yield from self.table.columns
+        if self.availability is not None:
+            yield 'availability'
+        yield from ('certifications', 'baseLocation')
+        if self.extra:
+            yield from list(self.extra)
+    
+    def __len__(self):
+        return 5 + len(self.table.columns) + (self.availability is not None) + len(self.extra or ())
+    
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
     
     def __repr__(self):
         return f"Crew({self.emp_id}, {self.name})"
@@ -23,170 +206,1038 @@ class CrewMember:
 
 class MinHeapCrewScheduler:
     """
-    Min-Heap for fatigue-based crew selection
-    Complexity: O(log n) for insert/extract
-    Use Case: Get least fatigued crew member quickly
+    Indexed min-heap of crew by fatigue, most rested first
+    Complexity: O(log n) insert/update/extract, O(1) remove, O(k log k) peek at the top k
+    Use Case: "Give me the N most rested crew" without scanning the roster
+    
+    fatigueScore is a readiness score: higher means more rested. Entries are
+    keyed by fatigue level = 100 - fatigueScore, so the heap minimum is the
+    least fatigued crew member. Updates and removals invalidate the old entry
+    in place (lazy deletion); the heap is rebuilt once invalid entries
+    outnumber live ones.
     """
+    REMOVED = None  # Placeholder for the crew slot of an invalidated entry
+    
     def __init__(self):
         self.heap = []
+        self.entry_finder = {}  # emp_id -> live heap entry
         self.counter = 0  # Tie-breaker for same fatigue scores
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def fatigue_level(fatigue_score):
+        """Heap key: 0 for a fully rested crew member (fatigueScore 100)"""
+        return 100 - fatigue_score
     
     def insert(self, crew, fatigue_score):
-        # Use counter as tie-breaker: (priority, tie_breaker, crew)
-        heapq.heappush(self.heap, (100 - fatigue_score, self.counter, crew))
-        print(f"   [HEAP INSERT] {crew.name} with fatigue score {fatigue_score}")
-        self.counter += 1  # Increment for next insertion
+        with self._lock:
+            self._remove(crew)
+            # Use counter as tie-breaker: [fatigue level, tie_breaker, crew]
+            entry = [self.fatigue_level(fatigue_score), self.counter, crew]
+            self.entry_finder[crew.key] = entry
+            heapq.heappush(self.heap, entry)
+            self.counter += 1  # Increment for next insertion
+            self._maybe_compact()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("   [HEAP INSERT] %s with fatigue score %s", crew.name, fatigue_score)
     
-    def get_least_fatigued(self):
-        if self.heap:
-            fatigue, _, crew = heapq.heappop(self.heap)  # Note: unpack 3 elements now
-            actual_fatigue = 100 - fatigue
-            print(f"   [HEAP EXTRACT-MIN] {crew.name} (fatigue: {actual_fatigue})")
-            return crew
-        return None
+    def update(self, crew, fatigue_score):
+        """Change (or set) a crew member's fatigue score - O(log n)"""
+        self.insert(crew, fatigue_score)
     
-    def size(self):
-        return len(self.heap)
-
-
-class CertificationHashMap:
-    """
-    Hash Map for O(1) crew filtering by certification
-    Complexity: O(1) for lookup
-    Use Case: Instantly find crew certified for specific aircraft
-    """
-    def __init__(self):
-        self.cert_map = defaultdict(list)
+    def remove(self, crew):
+        """Invalidate a crew member's entry - O(1)"""
+        with self._lock:
+            self._remove(crew)
+            self._maybe_compact()
+    
+    def _remove(self, crew):
+        entry = self.entry_finder.pop(crew.key, None)
+        if entry is not None:
+            entry[-1] = self.REMOVED
+    
+    def _maybe_compact(self):
+        # O(n) heapify after at least n/2 invalidations: O(1) amortized
+        if len(self.heap) > 2 * len(self.entry_finder) + 64:
+            self.heap = [entry for entry in self.heap if entry[-1] is not self.REMOVED]
+            heapq.heapify(self.heap)
     
-    def add_crew(self, crew):
-        for cert in crew.data.get('certifications', []):
-            self.cert_map[cert].append(crew)
-        certs_str = ', '.join(crew.data.get('certifications', []))
-        print(f"   [HASH MAP INSERT] {crew.name} → [{certs_str}]")
+    def get_least_fatigued(self):
+        with self._lock:
+            while self.heap:
+                level, _, crew = heapq.heappop(self.heap)
+                if crew is self.REMOVED:
+                    continue
+                del self.entry_finder[crew.key]
+                break
+            else:
+                return None
+        logger.debug("   [HEAP EXTRACT-MIN] %s (fatigue score: %s)", crew.name, 100 - level)
+        return crew
     
-    def get_by_certification(self, cert_type):
-        result = self.cert_map.get(cert_type, [])
-        print(f"   [HASH MAP LOOKUP] '{cert_type}' → Found {len(result)} crew members")
+    def peek_least_fatigued(self, k):
+        """
+        Top k (crew, fatigueScore) without modifying the heap
+        O(k log k), plus any invalidated entries passed on the way
+        Walks the heap array best-first from the root: a node's children are
+        only explored once the node itself has been taken. The walk is short,
+        so it runs under the lock rather than on a snapshot.
+        """
+        result = []
+        with self._lock:
+            heap = self.heap
+            frontier = [(heap[0], 0)] if heap else []
+            while frontier and len(result) < k:
+                entry, i = heapq.heappop(frontier)
+                if entry[-1] is not self.REMOVED:
+                    result.append((entry[-1], 100 - entry[0]))
+                for child in (2 * i + 1, 2 * i + 2):
+                    if child < len(heap):
+                        heapq.heappush(frontier, (heap[child], child))
         return result
+    
+    def __contains__(self, crew):
+        return crew.key in self.entry_finder
+    
+    def size(self):
+        return len(self.entry_finder)
 
 
 class LocationGraph:
     """
-    Graph for connection feasibility
-    Complexity: O(1) for edge check, O(V + E) for DFS traversal
-    Use Case: Check if crew can reach flight origin
+    Weighted route network for crew positioning
+    Complexity: O((V + E) log V) Dijkstra once per source airport, then O(1)
+    reachability / travel-time queries from the per-source cache
+    Use Case: Check if crew can reach a flight origin and what deadheading costs
+    
+    Edges are directed legs weighted by travel time in minutes. Adding a leg
+    drops the cached shortest paths; a search that raced with the change is
+    not cached.
     """
+    DEFAULT_LEG_MINUTES = 120
+    
     def __init__(self):
-        self.adjacency = defaultdict(set)
+        self.adjacency = defaultdict(dict)  # origin -> {destination: minutes}
+        self._paths = {}  # source -> ({airport: minutes}, {airport: previous airport})
+        self._version = 0
+        self._lock = threading.Lock()
     
-    def add_route(self, origin, destination):
-        self.adjacency[origin].add(destination)
-        print(f"   [GRAPH ADD EDGE] {origin} → {destination}")
+    def add_route(self, origin, destination, minutes=DEFAULT_LEG_MINUTES):
+        with self._lock:
+            current = self.adjacency[origin].get(destination)
+            if current is None or minutes < current:
+                self.adjacency[origin][destination] = minutes
+            self._paths = {}
+            self._version += 1
+        logger.debug("   [GRAPH ADD EDGE] %s → %s (%d min)", origin, destination, minutes)
+    
+    def shortest_paths(self, source):
+        """Travel time and previous hop to every airport reachable from source (iterative Dijkstra)"""
+        cached = self._paths.get(source)
+        if cached is not None:
+            return cached
+        
+        version = self._version
+        adjacency = self.adjacency
+        dist = {source: 0}
+        prev = {}
+        frontier = [(0, source)]
+        while frontier:
+            minutes, airport = heapq.heappop(frontier)
+            if minutes > dist[airport]:
+                continue  # Stale entry; a shorter path was already settled
+            for neighbor, leg in list(adjacency.get(airport, {}).items()):
+                candidate = minutes + leg
+                if candidate < dist.get(neighbor, float('inf')):
+                    dist[neighbor] = candidate
+                    prev[neighbor] = airport
+                    heapq.heappush(frontier, (candidate, neighbor))
+        
+        with self._lock:
+            if self._version == version:
+                self._paths[source] = (dist, prev)
+        logger.debug("   [GRAPH DIJKSTRA] %s reaches %d airports", source, len(dist))
+        return dist, prev
+    
+    def travel_time(self, crew_location, flight_origin):
+        """Shortest positioning time in minutes, or None if unreachable"""
+        return self.shortest_paths(crew_location)[0].get(flight_origin)
+    
+    def path(self, crew_location, flight_origin):
+        """Airports on the shortest positioning route, both ends included ([] if unreachable)"""
+        dist, prev = self.shortest_paths(crew_location)
+        if flight_origin not in dist:
+            return []
+        route = [flight_origin]
+        while route[-1] != crew_location:
+            route.append(prev[route[-1]])
+        return route[::-1]
     
     def can_reach(self, crew_location, flight_origin):
-        # Direct connection check (O(1))
-        result = flight_origin in self.adjacency.get(crew_location, set()) or crew_location == flight_origin
-        status = "✓ YES" if result else "✗ NO"
-        print(f"   [GRAPH CHECK] Can {crew_location} reach {flight_origin}? {status}")
+        result = self.travel_time(crew_location, flight_origin) is not None
+        if logger.isEnabledFor(logging.DEBUG):
+            status = "✓ YES" if result else "✗ NO"
+            logger.debug("   [GRAPH CHECK] Can %s reach %s? %s", crew_location, flight_origin, status)
         return result
     
-    def find_affected_flights(self, disrupted_location):
+    def downstream_airports(self, disrupted_location):
         """
-        DFS traversal to find all affected flights
-        Complexity: O(V + E)
+        Iterative DFS to find every location downstream of a disruption
+        Complexity: O(V + E), no recursion depth limit
+        For the flights themselves, see FlightRouteIndex.affected
+        
+        Downstream means reachable by legs out of the disrupted airport, so
+        the set includes airports reached only by transiting it (the
+        connections that break while it is closed), the disrupted airport
+        first. It is not a set of routes still usable during the closure.
         """
-        print(f"   [GRAPH DFS] Finding flights affected by disruption at {disrupted_location}")
+        logger.debug("   [GRAPH DFS] Finding locations downstream of a disruption at %s", disrupted_location)
         affected = []
         visited = set()
-        
-        def dfs(location):
+        stack = [disrupted_location]
+        while stack:
+            location = stack.pop()
             if location in visited:
-                return
+                continue
             visited.add(location)
             affected.append(location)
-            for neighbor in self.adjacency.get(location, []):
-                dfs(neighbor)
-        
-        dfs(disrupted_location)
-        print(f"   [GRAPH DFS RESULT] {len(affected)} locations affected: {affected}")
+            stack.extend(n for n in self.adjacency.get(location, {}) if n not in visited)
+        logger.debug("   [GRAPH DFS RESULT] %d locations affected", len(affected))
         return affected
 
 
-class BSTRankingTree:
+class RankingSkipList:
     """
-    Binary Search Tree for performance-based ranking
-    Complexity: O(k + log n) for top-K extraction
-    Use Case: Get top performers efficiently
+    Indexable skip list for performance-based ranking (order-statistics structure)
+    Complexity: O(log n) expected for insert/delete/update/rank, O(log n + k) for top-K
+    Use Case: Live leaderboard of crew by composite score
+    
+    Every operation is iterative and the expected height is O(log n) whatever
+    order scores arrive in, so sorted input cannot degrade it into a list.
+    Each forward link stores its width (ranks skipped) to answer rank queries.
+    Ties keep insertion order: the earlier crew member ranks higher.
     """
+    MAX_LEVEL = 32
+    
     class Node:
-        def __init__(self, crew, score):
+        __slots__ = ('key', 'crew', 'score', 'next', 'width')
+        
+        def __init__(self, key, crew, score, level):
+            self.key = key  # (-score, arrival): ascending key order = best first
             self.crew = crew
             self.score = score
-            self.left = None
-            self.right = None
+            self.next = [None] * level
+            self.width = [1] * level  # Rank distance to next[i] (size + 1 - rank when None)
     
-    def __init__(self):
-        self.root = None
+    def __init__(self, seed=None):
+        self.head = self.Node(None, None, None, self.MAX_LEVEL)
+        self.level = 1  # Levels in use; links above it are never read
         self.size_count = 0
+        self.index = {}  # emp_id -> node
+        self.counter = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    def _random_level(self):
+        level = 1
+        while level < self.MAX_LEVEL and self._rng.random() < 0.5:
+            level += 1
+        return level
+    
+    def _find_predecessors(self, key):
+        """Rightmost node before key on every level, with its rank"""
+        update = [self.head] * self.MAX_LEVEL
+        ranks = [0] * self.MAX_LEVEL
+        node, rank = self.head, 0
+        for i in reversed(range(self.level)):
+            while node.next[i] is not None and node.next[i].key < key:
+                rank += node.width[i]
+                node = node.next[i]
+            update[i] = node
+            ranks[i] = rank
+        return update, ranks
     
     def insert(self, crew, score):
-        print(f"   [BST INSERT] {crew.name} with composite score {score:.2f}")
-        self.root = self._insert_recursive(self.root, crew, score)
+        """Add a crew member (or move them if already ranked)"""
+        logger.debug("   [RANKING INSERT] %s with composite score %.2f", crew.name, score)
+        with self._lock:
+            self._delete(crew.key)
+            self._insert(crew, score)
+    
+    def _insert(self, crew, score):
+        key = (-score, self.counter)
+        self.counter += 1
+        update, ranks = self._find_predecessors(key)
+        level = self._random_level()
+        for i in range(self.level, level):
+            self.head.width[i] = self.size_count + 1  # Head spans the whole list
+        self.level = max(self.level, level)
+        node = self.Node(key, crew, score, level)
+        new_rank = ranks[0] + 1
+        for i in range(self.level):
+            prev = update[i]
+            if i < level:
+                node.next[i] = prev.next[i]
+                prev.next[i] = node
+                node.width[i] = prev.width[i] - (new_rank - ranks[i]) + 1
+                prev.width[i] = new_rank - ranks[i]
+            else:
+                prev.width[i] += 1
+        self.index[crew.key] = node
         self.size_count += 1
     
-    def _insert_recursive(self, node, crew, score):
-        if not node:
-            return self.Node(crew, score)
-        if score >= node.score:
-            node.right = self._insert_recursive(node.right, crew, score)
-        else:
-            node.left = self._insert_recursive(node.left, crew, score)
-        return node
+    def delete(self, crew):
+        """Remove a crew member; returns False if they were not ranked"""
+        with self._lock:
+            return self._delete(crew.key)
+    
+    def _delete(self, emp_key):
+        node = self.index.pop(emp_key, None)
+        if node is None:
+            return False
+        update, _ = self._find_predecessors(node.key)
+        for i in range(self.level):
+            prev = update[i]
+            if prev.next[i] is node:
+                prev.width[i] += node.width[i] - 1
+                prev.next[i] = node.next[i]
+            else:
+                prev.width[i] -= 1
+        self.size_count -= 1
+        return True
+    
+    def update_score(self, crew, score):
+        """Re-rank a crew member after their score changed"""
+        self.insert(crew, score)
+    
+    def rank_of(self, crew):
+        """1-based rank of a crew member (1 = best), or None if not ranked"""
+        with self._lock:
+            target = self.index.get(crew.key)
+            if target is None:
+                return None
+            node, rank = self.head, 0
+            for i in reversed(range(self.level)):
+                while node.next[i] is not None and node.next[i].key <= target.key:
+                    rank += node.width[i]
+                    node = node.next[i]
+            return rank
+    
+    def get_by_rank(self, rank):
+        """(crew, score) at a 1-based rank"""
+        with self._lock:
+            if not 1 <= rank <= self.size_count:
+                raise IndexError('rank out of range')
+            node, pos = self.head, 0
+            for i in reversed(range(self.level)):
+                while node.next[i] is not None and pos + node.width[i] <= rank:
+                    pos += node.width[i]
+                    node = node.next[i]
+            return node.crew, node.score
     
     def get_top_k(self, k):
         """
-        Reverse in-order traversal to get top K performers
-        Complexity: O(k + log n)
+        Walk the bottom level from the head to get top K performers
+        Complexity: O(k)
         """
         result = []
-        self._inorder_reverse(self.root, result, k)
-        print(f"   [BST RANGE QUERY] Retrieved top {len(result)} performers from {self.size_count} total")
+        with self._lock:
+            node = self.head.next[0]
+            while node is not None and len(result) < k:
+                result.append((node.crew, node.score))
+                node = node.next[0]
+        logger.debug("   [RANKING TOP-K] Retrieved top %d performers from %d total", len(result), self.size_count)
         return result
     
-    def _inorder_reverse(self, node, result, k):
-        if not node or len(result) >= k:
+    def size(self):
+        return self.size_count
+
+
+# Backwards-compatible name; the unbalanced recursive BST it referred to is gone
+BSTRankingTree = RankingSkipList
+
+
+class TopKSelector:
+    """
+    Bounded Min-Heap for streaming top-K selection
+    Complexity: O(n log k) time, O(k) memory
+    Use Case: Pick the best K candidates without storing or sorting all of them
+    """
+    def __init__(self, k):
+        self.k = k
+        self.heap = []  # (score, -arrival, item); heap[0] is the weakest kept candidate
+        self.seen = 0
+    
+    def push(self, item, score):
+        self.push_all(((item, score),))
+    
+    def push_all(self, candidates):
+        """Feed an iterable of (item, score) pairs; most losers cost one comparison"""
+        heap, k = self.heap, self.k
+        if k <= 0:
             return
-        self._inorder_reverse(node.right, result, k)
-        if len(result) < k:
-            result.append((node.crew, node.score))
-        self._inorder_reverse(node.left, result, k)
+        seen = self.seen
+        for item, score in candidates:
+            if len(heap) < k:
+                heapq.heappush(heap, (score, -seen, item))
+            elif score > heap[0][0]:
+                # Ties never replace: the earlier arrival wins, like a stable sort
+                heapq.heapreplace(heap, (score, -seen, item))
+            seen += 1
+        self.seen = seen
+    
+    def results(self):
+        """Kept (item, score) pairs, best first"""
+        ranked = sorted(self.heap, key=lambda entry: entry[:2], reverse=True)
+        return [(item, score) for score, _, item in ranked]
 
 
 class BackupCrewQueue:
     """
-    Queue for standby crew management (FIFO)
-    Complexity: O(1) for enqueue/dequeue
-    Use Case: Manage backup crew in order of availability
+    Queue for standby crew management
+    Complexity: O(1) amortized enqueue/dequeue/remove, O(1) per crew for dequeue_many
+    Use Case: Call out backup crew, in bursts during a disruption
+    
+    FIFO by default. With a priority, crew are bucketed by a small integer
+    key and the lowest bucket is served first, FIFO within it. Each crew
+    member is also filed under its base, bucketed the same way, so
+    dequeue(base=...) serves crew already at an airport, in priority order,
+    before anyone who would have to deadhead there.
+    
+    Removal is lazy: members maps emp_id -> (ticket, bucket, base) of the live
+    entry, other entries are stale and skipped; the deques are compacted once
+    stale entries outnumber live ones.
     """
-    def __init__(self):
-        self.queue = []
+    PRIORITIES = {
+        'fifo': None,
+        'fatigue': lambda crew: 100 - int(crew.get('fatigueScore', 50)),  # Most rested first, as in the fatigue heap
+    }
+    
+    def __init__(self, priority='fifo'):
+        if priority not in self.PRIORITIES:
+            raise ValueError(f'unknown backup priority {priority!r}; use one of {sorted(self.PRIORITIES)}')
+        self.priority = priority
+        self._bucket_of = self.PRIORITIES[priority]
+        self.buckets = {}  # bucket -> deque of (ticket, emp_id, crew) in arrival order
+        self.by_base = defaultdict(dict)  # base -> {bucket: deque}, as in self.buckets
+        self.members = {}  # emp_id -> (ticket, bucket, base) of its live entry
+        self.counter = 0
+        self.entries = 0  # Live + stale entries across all deques
+        self._lock = threading.Lock()
     
     def enqueue(self, crew):
-        self.queue.append(crew)
-        print(f"   [QUEUE ENQUEUE] {crew.name} added to backup (position: {len(self.queue)})")
-    
-    def dequeue(self):
-        if self.queue:
-            crew = self.queue.pop(0)
-            print(f"   [QUEUE DEQUEUE] {crew.name} removed from backup ({len(self.queue)} remaining)")
-            return crew
-        print(f"   [QUEUE DEQUEUE] Queue is empty!")
-        return None
+        with self._lock:
+            if crew.key in self.members:
+                return
+            self._push(crew)
+        logger.debug("   [QUEUE ENQUEUE] %s added to backup (position: %d)", crew.name, len(self.members))
+    
+    def _push(self, crew):
+        bucket = self._bucket_of(crew) if self._bucket_of else 0
+        key = crew.key
+        entry = (self.counter, key, crew)
+        self.buckets.setdefault(bucket, deque()).append(entry)
+        self.by_base[crew.base_location].setdefault(bucket, deque()).append(entry)
+        self.members[key] = (self.counter, bucket, crew.base_location)
+        self.counter += 1
+        self.entries += 2
+    
+    def remove(self, crew):
+        """Take a specific crew member out of the backup queue - O(1)"""
+        with self._lock:
+            if self.members.pop(crew.key, None) is not None:
+                self._maybe_compact()
+    
+    def refresh(self, crew):
+        """Re-file a queued crew member whose base or priority changed (to the back of its new place)"""
+        with self._lock:
+            filed = self.members.get(crew.key)
+            if filed is None:
+                return
+            bucket = self._bucket_of(crew) if self._bucket_of else 0
+            if (bucket, crew.base_location) != filed[1:]:
+                del self.members[crew.key]
+                self._push(crew)
+                self._maybe_compact()
+    
+    def _is_live(self, entry):
+        filed = self.members.get(entry[1])
+        return filed is not None and filed[0] == entry[0]
+    
+    def _head(self, base=None):
+        """Deque whose first entry is the next crew member to serve, or None"""
+        if base is not None:
+            buckets = self.by_base.get(base)
+            if buckets:
+                queue = self._first_live(buckets)
+                if queue is not None:
+                    return queue
+        return self._first_live(self.buckets)
     
-    def peek(self):
-        if self.queue:
-            return self.queue[0]
+    def _first_live(self, buckets):
+        """Lowest bucket's deque, with stale entries dropped from its front, or None"""
+        # Buckets are few (bounded by the priority key's range), so min() is O(1) in n
+        while buckets:
+            bucket = min(buckets)
+            queue = buckets[bucket]
+            while queue:
+                if self._is_live(queue[0]):
+                    return queue
+                queue.popleft()
+                self.entries -= 1
+            del buckets[bucket]
         return None
     
+    def _pop(self, base=None):
+        queue = self._head(base)
+        if queue is None:
+            return None
+        _, key, crew = queue.popleft()
+        self.entries -= 1
+        del self.members[key]  # Its twin entry in the other deque is now stale
+        return crew
+    
+    def dequeue(self, base=None):
+        """Next backup crew member, preferring crew based at `base` if given"""
+        with self._lock:
+            crew = self._pop(base)
+            if crew is not None:
+                self._maybe_compact()
+            remaining = len(self.members)
+        if crew is None:
+            logger.debug("   [QUEUE DEQUEUE] Queue is empty!")
+            return None
+        logger.debug("   [QUEUE DEQUEUE] %s removed from backup (%d remaining)", crew.name, remaining)
+        return crew
+    
+    def dequeue_many(self, count, base=None):
+        """Up to count backup crew in dequeue order, under a single lock acquisition"""
+        callout = []
+        with self._lock:
+            while len(callout) < count:
+                crew = self._pop(base)
+                if crew is None:
+                    break
+                callout.append(crew)
+            self._maybe_compact()
+        logger.debug("   [QUEUE CALLOUT] %d backup crew called out (%d remaining)", len(callout), len(self.members))
+        return callout
+    
+    def peek(self, base=None):
+        with self._lock:
+            queue = self._head(base)
+            return queue[0][2] if queue is not None else None
+    
+    def _maybe_compact(self):
+        # Each live member has two entries; rebuild once stale ones dominate.
+        # The O(n) rebuild follows at least n removals, so it is O(1) amortized.
+        if self.entries <= 4 * len(self.members) + 64:
+            return
+        self._compact_buckets(self.buckets)
+        for base in list(self.by_base):
+            self._compact_buckets(self.by_base[base])
+            if not self.by_base[base]:
+                del self.by_base[base]
+        self.entries = 2 * len(self.members)
+    
+    def _compact_buckets(self, buckets):
+        for bucket in list(buckets):
+            live = deque(entry for entry in buckets[bucket] if self._is_live(entry))
+            if live:
+                buckets[bucket] = live
+            else:
+                del buckets[bucket]
+    
     def size(self):
-        return len(self.queue)
+        return len(self.members)
+
+
+class RosterAggregates:
+    """
+    Running counters over the crew roster
+    Complexity: O(c) per add/remove (c = certifications of one crew member), O(1) reads
+    Use Case: Dashboard stats and roster distributions without rescanning every crew member
+    
+    Counters are updated by subtracting a crew member's old contribution and
+    adding the new one, so every change costs the same regardless of roster size.
+    """
+    SUMMED_FIELDS = ('fatigueScore', 'performanceScore', 'reliabilityScore')
+    
+    def __init__(self, crew_data=()):
+        self.count = 0
+        self.available = 0  # Availability 'available' in any letter case
+        self.availability_counts = defaultdict(int)  # raw availability ('MISSING' if absent) -> crew
+        self.designation_counts = defaultdict(int)
+        self.base_counts = defaultdict(int)
+        self.cert_counts = defaultdict(int)  # certification -> certified crew
+        self.available_by_cert = defaultdict(int)  # certification -> available certified crew
+        self.assigned_by_flight = defaultdict(int)  # flight number -> crew assigned to it
+        self.sums = dict.fromkeys(self.SUMMED_FIELDS, 0)
+        self._lock = threading.Lock()
+        for data in crew_data:
+            self.add(data)
+    
+    def _apply(self, data, sign):
+        availability = data.get('availability', 'MISSING')
+        is_available = str(availability).lower() == 'available'
+        self.count += sign
+        self.available += sign * is_available
+        _bump(self.availability_counts, availability, sign)
+        _bump(self.designation_counts, data.get('designation', 'Unknown'), sign)
+        _bump(self.base_counts, data.get('baseLocation', data.get('baselocation', 'Unknown')), sign)
+        for cert in data.get('certifications', []):
+            _bump(self.cert_counts, cert, sign)
+            if is_available:
+                _bump(self.available_by_cert, cert, sign)
+        for flight_number in assigned_flights(data):
+            _bump(self.assigned_by_flight, flight_number, sign)
+        for field in self.SUMMED_FIELDS:
+            self.sums[field] += sign * data.get(field, 0)
+    
+    def add(self, data):
+        with self._lock:
+            self._apply(data, 1)
+    
+    def remove(self, data):
+        with self._lock:
+            self._apply(data, -1)
+    
+    def average(self, field):
+        return self.sums[field] / self.count if self.count else 0
+    
+    def snapshot(self):
+        """Consistent copy of every counter"""
+        with self._lock:
+            return {
+                'count': self.count,
+                'available': self.available,
+                'availability': dict(self.availability_counts),
+                'designation': dict(self.designation_counts),
+                'base': dict(self.base_counts),
+                'certification': dict(self.cert_counts),
+                'availableByCertification': dict(self.available_by_cert),
+                'assignedByFlight': dict(self.assigned_by_flight),
+                'averages': {f: (s / self.count if self.count else 0) for f, s in self.sums.items()},
+            }
+
+
+class FlightAggregates:
+    """
+    Running counters over the flight schedule
+    Complexity: O(1) per flight change, O(1) reads
+    Use Case: Count flights still needing crew without rescanning the schedule
+    
+    A flight's crew is its scheduled crewAssigned plus the crew assigned to
+    it since (counted from the roster's assignedFlights). update_flight is
+    the only way to change the latter, so the counters stay current.
+    """
+    def __init__(self, flight_data=(), assigned_by_flight=None):
+        self.count = 0
+        self.needs_assignment = 0
+        self.assigned = {}  # flight number -> crew assigned since the schedule was loaded
+        self._lock = threading.Lock()
+        for flight in flight_data:
+            self._apply(flight, 1)
+        if assigned_by_flight:
+            self.sync(flight_data, assigned_by_flight)
+    
+    def needs_crew(self, flight):
+        assigned = flight.get('crewAssigned', 0) + self.assigned.get(flight['flightNumber'], 0)
+        return assigned < flight.get('crewRequired', 6)
+    
+    def _apply(self, flight, sign):
+        self.count += sign
+        self.needs_assignment += sign * self.needs_crew(flight)
+    
+    def update_flight(self, flight, assigned):
+        """Set the crew assigned to a flight since the schedule was loaded"""
+        with self._lock:
+            self._apply(flight, -1)
+            if assigned:
+                self.assigned[flight['flightNumber']] = assigned
+            else:
+                self.assigned.pop(flight['flightNumber'], None)
+            self._apply(flight, 1)
+    
+    def sync(self, flight_data, assigned_by_flight):
+        """Take every flight's assigned count from a roster, e.g. after a reload"""
+        for flight in flight_data:
+            self.update_flight(flight, assigned_by_flight.get(flight['flightNumber'], 0))
+
+
+def minute_of_day(hhmm):
+    """'06:30' -> 390; None for a missing or malformed time"""
+    try:
+        hours, minutes = str(hhmm).split(':')
+        value = int(hours) * 60 + int(minutes)
+    except ValueError:
+        return None
+    return value if 0 <= value < 24 * 60 else None
+
+
+class FlightRouteIndex:
+    """
+    Flight lookup by airport and by departure time
+    Complexity: O(m) per airport and O(log n + m) per departure window for m
+    matching flights; O(n) per add/remove (the departure list is copy-on-write)
+    Use Case: Find the flights a closed airport or time window touches without scanning the schedule
+    """
+    def __init__(self, flights=()):
+        self.flights = {}  # flightNumber -> flight
+        self.by_airport = defaultdict(dict)  # airport -> {flightNumber: flight}, as origin or destination
+        self._lock = threading.Lock()
+        for flight in flights:
+            self._index(flight)
+        # Sorted (minute of day, flightNumber); flights without a departure are not timed.
+        # Replaced, never mutated, so readers can bisect it without locking.
+        self.departures = sorted(
+            (minute, number) for number, minute in
+            ((number, minute_of_day(f.get('departure'))) for number, f in self.flights.items())
+            if minute is not None
+        )
+    
+    def _index(self, flight):
+        number = flight['flightNumber']
+        self.flights[number] = flight
+        for airport in (flight.get('origin'), flight.get('destination')):
+            if airport:
+                self.by_airport[airport][number] = flight
+    
+    def add(self, flight):
+        with self._lock:
+            self._remove(flight['flightNumber'])
+            self._index(flight)
+            minute = minute_of_day(flight.get('departure'))
+            if minute is not None:
+                departures = list(self.departures)
+                bisect.insort(departures, (minute, flight['flightNumber']))
+                self.departures = departures
+    
+    def remove(self, flight_number):
+        with self._lock:
+            self._remove(flight_number)
+    
+    def _remove(self, number):
+        flight = self.flights.pop(number, None)
+        if flight is None:
+            return
+        for airport in (flight.get('origin'), flight.get('destination')):
+            self.by_airport.get(airport, {}).pop(number, None)
+        minute = minute_of_day(flight.get('departure'))
+        if minute is not None:
+            self.departures = [entry for entry in self.departures if entry != (minute, number)]
+    
+    def at_airport(self, airport):
+        """Flights departing from or arriving at an airport, ordered by departure"""
+        return sorted(self.by_airport.get(airport, {}).values(), key=_departure_order)
+    
+    def departing_between(self, start, end):
+        """
+        Flights departing in [start, end], both minutes of day, ordered by departure
+        A window with start > end wraps past midnight (e.g. 23:00-01:00)
+        """
+        departures = self.departures
+        spans = [(start, end)] if start <= end else [(start, 24 * 60 - 1), (0, end)]
+        flights = self.flights
+        result = []
+        for lo, hi in spans:
+            first = bisect.bisect_left(departures, (lo,))
+            last = bisect.bisect_left(departures, (hi + 1,))
+            result.extend(flights[number] for _, number in departures[first:last] if number in flights)
+        return result
+    
+    def affected(self, airport=None, start=None, end=None):
+        """Flights touched by a disruption: at an airport, departing in a window, or both"""
+        if start is not None and end is not None:
+            flights = self.departing_between(start, end)
+            if airport is not None:
+                flights = [f for f in flights if airport in (f.get('origin'), f.get('destination'))]
+        elif airport is not None:
+            flights = self.at_airport(airport)
+        else:
+            raise ValueError('a disruption needs an airport, a time window, or both')
+        logger.debug("   [ROUTE INDEX] %d flights affected (airport=%s, window=%s-%s)", len(flights), airport, start, end)
+        return flights
+
+
+def _departure_order(flight):
+    minute = minute_of_day(flight.get('departure'))
+    return (minute is None, minute or 0, flight['flightNumber'])
+
+
+class CrewTimeline:
+    """
+    Per-crew duty intervals in time order
+    Complexity: O(log d) fit check for a crew member with d duties (bisect),
+    O(d log d) to replace one crew member's duties
+    Use Case: Let crew fly several times a day without overlapping duties,
+    short rests or over-long duty days
+    
+    A duty is (start, end, origin, destination, flightNumber) in minutes of
+    the schedule day, report and debrief time included. Crew on duty whose
+    flights cannot all be timed are kept in `untimed` and never fit.
+    """
+    def __init__(self):
+        self.duties = {}  # emp_id -> (total duty minutes, sorted duties); replaced, never mutated
+        self.untimed = set()
+        self._lock = threading.Lock()
+    
+    def set_duties(self, key, duties, timed=True):
+        """Replace a crew member's duties (an empty list takes them off duty)"""
+        duties = sorted(duties, key=lambda duty: duty[:2])
+        with self._lock:
+            if duties:
+                self.duties[key] = (sum(end - start for start, end, *_ in duties), duties)
+            else:
+                self.duties.pop(key, None)
+            if timed:
+                self.untimed.discard(key)
+            else:
+                self.untimed.add(key)
+    
+    def is_busy(self, key):
+        """True if a crew member has any duty to check against"""
+        return key in self.duties or key in self.untimed
+    
+    def flights(self, key):
+        return [duty[4] for duty in self.duties.get(key, (0, ()))[1]]
+    
+    def position(self, key, start, home):
+        """Airport a crew member is at before a duty starting at `start` (home if no earlier duty)"""
+        duties = self.duties.get(key, (0, ()))[1]
+        i = bisect.bisect_left(duties, (start,))
+        return duties[i - 1][3] if i else home
+    
+    def conflict(self, key, start, end, origin, destination, travel_time, min_rest, max_duty):
+        """
+        Why a new duty cannot be added for a crew member, or None if it fits
+        travel_time(a, b) gives deadhead minutes between airports (None if
+        unreachable); a gap must cover min_rest plus any deadhead to the next origin.
+        """
+        if key in self.untimed:
+            return 'has duties with no scheduled time'
+        total, duties = self.duties.get(key, (0, ()))
+        if total + (end - start) > max_duty:
+            return f'would exceed the {max_duty}-minute duty limit'
+        
+        i = bisect.bisect_left(duties, (start,))
+        if i:
+            before = duties[i - 1]
+            conflict = _gap_conflict(before, start - before[1], before[3], origin, travel_time, min_rest)
+            if conflict:
+                return conflict
+        if i < len(duties):
+            after = duties[i]
+            conflict = _gap_conflict(after, after[0] - end, destination, after[2], travel_time, min_rest)
+            if conflict:
+                return conflict
+        return None
+
+
+def _gap_conflict(duty, gap, source, target, travel_time, min_rest):
+    if gap < 0:
+        return f'overlaps flight {duty[4]}'
+    deadhead = travel_time(source, target) if source != target else 0
+    if deadhead is None:
+        return f'cannot get from {source} to {target} around flight {duty[4]}'
+    if gap < min_rest + deadhead:
+        return f'needs {min_rest + deadhead} minutes between duties around flight {duty[4]}, has {gap}'
+    return None
+
+
+def _bump(counts, key, delta):
+    """Add delta to a counter, dropping keys that reach zero"""
+    value = counts[key] + delta
+    if value:
+        counts[key] = value
+    else:
+        del counts[key]
+
+
+class RecommendationCache:
+    """
+    Bounded LRU + TTL cache of recommendation results
+    Complexity: O(1) get/put/evict, O(entries for one aircraft) invalidation
+    Use Case: Serve repeated requests for a flight without rerunning the engine
+    
+    Entries are indexed by aircraft type, since a flight's candidates are
+    exactly the crew certified for its aircraft. A crew change therefore only
+    invalidates flights of the aircraft types that crew member holds.
+    Each aircraft also has a generation, bumped on invalidation, so a result
+    computed while its data was changing is never stored.
+    """
+    def __init__(self, max_entries=1024, ttl=300, clock=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock or time.monotonic
+        self.entries = OrderedDict()  # key -> (expires_at, result)
+        self.by_aircraft = defaultdict(set)  # aircraft -> keys
+        self.generations = defaultdict(int)  # aircraft -> invalidation count
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """
+        Cached result for key (aircraft first), or None
+        Returns (result, generation); pass generation back to put()
+        """
+        with self._lock:
+            generation = self.generations[key[0]]
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                self._discard(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None, generation
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], generation
+    
+    def put(self, key, result, generation):
+        with self._lock:
+            if self.generations[key[0]] != generation:
+                return  # Invalidated while result was being computed
+            self.entries[key] = (self.clock() + self.ttl, result)
+            self.entries.move_to_end(key)
+            self.by_aircraft[key[0]].add(key)
+            while len(self.entries) > self.max_entries:
+                self._discard(next(iter(self.entries)))
+                self.evictions += 1
+    
+    def _discard(self, key):
+        del self.entries[key]
+        keys = self.by_aircraft[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self.by_aircraft[key[0]]
+    
+    def invalidate_aircraft(self, aircraft_types):
+        """Drop every entry for flights of these aircraft types"""
+        with self._lock:
+            for aircraft in aircraft_types:
+                self.generations[aircraft] += 1
+                for key in self.by_aircraft.pop(aircraft, ()):
+                    del self.entries[key]
+                    self.invalidations += 1
+    
+    def clear(self):
+        with self._lock:
+            for aircraft in set(self.generations) | set(self.by_aircraft):
+                self.generations[aircraft] += 1
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+            self.by_aircraft.clear()
+    
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'maxEntries': self.max_entries,
+                'ttlSeconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': round(self.hits / lookups, 3) if lookups else 0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+
+class CrewBitmapIndex:
+    """
+    Bitmap index over crew rows
+    Complexity: O(v) per add/remove (v = indexed values of one crew member),
+    O(n / 64) per AND, O(n / 8) to decode a bitset into rows
+    Use Case: Combined candidate predicates (aircraft AND role AND language AND
+    availability) as a few bitwise ANDs instead of list scans
+    
+    Bit i of every bitset is the crew member in row i of the engine's score
+    matrix. Bitsets are Python ints, replaced rather than mutated in place, so
+    a reader always sees a whole bitset.
+    """
+    # field -> values a crew record contributes (availability / designation are case-insensitive)
+    FIELDS = {
+        'certification': lambda data: data.get('certifications', []),
+        'availability': lambda data: [str(data.get('availability', '')).lower()],
+        'base': lambda data: [data.get('baseLocation', data.get('baselocation'))],
+        'designation': lambda data: [str(data.get('designation', '')).lower()],
+        'language': lambda data: data.get('languages', []),
+    }
+    CASE_INSENSITIVE = {'availability', 'designation'}
+    SOURCE_KEYS = {'certifications', 'availability', 'baseLocation', 'baselocation', 'designation', 'languages'}
+    
+    def __init__(self):
+        self.bitsets = {field: {} for field in self.FIELDS}  # field -> value -> bitset
+        self.all_rows = 0
+        self._lock = threading.Lock()
+    
+    def _apply(self, row, data, add):
+        bit = 1 << row
+        for field, values_of in self.FIELDS.items():
+            index = self.bitsets[field]
+            for value in values_of(data):
+                bits = index.get(value, 0)
+                bits = bits | bit if add else bits & ~bit
+                if bits:
+                    index[value] = bits
+                else:
+                    index.pop(value, None)
+        self.all_rows = self.all_rows | bit if add else self.all_rows & ~bit
+    
+    def add(self, row, data):
+        with self._lock:
+            self._apply(row, data, True)
+    
+    def remove(self, row, data):
+        with self._lock:
+            self._apply(row, data, False)
+    
+    def update(self, row, old_data, new_data):
+        """Move a crew member's bits from its old indexed values to its new ones"""
+        with self._lock:
+            self._apply(row, old_data, False)
+            self._apply(row, new_data, True)
+    
+    def bitset(self, field, value):
+        if field in self.CASE_INSENSITIVE:
+            value = str(value).lower()
+        return self.bitsets[field].get(value, 0)
+    
+    def query(self, **criteria):
+        """
+        Bitset of crew matching every criterion, e.g.
+        query(certification='Boeing 737', availability='available', language=['Hindi', 'English'])
+        A list value requires all of its values; None values are ignored.
+        """
+        bits = self.all_rows
+        for field, value in criteria.items():
+            if value is None:
+                continue
+            for v in (value if isinstance(value, (list, tuple, set)) else [value]):
+                bits &= self.bitset(field, v)
+                if not bits:
+                    return 0
+        return bits
+    
+    @staticmethod
+    def rows(bits):
+        """Row numbers of the set bits, ascending"""
+        if not bits:
+            return []
+        packed = np.frombuffer(bits.to_bytes((bits.bit_length() + 7) // 8, 'little'), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(packed, bitorder='little')).tolist()
+    
+    @staticmethod
+    def count(bits):
+        return bin(bits).count('1')
+    
+    def memory_bytes(self):
+        """Approximate size of all bitsets"""
+        return sum(sys.getsizeof(bits) for index in self.bitsets.values() for bits in index.values())
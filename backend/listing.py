@@ -0,0 +1,115 @@
+"""
+Cursor pagination, sorting and field projection for list endpoints
+
+Pages are keyset-based: the cursor encodes the (sort value, primary key) of
+the last item returned, so a page costs O(m log limit) over the m matching
+records instead of a full sort, and records added or removed between
+requests never cause duplicated or skipped items.
+"""
+import base64
+import heapq
+import json
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# Value kinds of sortable fields; a cursor must match the kind it sorts on
+NUMBER = 'number'
+TEXT = 'text'
+_KIND_TYPES = {NUMBER: (int, float), TEXT: (str,)}
+
+
+def _is_kind(value, kind):
+    return isinstance(value, _KIND_TYPES[kind]) and not isinstance(value, bool)
+
+
+def parse_list_query(args, sortable_fields, default_sort, id_field):
+    """
+    Read limit / cursor / sort / fields from request args
+    sortable_fields maps each sortable field (id_field included) to its kind
+    Raises ValueError with a client-facing message on bad input
+    """
+    try:
+        limit = int(args.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f'limit must be between 1 and {MAX_LIMIT}')
+
+    sort = args.get('sort', default_sort)
+    descending = sort.startswith('-')
+    sort_field = sort.lstrip('-')
+    if sort_field not in sortable_fields:
+        raise ValueError(f'cannot sort by {sort_field!r}; use one of {sorted(sortable_fields)}')
+
+    cursor = args.get('cursor')
+    if cursor:
+        try:
+            cursor = tuple(json.loads(base64.urlsafe_b64decode(cursor.encode())))
+        except (ValueError, TypeError):
+            raise ValueError('invalid cursor')
+        if len(cursor) != 2:
+            raise ValueError('invalid cursor')
+        # A null sort value is a record missing the field; the key is always present
+        sort_value, primary_key = cursor
+        if not (sort_value is None or _is_kind(sort_value, sortable_fields[sort_field])) \
+                or not _is_kind(primary_key, sortable_fields[id_field]):
+            raise ValueError('invalid cursor')
+
+    fields = args.get('fields')
+    fields = [f.strip() for f in fields.split(',') if f.strip()] if fields else None
+
+    return {
+        'limit': limit,
+        'sort_field': sort_field,
+        'descending': descending,
+        'cursor': cursor or None,
+        'fields': fields,
+    }
+
+
+def _encode_cursor(sort_value, primary_key):
+    return base64.urlsafe_b64encode(json.dumps([sort_value, primary_key]).encode()).decode()
+
+
+def paginate(records, id_field, limit, sort_field, descending=False, cursor=None, fields=None):
+    """
+    One page of records ordered by (sort_field, id_field)
+    records may be any iterable of Mappings (e.g. a filtered generator); it is consumed once.
+    Returns {'items', 'nextCursor', 'total'} where total counts all matches.
+    """
+    def sort_key(record):
+        value = record.get(sort_field)
+        # Missing values come last ascending and first descending; (True, None)
+        # never compares None with a value
+        return (value is None, value, record[id_field])
+
+    matched = 0
+
+    def after_cursor():
+        nonlocal matched
+        cursor_key = (cursor[0] is None, cursor[0], cursor[1]) if cursor is not None else None
+        for record in records:
+            matched += 1
+            if cursor_key is not None:
+                key = sort_key(record)
+                if (key >= cursor_key) if descending else (key <= cursor_key):
+                    continue
+            yield record
+
+    select = heapq.nlargest if descending else heapq.nsmallest
+    page = select(limit + 1, after_cursor(), key=sort_key)
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        last = page[-1]
+        next_cursor = _encode_cursor(last.get(sort_field), last[id_field])
+
+    if fields:
+        keep = [id_field] + [f for f in fields if f != id_field]
+        page = [{f: record[f] for f in keep if f in record} for record in page]
+    else:
+        page = [dict(record) for record in page]  # Records may be read-only Mappings
+
+    return {'items': page, 'nextCursor': next_cursor, 'total': matched}
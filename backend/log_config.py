@@ -0,0 +1,37 @@
+"""
+Logging setup for the CrewSync backend
+
+Production (default): INFO and above, timestamped, per-item trace lines disabled
+so they cost one level check and no string formatting or I/O.
+
+Trace / teaching mode (CREWSYNC_TRACE=1): DEBUG to stdout with bare messages,
+reproducing the step-by-step data structure walkthrough.
+"""
+import logging
+import os
+import sys
+
+TRACE_ENV_VAR = 'CREWSYNC_TRACE'
+
+PRODUCTION_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+TRACE_FORMAT = '%(message)s'
+
+
+def trace_enabled():
+    """True when the environment asks for the verbose walkthrough"""
+    return os.environ.get(TRACE_ENV_VAR, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def configure_logging(trace=None):
+    """Install a single stdout handler on the root logger"""
+    if trace is None:
+        trace = trace_enabled()
+    
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(TRACE_FORMAT if trace else PRODUCTION_FORMAT))
+    logging.basicConfig(
+        level=logging.DEBUG if trace else logging.INFO,
+        handlers=[handler],
+        force=True
+    )
+    return trace
@@ -1,12 +1,25 @@
 from data_structures import *
+import logging
+import hashlib
 import re
-import random
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from schedule_optimizer import SOLVERS
+
+logger = logging.getLogger(__name__)
 
 
 class CrewRecommendationEngine:
     """
     17-Parameter Algorithmic Recommendation System
     NO ML/AI - Pure data structure-driven decision making
+    
+    Thread safety: get_recommendations reads the indexes without locking,
+    apart from the recommendation cache and stale score-cache rows;
+    update_crew is serialized by the engine's write lock, and each data
+    structure serializes its own mutations.
     """
     
     # Parameter weights (total = 100%)
@@ -30,46 +43,183 @@ class CrewRecommendationEngine:
         'routeFamiliarityScore': 0.01
     }
     
-    def __init__(self, crew_data):
-        self.crew_members = [CrewMember(c) for c in crew_data]
+    # Positioning bonus: crew at the origin get the full bonus, crew who must
+    # deadhead lose it linearly, reaching 0 at the horizon
+    POSITIONING_BONUS = 20
+    DEADHEAD_HORIZON_MINUTES = 480
+    
+    # Duty timing in minutes: report before departure, debrief after arrival,
+    # minimum rest between duties (plus any deadhead) and the daily duty limit
+    REPORT_MINUTES = 60
+    DEBRIEF_MINUTES = 30
+    MIN_REST_MINUTES = 60
+    MAX_DUTY_MINUTES = 600
+    
+    def __init__(self, crew_data, seed=0, routes=None, backup_priority='fifo', flights=None, score_matrix=None):
+        self.seed = seed  # Varies the deterministic location-boost jitter; same seed, same rankings
+        self.routes = routes  # [{origin, destination, minutes}, ...]; None = every airport one leg apart
+        self.backup_priority = backup_priority  # Order of backup callouts: a BackupCrewQueue.PRIORITIES key
+        self.schedule = {f['flightNumber']: f for f in flights or ()}  # Times the duties in assignedFlights
+        # Parameters go into one contiguous table (the score matrix); the crew
+        # records keep only slots, so crew_data itself need not be retained.
+        # score_matrix, if given, already holds them (crew_data then need not)
+        self.parameter_table = ParameterTable(self.WEIGHTS, crew_data, score_matrix)
+        self.score_matrix = self.parameter_table.matrix
+        self.crew_members = [CrewMember(c, self.parameter_table, row) for row, c in enumerate(crew_data)]
+        self.crew_by_id = {crew.key: crew for crew in self.crew_members}
+        self.weights_version = 0  # Bumped by set_weights; keys the static score cache
+        self.data_version = 0  # Bumped by every update_crew / set_weights; keys cached responses
+        self._write_lock = threading.Lock()
+        self._score_lock = threading.Lock()  # Guards matrix rows against cache fills
         
         # Initialize all data structures
-        self.cert_hashmap = CertificationHashMap()
+        self.bitmap_index = CrewBitmapIndex()
         self.location_graph = LocationGraph()
         self.fatigue_heap = MinHeapCrewScheduler()
-        self.backup_queue = BackupCrewQueue()
+        self.backup_queue = BackupCrewQueue(backup_priority)
+        self.aggregates = RosterAggregates()
+        self.recommendation_cache = RecommendationCache()
+        self.timeline = CrewTimeline()
         
         self._initialize_data_structures()
     
     def _initialize_data_structures(self):
         """Populate all data structures with crew data"""
-        print("\n" + "="*70)
-        print("INITIALIZING DATA STRUCTURES")
-        print("="*70)
+        logger.debug("\n" + "="*70)
+        logger.debug("INITIALIZING DATA STRUCTURES")
+        logger.debug("="*70)
         
-        print("\n[1] HASH MAP - Certification Index")
+        logger.debug("\n[1] MIN-HEAP - Fatigue Monitoring (available crew)")
         for crew in self.crew_members:
-            self.cert_hashmap.add_crew(crew)
+            if (crew.availability or '').lower() == 'available':
+                self.fatigue_heap.insert(crew, crew.get('fatigueScore', 50))
         
-        print("\n[2] MIN-HEAP - Fatigue Monitoring")
+        logger.debug("\n[2] QUEUE - Backup Crew Management")
         for crew in self.crew_members:
-            self.fatigue_heap.insert(crew, crew.data.get('fatigueScore', 50))
+            if crew.availability == 'Backup':
+                self.backup_queue.enqueue(crew)
         
-        print("\n[3] QUEUE - Backup Crew Management")
+        logger.debug("\n[3] MATRIX - Columnar Score Matrix")
+        self._build_score_matrix()
+        logger.debug("   [MATRIX BUILD] %d crew × %d parameters", *self.score_matrix.shape)
+        self._fill_score_cache(np.arange(len(self.crew_members), dtype=np.intp))
+        logger.debug("   [SCORE CACHE] %d static composite scores precomputed", len(self.crew_members))
+        
+        logger.debug("\n[4] GRAPH - Location Network")
+        if self.routes is not None:
+            for leg in self.routes:
+                self.location_graph.add_route(leg['origin'], leg['destination'], leg['minutes'])
+        else:
+            locations = ['DEL', 'BOM', 'BLR', 'HYD', 'GOI']
+            for loc1 in locations:
+                for loc2 in locations:
+                    if loc1 != loc2:
+                        self.location_graph.add_route(loc1, loc2)
+        
+        logger.debug("\n[5] COUNTERS - Roster Aggregates")
         for crew in self.crew_members:
-            if crew.data.get('availability') == 'Backup':
-                self.backup_queue.enqueue(crew)
+            self.aggregates.add(crew)
+        logger.debug("   [AGGREGATES] %d available of %d crew", self.aggregates.available, self.aggregates.count)
         
-        print("\n[4] GRAPH - Location Network")
-        locations = ['DEL', 'BOM', 'BLR', 'HYD', 'GOI']
-        for loc1 in locations:
-            for loc2 in locations:
-                if loc1 != loc2:
-                    self.location_graph.add_route(loc1, loc2)
+        logger.debug("\n[6] BITMAP INDEX - Certification / Availability / Base / Designation")
+        for crew in self.crew_members:
+            self.bitmap_index.add(crew.row, crew)
+        logger.debug("   [BITMAP] %d bitsets, %d bytes", 
+                     sum(len(index) for index in self.bitmap_index.bitsets.values()), self.bitmap_index.memory_bytes())
         
-        print("\n" + "="*70)
-        print(f"✓ Initialized {len(self.crew_members)} crew members across all data structures")
-        print("="*70 + "\n")
+        logger.debug("\n[7] SORTED INTERVALS - Crew Duty Timelines")
+        for crew in self.crew_members:
+            self._refresh_duties(crew)
+        logger.debug("   [TIMELINE] %d crew on duty, %d with untimed duties",
+                     len(self.timeline.duties), len(self.timeline.untimed))
+        
+        logger.debug("\n" + "="*70)
+        logger.info("✓ Initialized %d crew members across all data structures", len(self.crew_members))
+        logger.debug("="*70 + "\n")
+    
+    def get_crew(self, emp_id):
+        """O(1) lookup of a CrewMember by employee ID (int or string)"""
+        return self.crew_by_id.get(normalize_emp_id(emp_id))
+    
+    def update_crew(self, emp_id, changes):
+        """
+        Apply field changes to one crew member and patch every index in place
+        Complexity: O(1) queue / score cache / aggregates, O(log n) heap, O(17) matrix row
+        Returns the updated CrewMember, or None if emp_id is unknown
+        """
+        crew = self.get_crew(emp_id)
+        if crew is None:
+            return None
+        
+        with self._write_lock:
+            old_certs = crew.certifications
+            was_backup = crew.availability == 'Backup'
+            was_candidate = (crew.availability or '').lower() == 'available'
+            was_eligible = was_candidate or self.timeline.is_busy(crew.key)
+            
+            old_data = crew.to_dict()
+            self.aggregates.remove(old_data)
+            with self._score_lock:
+                crew.update(changes)
+                if any(param in changes for param in self.WEIGHTS):
+                    self.score_cache_version[crew.row] = -1  # Recomputed on next use
+            self.aggregates.add(crew)
+            if not self.bitmap_index.SOURCE_KEYS.isdisjoint(changes):
+                self.bitmap_index.update(crew.row, old_data, crew)
+            
+            is_backup = crew.availability == 'Backup'
+            if is_backup and not was_backup:
+                self.backup_queue.enqueue(crew)
+            elif was_backup and not is_backup:
+                self.backup_queue.remove(crew)
+            elif is_backup:
+                self.backup_queue.refresh(crew)  # Its base or priority may have changed
+            
+            # The fatigue heap holds exactly the available crew
+            is_candidate = (crew.availability or '').lower() == 'available'
+            if is_candidate and (not was_candidate or 'fatigueScore' in changes):
+                self.fatigue_heap.update(crew, crew.get('fatigueScore', 50))
+            elif was_candidate and not is_candidate:
+                self.fatigue_heap.remove(crew)
+            
+            if not {'availability', 'assignedFlight', 'assignedFlights'}.isdisjoint(changes):
+                self._refresh_duties(crew)
+            
+            self.data_version += 1
+            
+            # Only flights this crew member was or now is a candidate for change
+            if was_eligible or is_candidate or self.timeline.is_busy(crew.key):
+                self.recommendation_cache.invalidate_aircraft(set(old_certs) | set(crew.certifications))
+        
+        logger.debug("   [ENGINE UPDATE] %s ← %s", crew.name, changes)
+        return crew
+    
+    def export_crew(self):
+        """Every crew member as a JSON record, e.g. for persisting the roster"""
+        return [crew.to_dict() for crew in self.crew_members]
+    
+    def snapshot(self):
+        """
+        Consistent copy of the engine's inputs, for building a replica elsewhere
+        Returns (data_version, config, score matrix copy): config holds the
+        constructor arguments, with crew records stripped of their parameters
+        (those are the matrix), plus the current weights.
+        """
+        index = self.parameter_table.index
+        with self._write_lock:
+            crew = [
+                {k: v for k, v in member.to_dict().items() if k not in index}
+                for member in self.crew_members
+            ]
+            config = {
+                'crew_data': crew,
+                'seed': self.seed,
+                'routes': self.routes,
+                'backup_priority': self.backup_priority,
+                'flights': list(self.schedule.values()),
+                'weights': dict(self.WEIGHTS),
+            }
+            return self.data_version, config, self.score_matrix.copy()
     
     def calculate_composite_score(self, crew_data, flight_data=None):
         """Calculate weighted composite score from all 17 parameters"""
@@ -80,161 +230,558 @@ class CrewRecommendationEngine:
         
         return round(score, 2)
     
+    def _build_score_matrix(self):
+        """
+        Set up vectorized scoring over the crew × parameter matrix
+        Row i holds the 17 parameters of self.crew_members[i], columns follow WEIGHTS order
+        """
+        self.weight_vector = np.array(list(self.WEIGHTS.values()), dtype=np.float64)
+        
+        # Per-crew hash of the employee ID, mixed with a per-flight hash for jitter
+        self.crew_salt = np.fromiter(
+            (_stable_hash(crew.key) for crew in self.crew_members), dtype=np.uint64, count=len(self.crew_members)
+        )
+        
+        # Static score cache: row -> composite score, valid while its version
+        # matches weights_version (-1 marks a crew member whose data changed)
+        self.score_cache = np.zeros(len(self.crew_members), dtype=np.float64)
+        self.score_cache_version = np.full(len(self.crew_members), -1, dtype=np.int64)
+    
+    def set_weights(self, weights):
+        """
+        Replace the parameter weights and invalidate every cached score in O(1)
+        weights must cover exactly the 17 WEIGHTS parameters
+        """
+        if set(weights) != set(self.WEIGHTS):
+            raise ValueError('weights must define exactly the 17 scoring parameters')
+        with self._write_lock, self._score_lock:
+            self.WEIGHTS = {p: weights[p] for p in self.WEIGHTS}  # Keep matrix column order
+            self.weight_vector = np.array(list(self.WEIGHTS.values()), dtype=np.float64)
+            self.weights_version += 1
+            self.data_version += 1
+            self.recommendation_cache.clear()
+    
+    def compute_composite_scores(self, rows):
+        """
+        Vectorized composite score for score matrix rows, bypassing the cache
+        Complexity: O(n × 17) in NumPy instead of 17 dict lookups per crew in Python
+        
+        The product is accumulated column by column in WEIGHTS order, so every
+        score is bit-for-bit the value calculate_composite_score returns.
+        """
+        block = self.score_matrix[rows]
+        scores = np.zeros(len(rows), dtype=np.float64)
+        for col, weight in enumerate(self.weight_vector):
+            scores += block[:, col] * weight
+        return [round(score, 2) for score in scores.tolist()]
+    
+    def _fill_score_cache(self, rows):
+        # Only runs for stale rows, so the common all-cached read never locks
+        with self._score_lock:
+            self.score_cache[rows] = self.compute_composite_scores(rows)
+            self.score_cache_version[rows] = self.weights_version
+    
+    def calculate_composite_scores(self, crews):
+        """
+        Composite scores for a list of CrewMember objects
+        Complexity: O(n) cache reads; only crew invalidated since their last
+        use (or all of them after set_weights) are rescored
+        """
+        if not crews:
+            return []
+        rows = np.fromiter((crew.row for crew in crews), dtype=np.intp, count=len(crews))
+        stale = rows[self.score_cache_version[rows] != self.weights_version]
+        if len(stale):
+            self._fill_score_cache(stale)
+        return self.score_cache[rows].tolist()
+    
     def _format_parameter_name(self, param_name):
         """Convert camelCase parameter name to readable format"""
         name = param_name.replace('Score', '')
         name = re.sub(r'([A-Z])', r' \1', name)
         return name.strip()
     
+    def _cache_key(self, flight_data, top_k):
+        # Aircraft first: the cache indexes entries by it for invalidation.
+        # The flight number is part of the key because it seeds the jitter.
+        return self._requirements(flight_data) + (
+            flight_data['origin'], flight_data.get('destination'), flight_data.get('flightNumber'), top_k
+        )
+    
     def get_recommendations(self, flight_data, top_k=5):
+        """
+        Recommendations for one flight, served from the result cache when its
+        candidates have not changed since the last computation
+        """
+        key = self._cache_key(flight_data, top_k)
+        cached, generation = self.recommendation_cache.get(key)
+        if cached is not None:
+            logger.debug("   [CACHE HIT] %s top %d", flight_data.get('flightNumber'), top_k)
+            return cached
+        recommendations = self.compute_recommendations(flight_data, top_k)
+        self.recommendation_cache.put(key, recommendations, generation)
+        return recommendations
+    
+    def compute_recommendations(self, flight_data, top_k=5):
         """
         Main recommendation algorithm - FLIGHT SPECIFIC VERSION
         Forces different crew for different flights based on base location priority
         """
-        print("\n" + "="*70)
-        print(f"RECOMMENDATION ENGINE: {flight_data['flightNumber']} ({flight_data['route']})")
-        print("="*70)
-        
-        # STEP 1: Filter by certification using Hash Map (O(1))
-        print(f"\n[STEP 1] HASH MAP FILTERING - Aircraft: {flight_data['aircraft']}")
-        print("-" * 70)
-        eligible_crew = self.cert_hashmap.get_by_certification(flight_data['aircraft'])
-        print(f"   Result: {len(eligible_crew)} crew members certified for {flight_data['aircraft']}")
-        
-        # STEP 2: Filter by availability (case-insensitive)
-        print(f"\n[STEP 2] AVAILABILITY FILTERING")
-        print("-" * 70)
-        available_crew = [
-            c for c in eligible_crew 
-            if c.data.get('availability', '').lower() == 'available'
-        ]
-        print(f"   Available crew: {len(available_crew)} out of {len(eligible_crew)}")
-        
-        if len(available_crew) > 0:
+        # Per-crew trace lines are only formatted when trace logging is on
+        trace = logger.isEnabledFor(logging.DEBUG)
+        
+        if trace:
+            logger.debug("\n" + "="*70)
+            logger.debug("RECOMMENDATION ENGINE: %s (%s)", flight_data['flightNumber'], flight_data['route'])
+            logger.debug("="*70)
+        
+        # STEP 1: Filter by certification (and any role / language requirement) using the bitmap index
+        if trace:
+            logger.debug("\n[STEP 1] BITMAP FILTERING - Aircraft: %s", flight_data['aircraft'])
+            logger.debug("-" * 70)
+            qualified = self.bitmap_index.count(self._requirement_bits(flight_data))
+            logger.debug("   Result: %d crew members qualified for %s", qualified, flight_data['aircraft'])
+        
+        # STEP 2: Filter by availability (case-insensitive) - one more AND
+        available_crew = self._eligible_crew(flight_data)
+        if trace:
+            logger.debug("\n[STEP 2] AVAILABILITY FILTERING")
+            logger.debug("-" * 70)
+            logger.debug("   Available crew: %d out of %d", len(available_crew), qualified)
             for crew in available_crew[:5]:
-                print(f"   ✓ {crew.name} - {crew.base_location}")
+                logger.debug("   ✓ %s - %s", crew.name, crew.base_location)
             if len(available_crew) > 5:
-                print(f"   ... and {len(available_crew) - 5} more")
+                logger.debug("   ... and %d more", len(available_crew) - 5)
         
         if len(available_crew) == 0:
-            print(f"\n   ⚠ WARNING: No available crew found!")
+            logger.warning("\n   ⚠ WARNING: No available crew found!")
             return []
         
-        # STEP 3: Check location feasibility using Graph (O(1) per check)
-        print(f"\n[STEP 3] GRAPH CONNECTIVITY CHECK")
-        print("-" * 70)
+        # STEP 3: Check location feasibility using Graph (O(1) per check once
+        # each base's shortest paths are cached)
+        if trace:
+            logger.debug("\n[STEP 3] GRAPH CONNECTIVITY CHECK")
+            logger.debug("-" * 70)
         origin = flight_data['origin']
         reachable_crew = []
         for crew in available_crew:
             can_reach = self.location_graph.can_reach(crew.base_location, origin)
             if can_reach:
                 reachable_crew.append(crew)
-        print(f"   Result: {len(reachable_crew)} crew can reach {origin}")
+        if trace:
+            logger.debug("   Result: %d crew can reach %s", len(reachable_crew), origin)
         
         if len(reachable_crew) == 0:
-            print(f"\n   ⚠ WARNING: No crew can reach {origin}!")
+            logger.warning("\n   ⚠ WARNING: No crew can reach %s!", origin)
             return []
         
-        # STEP 4: AGGRESSIVE FILTERING - Prioritize by base location
-        print(f"\n[STEP 4] LOCATION-BASED PRIORITY FILTERING")
-        print("-" * 70)
-        
-        # Separate crew by location priority
-        at_origin = []
-        near_origin = []
-        others = []
-        
-        for crew in reachable_crew:
-            base = crew.base_location
-            if base == origin:
-                at_origin.append(crew)
-            elif base == flight_data.get('destination'):
-                near_origin.append(crew)
-            else:
-                others.append(crew)
+        # STEP 3b: Fit the flight around any duties already on each roster
+        pool = list(zip(reachable_crew, self.calculate_composite_scores(reachable_crew)))
+        pool, positions = self._fit_schedule(flight_data, pool)
+        if trace and positions:
+            logger.debug("\n[STEP 3b] DUTY TIMELINE CHECK")
+            logger.debug("-" * 70)
+            logger.debug("   %d crew fit around earlier duties (%d coming off another flight)",
+                         len(pool), len(positions))
+        
+        if len(pool) == 0:
+            logger.warning("\n   ⚠ WARNING: No crew fit %s around their duties!", flight_data['flightNumber'])
+            return []
         
-        print(f"   Crew at origin ({origin}): {len(at_origin)}")
-        print(f"   Crew at destination ({flight_data.get('destination')}): {len(near_origin)}")
-        print(f"   Other locations: {len(others)}")
+        # STEP 4: Deadheading cost per base location (shortest travel time to origin)
+        if trace:
+            logger.debug("\n[STEP 4] DEADHEAD COST BY BASE LOCATION")
+            logger.debug("-" * 70)
+            for base in sorted({crew.base_location for crew in reachable_crew}):
+                minutes = self.location_graph.travel_time(base, origin)
+                logger.debug("   %s → %s: %d min via %s (bonus %.1f)", base, origin, minutes,
+                             ' → '.join(self.location_graph.path(base, origin)), self.positioning_bonus(minutes))
         
         # STEP 5: Score and rank with HEAVY location weighting
-        print(f"\n[STEP 5] WEIGHTED SCORING WITH LOCATION BOOST")
-        print("-" * 70)
-        
-        crew_scores = []
-        
-        # Process crew at origin (HUGE bonus)
-        for crew in at_origin:
-            base_score = self.calculate_composite_score(crew.data, flight_data)
-            boosted_score = base_score + 20 + random.uniform(0, 5)  # +20-25 bonus
-            crew_scores.append((crew, boosted_score))
-            print(f"   {crew.name} (AT {origin}): {base_score:.2f} → {boosted_score:.2f} (+20 location bonus)")
-        
-        # Process crew near destination (medium bonus)
-        for crew in near_origin:
-            base_score = self.calculate_composite_score(crew.data, flight_data)
-            boosted_score = base_score + 10 + random.uniform(0, 3)  # +10-13 bonus
-            crew_scores.append((crew, boosted_score))
-            print(f"   {crew.name} (NEAR DEST): {base_score:.2f} → {boosted_score:.2f} (+10 bonus)")
-        
-        # Process other crew (small bonus to create variety)
-        for crew in others:
-            base_score = self.calculate_composite_score(crew.data, flight_data)
-            # Add random factor based on flight number to vary results
-            flight_num = int(''.join(filter(str.isdigit, flight_data.get('flightNumber', '0'))))
-            seed_factor = (flight_num % 10) + random.uniform(0, 5)
-            boosted_score = base_score + seed_factor
-            crew_scores.append((crew, boosted_score))
-        
-        # Sort by score (highest first)
-        crew_scores.sort(key=lambda x: x[1], reverse=True)
-        
-        # Take top K
-        top_recommendations = crew_scores[:top_k]
+        if trace:
+            logger.debug("\n[STEP 5] WEIGHTED SCORING WITH POSITIONING BONUS")
+            logger.debug("-" * 70)
+        
+        # Stream scored candidates straight into a bounded heap (no full sort)
+        candidates = self._score_candidates(flight_data, pool, trace, positions)
+        top_recommendations = self.select_top_k(candidates, top_k)
         
         # Format recommendations
-        print(f"\n[STEP 6] TOP {top_k} RECOMMENDATIONS FOR {flight_data['flightNumber']}")
-        print("-" * 70)
+        if trace:
+            logger.debug("\n[STEP 6] TOP %d RECOMMENDATIONS FOR %s", top_k, flight_data['flightNumber'])
+            logger.debug("-" * 70)
+        
+        recommendations = self._format_recommendations(top_recommendations)
+        if trace:
+            for rec in recommendations:
+                logger.debug("   #%d %s (%s) - Score: %.2f", rec['rank'], rec['name'], rec['baseLocation'], rec['compositeScore'])
+        
+        if trace:
+            logger.debug("\n" + "="*70)
+            logger.debug("✓ RECOMMENDATION COMPLETE - %d UNIQUE candidates for %s", len(recommendations), flight_data['flightNumber'])
+            logger.debug("="*70 + "\n")
         
+        return recommendations
+    
+    def get_batch_recommendations(self, flights, top_k=5):
+        """
+        Recommendations for many flights in one pass
+        Complexity: one certification lookup, availability filter and score
+        read per aircraft type, one reachability pass per (aircraft, origin),
+        then O(n log k) selection per flight
+        Returns {flightNumber: recommendations}, each list shaped like get_recommendations
+        Flights already in the result cache are not recomputed.
+        """
+        results = {}
+        misses = []
+        for flight in flights:
+            key = self._cache_key(flight, top_k)
+            cached, generation = self.recommendation_cache.get(key)
+            if cached is not None:
+                results[flight['flightNumber']] = cached
+            else:
+                misses.append((flight, key, generation))
+        
+        ranked = self._rank_flights([flight for flight, _, _ in misses], top_k)
+        for (number, recommendations), (_, key, generation) in zip(ranked, misses):
+            self.recommendation_cache.put(key, recommendations, generation)
+            results[number] = recommendations
+        
+        # Keep the requested flight order
+        return {f['flightNumber']: results[f['flightNumber']] for f in flights}
+    
+    def recompute_recommendations(self, flights, top_k=5, exclude_bases=(), workers=1):
+        """
+        Fresh recommendations for a set of flights, e.g. those hit by a disruption
+        Crew based at any of exclude_bases (stranded at a closed airport) are
+        left out with one bitmap AND-NOT. Flights are split across `workers`
+        threads, keeping flights that share a candidate pool on the same thread.
+        The result cache is bypassed: these candidate sets differ from normal requests.
+        Returns {flightNumber: recommendations}, in flight order
+        """
+        exclude = 0
+        for base in exclude_bases:
+            exclude |= self.bitmap_index.bitset('base', base)
+        
+        if workers <= 1 or len(flights) < 2:
+            results = dict(self._rank_flights(flights, top_k, exclude))
+        else:
+            results = {}
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for part in executor.map(lambda chunk: dict(self._rank_flights(chunk, top_k, exclude)),
+                                         self.split_flights(flights, workers)):
+                    results.update(part)
+        
+        logger.debug("   [RECOMPUTE] %d flights on %d workers, %d bases excluded", len(flights), workers, len(exclude_bases))
+        return {f['flightNumber']: results[f['flightNumber']] for f in flights}
+    
+    def split_flights(self, flights, parts):
+        """
+        Up to `parts` balanced, non-empty chunks of flights
+        Flights that share a candidate pool (same requirements and origin)
+        stay in one chunk, so the pool is built once.
+        """
+        groups = defaultdict(list)
+        for flight in flights:
+            groups[(self._requirements(flight), flight['origin'])].append(flight)
+        chunks = [[] for _ in range(parts)]
+        for group in sorted(groups.values(), key=len, reverse=True):
+            min(chunks, key=len).extend(group)  # Largest group to the least loaded chunk
+        return [chunk for chunk in chunks if chunk]
+    
+    def _rank_flights(self, flights, top_k, exclude=0):
+        """Yield (flightNumber, recommendations) for each flight, sharing candidate work"""
+        formatted = {}  # emp key -> formatted crew, shared by every flight it is recommended for
+        for flight, pool in self._candidate_pools(flights, exclude):
+            # STEP 4-6: duty fit, per-flight positioning bonus, top K and formatting
+            pool, positions = self._fit_schedule(flight, pool)
+            candidates = self._score_candidates(flight, pool, positions=positions)
+            top = self.select_top_k(candidates, top_k)
+            yield flight['flightNumber'], self._format_recommendations(top, formatted)
+    
+    def _candidate_pools(self, flights, exclude=0):
+        """
+        Yield (flight, [(crew, base_score), ...]) of certified, available,
+        reachable crew for each flight, sharing work between flights
+        exclude is a bitset of crew rows to leave out
+        """
+        # STEP 1-2: qualified, available crew and their static scores, per requirement set
+        by_requirements = {}
+        # STEP 3: reachable crew per (requirements, origin)
+        reachable = {}
+        for flight in flights:
+            requirements = self._requirements(flight) + (self.duty_window(flight) is not None,)
+            if requirements not in by_requirements:
+                crews = self._eligible_crew(flight, exclude)
+                by_requirements[requirements] = list(zip(crews, self.calculate_composite_scores(crews)))
+            
+            group = (requirements, flight['origin'])
+            if group not in reachable:
+                reachable[group] = [
+                    (crew, score) for crew, score in by_requirements[requirements]
+                    if self.location_graph.can_reach(crew.base_location, flight['origin'])
+                ]
+            yield flight, reachable[group]
+        
+        logger.debug("   [CANDIDATES] %d flights, %d requirement sets, %d origin groups",
+                     len(flights), len(by_requirements), len(reachable))
+    
+    def _requirements(self, flight_data):
+        """What a flight asks of its crew: aircraft certification, optional role and languages"""
+        languages = flight_data.get('languages')
+        return (flight_data['aircraft'], flight_data.get('designation'), tuple(languages) if languages else None)
+    
+    def _requirement_bits(self, flight_data):
+        aircraft, designation, languages = self._requirements(flight_data)
+        return self.bitmap_index.query(certification=aircraft, designation=designation, language=languages)
+    
+    def _eligible_crew(self, flight_data, exclude=0):
+        """
+        Qualified crew for a flight: a few bitmap ANDs, decoded to CrewMembers
+        Available crew always; for a timed flight also crew already on duty,
+        whose timelines _fit_schedule then checks
+        """
+        aircraft, designation, languages = self._requirements(flight_data)
+        bits = self.bitmap_index.query(certification=aircraft, designation=designation, language=languages)
+        status = self.bitmap_index.bitset('availability', 'available')
+        if self.duty_window(flight_data) is not None:
+            status |= self.bitmap_index.bitset('availability', 'assigned')
+        bits &= status
+        if exclude:
+            bits &= ~exclude
+        members = self.crew_members
+        return [members[row] for row in self.bitmap_index.rows(bits)]
+    
+    def duty_window(self, flight):
+        """
+        (start, end) of the duty a flight creates, in minutes of its day, or None if untimed
+        Block time is the flight's blockMinutes, else the route graph's travel time
+        """
+        departure = minute_of_day(flight.get('departure'))
+        if departure is None:
+            return None
+        block = flight.get('blockMinutes')
+        if block is None:
+            block = self.location_graph.travel_time(flight['origin'], flight.get('destination'))
+        if block is None:
+            block = LocationGraph.DEFAULT_LEG_MINUTES
+        return departure - self.REPORT_MINUTES, departure + block + self.DEBRIEF_MINUTES
+    
+    def _refresh_duties(self, crew):
+        """Rebuild a crew member's timeline from its assigned flights"""
+        duties = []
+        timed = True
+        for number in assigned_flights(crew):
+            flight = self.schedule.get(number)
+            window = self.duty_window(flight) if flight is not None else None
+            if window is None:
+                timed = False
+                continue
+            duties.append((*window, flight['origin'], flight.get('destination'), number))
+        if (crew.availability or '').lower() == 'assigned' and not duties:
+            timed = False  # On duty, but for what and when is unknown
+        self.timeline.set_duties(crew.key, duties, timed)
+    
+    def schedule_conflict(self, crew, flight):
+        """Why crew cannot take flight, or None if status and timeline allow it"""
+        status = (crew.availability or '').lower()
+        window = self.duty_window(flight)
+        if status != 'available' and (status != 'assigned' or window is None):
+            return f'is not available (current status: {crew.availability})'
+        if flight['flightNumber'] in self.timeline.flights(crew.key):
+            return f'is already assigned to {flight["flightNumber"]}'
+        if window is None:
+            return None
+        return self.timeline.conflict(
+            crew.key, *window, flight['origin'], flight.get('destination'),
+            self.location_graph.travel_time, self.MIN_REST_MINUTES, self.MAX_DUTY_MINUTES
+        )
+    
+    def _fit_schedule(self, flight, pool):
+        """
+        Drop crew whose duties clash with the flight
+        Returns (pool, positions): positions maps emp_id -> airport for crew
+        who will be away from base, coming off an earlier duty.
+        Complexity: O(log d) per crew member already on duty, O(1) for the rest
+        """
+        timeline = self.timeline
+        window = self.duty_window(flight)
+        if window is None or not (timeline.duties or timeline.untimed):
+            return pool, {}
+        start, end = window
+        origin, destination = flight['origin'], flight.get('destination')
+        travel_time = self.location_graph.travel_time
+        fitted = []
+        positions = {}
+        for crew, score in pool:
+            key = crew.key
+            if timeline.is_busy(key):
+                if timeline.conflict(key, start, end, origin, destination, travel_time,
+                                     self.MIN_REST_MINUTES, self.MAX_DUTY_MINUTES):
+                    continue
+                positions[key] = timeline.position(key, start, crew.base_location)
+            fitted.append((crew, score))
+        return fitted, positions
+    
+    def open_seats(self, flight):
+        """Seats still to fill: crewRequired minus the scheduled count and crew assigned since"""
+        assigned = flight.get('crewAssigned', 0) + self.aggregates.assigned_by_flight.get(flight['flightNumber'], 0)
+        return max(0, flight.get('crewRequired', 6) - assigned)
+    
+    def plan_assignments(self, flights, method='optimal'):
+        """
+        Fill every open seat across the given flights at once
+        method='optimal' maximizes the total score (min-cost bipartite matching),
+        method='greedy' takes the best remaining (crew, flight) pair each time.
+        A crew member gets at most one new flight per plan and must be certified,
+        free for its duty window and able to reach the origin. Pair score is the
+        composite score plus the positioning bonus (without the jitter).
+        Returns the plan as a dict; nothing is assigned.
+        """
+        if method not in SOLVERS:
+            raise ValueError(f'method must be one of {sorted(SOLVERS)}')
+        
+        seats = {}
+        pools = {}
+        for flight, pool in self._candidate_pools(flights):
+            number = flight['flightNumber']
+            seats[number] = self.open_seats(flight)
+            pool, positions = self._fit_schedule(flight, pool)
+            locations = self._locations(pool, positions)
+            bonus = self._bonus_by_location(flight['origin'], locations)
+            pools[number] = [(crew, score + bonus[location]) for (crew, score), location in zip(pool, locations)]
+        
+        matches = SOLVERS[method](pools, seats)
+        filled = defaultdict(int)
+        for number, _, _ in matches:
+            filled[number] += 1
+        
+        return {
+            'method': method,
+            'assignments': [
+                {'flightNumber': number, 'emp_id': crew.emp_id, 'name': crew.name,
+                 'baseLocation': crew.base_location, 'score': round(score, 2)}
+                for number, crew, score in matches
+            ],
+            'totalScore': round(sum(score for _, _, score in matches), 2),
+            'openSeats': sum(seats.values()),
+            'filledSeats': len(matches),
+            'unfilled': {n: seats[n] - filled[n] for n in seats if seats[n] > filled[n]},
+        }
+    
+    def positioning_bonus(self, deadhead_minutes):
+        """Score bonus for a crew member deadhead_minutes away from the flight origin"""
+        remaining = max(0.0, 1 - deadhead_minutes / self.DEADHEAD_HORIZON_MINUTES)
+        return self.POSITIONING_BONUS * remaining
+    
+    def _locations(self, pool, positions=None):
+        """Where each candidate starts from: their base, or where an earlier duty leaves them"""
+        if positions:
+            return [positions.get(crew.key, crew.base_location) for crew, _ in pool]
+        return [crew.base_location for crew, _ in pool]
+    
+    def _bonus_by_location(self, origin, locations):
+        """Positioning bonus for each distinct starting airport"""
+        return {
+            location: self.positioning_bonus(self.location_graph.travel_time(location, origin))
+            for location in set(locations)
+        }
+    
+    def _format_recommendations(self, top_recommendations, formatted=None):
+        """
+        API records for ranked (crew, score) pairs
+        formatted optionally memoizes the per-crew part across several flights
+        """
+        if formatted is None:
+            formatted = {}
         recommendations = []
         for idx, (crew, score) in enumerate(top_recommendations, 1):
-            key_strengths = [
-                self._format_parameter_name(k)
-                for k, v in crew.data.items() 
-                if k.endswith('Score') and v > 85
-            ]
+            base = formatted.get(crew.key)
+            if base is None:
+                # One row copy is a consistent snapshot while update_crew may be writing
+                parameters = self.parameter_table.values(crew.row)
+                key_strengths = [
+                    self._format_parameter_name(k)
+                    for k, v in parameters.items() 
+                    if v > 85
+                ]
+                base = formatted[crew.key] = {
+                    'emp_id': crew.emp_id,
+                    'name': crew.name,
+                    'designation': crew.designation,
+                    'baseLocation': crew.base_location,
+                    'parameters': parameters,
+                    'weights': self.WEIGHTS,
+                    'keyStrengths': key_strengths
+                }
             
-            rec = {
-                'rank': idx,
-                'emp_id': crew.emp_id,
-                'name': crew.name,
-                'designation': crew.designation,
-                'baseLocation': crew.base_location,
-                'compositeScore': round(score, 2),
-                'parameters': {k: crew.data.get(k, 0) for k in self.WEIGHTS.keys()},
-                'weights': self.WEIGHTS,
-                'keyStrengths': key_strengths
-            }
+            rec = {'rank': idx, **base, 'compositeScore': round(score, 2)}
             recommendations.append(rec)
-            print(f"   #{idx} {crew.name} ({crew.base_location}) - Score: {score:.2f}")
-        
-        print("\n" + "="*70)
-        print(f"✓ RECOMMENDATION COMPLETE - {len(recommendations)} UNIQUE candidates for {flight_data['flightNumber']}")
-        print("="*70 + "\n")
-        
         return recommendations
     
+    def jitter(self, flight_number, crews):
+        """
+        Deterministic pseudo-random values in [0, 1), one per crew member
+        A pure function of (seed, flight number, emp_id): the same flight ranks
+        the same way on every request and every worker, while different
+        flights still get different orderings among similar crew.
+        Complexity: O(n) vectorized (splitmix64 finalizer over the crew salts)
+        """
+        rows = np.fromiter((crew.row for crew in crews), dtype=np.intp, count=len(crews))
+        x = self.crew_salt[rows] ^ np.uint64(_stable_hash(f'{self.seed}:{flight_number}'))
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        x = x ^ (x >> np.uint64(31))
+        return ((x >> np.uint64(11)).astype(np.float64) * 2.0 ** -53).tolist()
+    
+    def _score_candidates(self, flight_data, pool, trace=False, positions=None):
+        """
+        Yield (crew, boosted_score) for every reachable crew member
+        boosted = composite score + positioning bonus (deadhead cost) + 0-5 jitter
+        positions overrides the starting airport of crew coming off an earlier duty
+        """
+        origin = flight_data['origin']
+        locations = self._locations(pool, positions)
+        bonus = self._bonus_by_location(origin, locations)
+        jitter = self.jitter(flight_data.get('flightNumber', ''), [crew for crew, _ in pool])
+        for (crew, base_score), location, j in zip(pool, locations, jitter):
+            boosted_score = base_score + bonus[location] + 5 * j
+            if trace:
+                logger.debug("   %s (%s → %s): %.2f → %.2f (+%.1f positioning bonus)",
+                             crew.name, location, origin, base_score, boosted_score, bonus[location])
+            yield crew, boosted_score
+    
+    def select_top_k(self, candidates, k):
+        """
+        Top K (crew, score) pairs from any iterable/generator of candidates
+        Complexity: O(n log k) time, O(k) memory
+        Same result as sorting by score (stable, highest first) and slicing [:k]
+        """
+        selector = TopKSelector(k)
+        selector.push_all(candidates)
+        return selector.results()
+    
+    def most_rested(self, count):
+        """
+        The count most rested available crew as (crew, fatigueScore), best first
+        Complexity: O(k log k) from the fatigue heap, independent of roster size
+        """
+        return self.fatigue_heap.peek_least_fatigued(count)
+    
     def demonstrate_heap_operation(self):
-        """Demonstrate min-heap fatigue extraction"""
-        print("\n" + "="*70)
-        print("DEMONSTRATING MIN-HEAP - Get Least Fatigued Crew")
-        print("="*70)
-        print(f"\nHeap size: {self.fatigue_heap.size()}")
-        print("Extracting top 3 least fatigued crew members:\n")
-        
-        for i in range(min(3, self.fatigue_heap.size())):
-            crew = self.fatigue_heap.get_least_fatigued()
-            if crew:
-                print(f"   Position {i+1}: {crew.name}")
-        
-        print("\n" + "="*70 + "\n")
+        """Demonstrate min-heap fatigue extraction (read-only: the live heap is not popped)"""
+        logger.info("\n" + "="*70)
+        logger.info("DEMONSTRATING MIN-HEAP - Get Least Fatigued Crew")
+        logger.info("="*70)
+        logger.info("\nHeap size: %d", self.fatigue_heap.size())
+        logger.info("Peeking at top 3 least fatigued available crew members:\n")
+        
+        for i, (crew, fatigue_score) in enumerate(self.most_rested(3), 1):
+            logger.info("   Position %d: %s (fatigue score %s)", i, crew.name, fatigue_score)
+        
+        logger.info("\n" + "="*70 + "\n")
+
+
+def _stable_hash(text):
+    """64-bit hash that, unlike hash(), is the same in every process"""
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'little')
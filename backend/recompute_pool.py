@@ -0,0 +1,140 @@
+"""
+Process-pool recommendation recompute
+
+Recomputes touching hundreds of flights (e.g. a disruption) are CPU-bound
+Python, so threads share one core. RecomputePool ranks chunks of flights in
+worker processes instead, each holding a replica engine.
+
+A replica is built once per engine snapshot (data_version). The score matrix
+is never pickled: the parent copies it into a shared memory block that every
+worker maps read-only, and the pickled remainder (descriptive crew fields,
+routes, schedule, weights) goes into a second block. Tasks carry only block
+names and a flight chunk; results are merged back in flight order.
+"""
+import gc
+import logging
+import multiprocessing
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from recommendation_engine import CrewRecommendationEngine
+
+logger = logging.getLogger(__name__)
+
+# Worker-side replica: (snapshot key, engine, attached blocks)
+_replica = None
+
+
+class RecomputePool:
+    """
+    Recommendation recompute fanned out over worker processes
+    Complexity: O(F × C / P) for F flights over C crew on P processes, plus
+    one O(C) replica build per worker after each data change
+    Use Case: Re-plan every open or disrupted flight on all cores at once
+
+    Workers are spawned, not forked: the app runs threads that may hold
+    locks at fork time. One recompute runs at a time, since each already
+    uses every worker, and a snapshot's blocks live until the next one.
+    """
+    def __init__(self, processes):
+        self.processes = processes
+        self._executor = None
+        self._version = None  # (engine id, data_version) of the published snapshot
+        self._snapshot = None  # Task argument naming the published blocks
+        self._blocks = []
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def recompute(self, engine, flights, top_k=5, exclude_bases=()):
+        """
+        Same result as engine.recompute_recommendations, ranked in the pool
+        Returns {flightNumber: recommendations}, in flight order
+        """
+        with self._lock:
+            if len(flights) < 2 or self.processes <= 1:
+                return engine.recompute_recommendations(flights, top_k=top_k, exclude_bases=exclude_bases)
+            self._publish(engine)
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes, mp_context=multiprocessing.get_context('spawn')
+                )
+            chunks = engine.split_flights(flights, self.processes)
+            futures = [
+                self._executor.submit(_rank_chunk, self._snapshot, chunk, top_k, tuple(exclude_bases))
+                for chunk in chunks
+            ]
+            results = {}
+            for future in futures:
+                results.update(future.result())
+        logger.debug("   [RECOMPUTE POOL] %d flights in %d chunks on %d processes",
+                     len(flights), len(chunks), self.processes)
+        return {f['flightNumber']: results[f['flightNumber']] for f in flights}
+
+    def _publish(self, engine):
+        """Copy the engine's current snapshot into fresh shared memory blocks"""
+        data_version, config, matrix = engine.snapshot()
+        version = (id(engine), data_version)
+        if version == self._version:
+            return
+        self._release()
+        state = pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL)
+        matrix_block = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+        state_block = shared_memory.SharedMemory(create=True, size=len(state))
+        np.ndarray(matrix.shape, dtype=np.float64, buffer=matrix_block.buf)[:] = matrix
+        state_block.buf[:len(state)] = state
+        self._blocks = [matrix_block, state_block]
+        self._generation += 1
+        self._version = version
+        self._snapshot = (self._generation, matrix_block.name, matrix.shape, state_block.name, len(state))
+        logger.debug("   [RECOMPUTE POOL] published snapshot %d: %d bytes of scores, %d of state",
+                     self._generation, matrix.nbytes, len(state))
+
+    def _release(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+        self._version = self._snapshot = None
+
+    def close(self):
+        """Stop the workers and free the shared memory"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            self._release()
+
+
+def _attach(snapshot):
+    """Build (or reuse) this worker's replica engine for a snapshot"""
+    global _replica
+    if _replica is not None and _replica[0] == snapshot[0]:
+        return _replica[1]
+    if _replica is not None:
+        blocks = _replica[2]
+        _replica = None  # The old engine holds views of its blocks; drop it before unmapping
+        gc.collect()
+        for block in blocks:
+            block.close()
+
+    generation, matrix_name, shape, state_name, state_size = snapshot
+    matrix_block = shared_memory.SharedMemory(name=matrix_name)
+    state_block = shared_memory.SharedMemory(name=state_name)
+    config = pickle.loads(state_block.buf[:state_size])
+    matrix = np.ndarray(shape, dtype=np.float64, buffer=matrix_block.buf)
+    matrix.flags.writeable = False  # Shared by every worker: replicas only read it
+
+    weights = config.pop('weights')
+    engine = CrewRecommendationEngine(**config, score_matrix=matrix)
+    if weights != CrewRecommendationEngine.WEIGHTS:
+        engine.set_weights(weights)
+    _replica = (generation, engine, (matrix_block, state_block))
+    return engine
+
+
+def _rank_chunk(snapshot, flights, top_k, exclude_bases):
+    return _attach(snapshot).recompute_recommendations(flights, top_k=top_k, exclude_bases=exclude_bases)
@@ -0,0 +1,146 @@
+"""
+Pre-serialized JSON response cache with ETag / conditional GET
+
+Read endpoints are wrapped with ResponseCache.cached(version_fn). The first
+request for a URL at a given data version runs the view and keeps the encoded
+bytes (and compressed variants, built on first use); later requests at the
+same version are served from those bytes, or answered 304 when the client's
+If-None-Match matches. An entry is rebuilt only when version_fn() changes,
+i.e. after an assignment or a data reload.
+"""
+import functools
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import make_response, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+MIN_COMPRESS_BYTES = 1024  # Smaller bodies are not worth compressing
+
+ENCODERS = {'gzip': lambda body: gzip.compress(body, compresslevel=6, mtime=0)}
+if brotli is not None:
+    ENCODERS['br'] = lambda body: brotli.compress(body, quality=5)
+
+
+class CachedResponse:
+    """Encoded body of one endpoint + query at one data version"""
+    __slots__ = ('version', 'body', 'mimetype', 'etag', 'variants')
+
+    def __init__(self, version, body, mimetype):
+        self.version = version
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.variants = {}  # encoding -> compressed body
+
+    def encoded(self, encoding):
+        """Compressed body for encoding, built once; None if it would not help"""
+        if encoding not in self.variants:
+            compressed = ENCODERS[encoding](self.body)
+            self.variants[encoding] = compressed if len(compressed) < len(self.body) else None
+        return self.variants[encoding]
+
+
+class ResponseCache:
+    """
+    LRU cache of serialized responses keyed by request path + query
+    Complexity: O(1) lookup; a hit costs no view call and no JSON encoding
+    Use Case: Repeated dashboard polls of unchanged data
+    """
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # full path -> CachedResponse
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+    def cached(self, version_fn):
+        """Decorator for GET views whose output depends only on the URL and version_fn()"""
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                key = request.full_path
+                # Read the version before building, so data changing mid-build
+                # leaves an entry that is already stale rather than wrong
+                version = version_fn()
+
+                with self._lock:
+                    entry = self.entries.get(key)
+                    if entry is not None and entry.version == version:
+                        self.entries.move_to_end(key)
+                        self.hits += 1
+                    else:
+                        entry = None
+                        self.misses += 1
+
+                if entry is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response  # Errors are never cached
+                    entry = CachedResponse(version, response.get_data(), response.mimetype)
+                    with self._lock:
+                        self.entries[key] = entry
+                        self.entries.move_to_end(key)
+                        while len(self.entries) > self.max_entries:
+                            self.entries.popitem(last=False)
+
+                return self._respond(entry)
+            return wrapper
+        return decorator
+
+    def _respond(self, entry):
+        encoding = None
+        body = entry.body
+        if len(body) >= MIN_COMPRESS_BYTES:
+            for candidate in ENCODERS:
+                if request.accept_encodings[candidate] and entry.encoded(candidate) is not None:
+                    if encoding is None or request.accept_encodings[candidate] > request.accept_encodings[encoding]:
+                        encoding = candidate
+
+        # Each encoding is a distinct representation, so it gets its own ETag
+        etag = entry.etag + ('-' + encoding if encoding else '')
+        if _etag_matches(request.headers.get('If-None-Match'), entry.etag):
+            with self._lock:
+                self.not_modified += 1
+            response = make_response('', 304)
+        else:
+            response = make_response(entry.encoded(encoding) if encoding else body)
+            response.mimetype = entry.mimetype
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+
+        response.headers['ETag'] = f'"{etag}"'
+        response.headers['Cache-Control'] = 'no-cache'  # Always revalidate; 304s are cheap
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'notModified': self.not_modified,
+            }
+
+
+def _etag_matches(if_none_match, etag):
+    """True if any tag in an If-None-Match header names this entry, in any encoding"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag.strip('"').split('-')[0] == etag:
+            return True
+    return False
@@ -0,0 +1,94 @@
+"""
+Schedule-wide crew-to-seat assignment
+
+Both solvers take
+    pools: {flight_number: [(crew, score), ...]}  eligible crew per flight
+    seats: {flight_number: open seats}
+and return [(flight_number, crew, score), ...] with every crew member used at
+most once and no flight over its open seats.
+"""
+import heapq
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+
+def solve_optimal(pools, seats):
+    """
+    Maximum total score matching (rectangular Hungarian / LAPJV via SciPy)
+    Complexity: O(S² × C) for S open seats and C candidate crew
+
+    Every open seat is a column and every candidate crew member a row; the
+    cost of a pair is -score, or 0 if the crew member is not eligible for that
+    flight. Zero-cost matches are dropped afterwards, which leaves those seats
+    open, so the result is the best partial assignment, not a forced one.
+    """
+    total_seats = sum(seats.values())
+    if not total_seats:
+        return []
+
+    # A crew member outside a flight's top `total_seats` candidates is never
+    # needed there: at most total_seats - 1 of those are busy elsewhere, so a
+    # better one is always free. Pruning keeps the matrix small and exact.
+    pools = {
+        number: heapq.nlargest(total_seats, pool, key=lambda pair: pair[1])
+        for number, pool in pools.items() if seats.get(number)
+    }
+
+    rows = {}  # emp key -> row
+    crews = []
+    for pool in pools.values():
+        for crew, _ in pool:
+            if crew.key not in rows:
+                rows[crew.key] = len(crews)
+                crews.append(crew)
+    if not crews:
+        return []
+
+    columns = []  # column -> flight number (one column per open seat)
+    cost = np.zeros((len(crews), total_seats), dtype=np.float64)
+    for number, pool in pools.items():
+        start = len(columns)
+        columns.extend([number] * seats[number])
+        if pool:
+            pool_rows = np.fromiter((rows[crew.key] for crew, _ in pool), dtype=np.intp, count=len(pool))
+            pool_scores = np.fromiter((score for _, score in pool), dtype=np.float64, count=len(pool))
+            cost[pool_rows, start:len(columns)] = -pool_scores[:, None]
+
+    matched_rows, matched_cols = linear_sum_assignment(cost)
+    return [
+        (columns[col], crews[row], -cost[row, col])
+        for row, col in zip(matched_rows.tolist(), matched_cols.tolist())
+        if cost[row, col] < 0
+    ]
+
+
+def solve_greedy(pools, seats):
+    """
+    Best remaining (crew, flight) pair first
+    Complexity: O(E log E) for E eligible pairs
+    Baseline for solve_optimal: fast, but an early pick can block a better
+    overall plan (a versatile crew member taken by the flight that needed them least).
+    """
+    pairs = [
+        (score, number, crew)
+        for number, pool in pools.items() if seats.get(number)
+        for crew, score in pool
+    ]
+    pairs.sort(key=lambda pair: pair[0], reverse=True)
+
+    remaining = dict(seats)
+    used = set()
+    matches = []
+    for score, number, crew in pairs:
+        if remaining[number] and crew.key not in used:
+            remaining[number] -= 1
+            used.add(crew.key)
+            matches.append((number, crew, score))
+    return matches
+
+
+SOLVERS = {
+    'optimal': solve_optimal,
+    'greedy': solve_greedy,
+}
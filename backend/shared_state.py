@@ -0,0 +1,243 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from crew_journal import CLAIM_FIELDS, _fsync_dir, claim_matches
+from data_structures import normalize_emp_id
+
+logger = logging.getLogger(__name__)
+
+
+class SharedCrewState:
+    """
+    SQLite-backed crew change log shared by every gunicorn worker
+    Complexity: O(log n) per claim/poll (indexed), O(n) compaction
+    Use Case: Keep per-worker engines in sync and prevent double-booking
+
+    Same interface as CrewJournal. Every mutation is a row in crew_changes;
+    workers poll for rows newer than the last one they applied. Assignments
+    go through claim(), a compare-and-set on availability (or on the duty
+    list, assignedFlights) inside one BEGIN IMMEDIATE transaction, so two
+    workers can never both win the same crew member or the same duty slot.
+
+    Compaction keeps the rows of the previous snapshot generation, so a worker
+    that read crew_data.json just before it was replaced can still replay
+    everything it is missing (rows are absolute values, replay is idempotent).
+    Once all of a crew member's rows are pruned, their claim values are
+    dropped too, and the snapshot alone holds their state.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS crew_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            emp_id TEXT NOT NULL,
+            changes TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS crew_availability (
+            emp_id TEXT PRIMARY KEY,
+            availability TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS crew_fields (
+            emp_id TEXT NOT NULL,
+            field TEXT NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (emp_id, field)
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, snapshot_path, db_path=None, compact_every=1000):
+        self.snapshot_path = snapshot_path
+        self.db_path = db_path or os.path.splitext(snapshot_path)[0] + '.sqlite3'
+        self.compact_every = compact_every
+        self.last_seq = 0  # Highest change this process has applied
+        self._local = threading.local()
+        self._poll_lock = threading.Lock()
+        self._connect().executescript(self.SCHEMA)
+
+    def _connect(self):
+        """One connection per thread (sqlite3 connections are not thread-safe)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=FULL')
+            self._local.conn = conn
+        return conn
+
+    def _meta(self, conn, key):
+        row = conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _set_meta(self, conn, key, value):
+        conn.execute(
+            'INSERT INTO meta (key, value) VALUES (?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+            (key, value)
+        )
+
+    def _changes_after(self, conn, seq):
+        rows = conn.execute(
+            'SELECT seq, emp_id, changes FROM crew_changes WHERE seq > ? ORDER BY seq', (seq,)
+        )
+        return [(s, emp_id, json.loads(changes)) for s, emp_id, changes in rows]
+
+    def replay(self, crew_data):
+        """Apply every retained change on top of a freshly loaded snapshot, in order"""
+        conn = self._connect()
+        crew_by_id = {normalize_emp_id(c['emp_id']): c for c in crew_data}
+        self.last_seq = self._meta(conn, 'pruned_seq')
+        changes = self._changes_after(conn, self.last_seq)
+        for seq, emp_id, fields in changes:
+            crew = crew_by_id.get(emp_id)
+            if crew is not None:
+                crew.update(fields)
+            self.last_seq = seq
+        logger.info("Replayed %d shared crew changes", len(changes))
+        return len(changes)
+
+    def _insert(self, conn, emp_id, changes):
+        cursor = conn.execute(
+            'INSERT INTO crew_changes (emp_id, changes) VALUES (?, ?)',
+            (emp_id, json.dumps(changes, separators=(',', ':')))
+        )
+        if 'availability' in changes:
+            conn.execute(
+                'INSERT INTO crew_availability (emp_id, availability) VALUES (?, ?) '
+                'ON CONFLICT(emp_id) DO UPDATE SET availability = excluded.availability',
+                (emp_id, changes['availability'])
+            )
+        for field in CLAIM_FIELDS[1:]:
+            if field in changes:
+                conn.execute(
+                    'INSERT INTO crew_fields (emp_id, field, value) VALUES (?, ?, ?) '
+                    'ON CONFLICT(emp_id, field) DO UPDATE SET value = excluded.value',
+                    (emp_id, field, json.dumps(changes[field]))
+                )
+        return cursor.lastrowid
+
+    def _committed(self, seq):
+        """
+        Count this process's own change as applied if nothing came before it
+        The caller applies its own changes, so poll need not return them again;
+        changes from other workers in between still arrive through poll.
+        """
+        with self._poll_lock:
+            if seq == self.last_seq + 1:
+                self.last_seq = seq
+    
+    def append(self, emp_id, changes):
+        """Durably record one crew change without a precondition"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            seq = self._insert(conn, normalize_emp_id(emp_id), changes)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        self._committed(seq)
+
+    def claim(self, emp_id, changes, expected='available', current=None, field='availability'):
+        """
+        Compare-and-set on one CLAIM_FIELDS field across all workers
+        Records changes only if the crew member's field (availability:
+        case-insensitive) is still `expected`. `current` is the caller's
+        in-memory value, used when the field has not changed since the
+        snapshot generations the log still holds.
+        Returns (success, value seen at decision time)
+        """
+        key = normalize_emp_id(emp_id)
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if field == 'availability':
+                row = conn.execute(
+                    'SELECT availability FROM crew_availability WHERE emp_id = ?', (key,)
+                ).fetchone()
+                seen = row[0] if row else current
+            else:
+                row = conn.execute(
+                    'SELECT value FROM crew_fields WHERE emp_id = ? AND field = ?', (key, field)
+                ).fetchone()
+                seen = json.loads(row[0]) if row else current
+            if row is None and self._meta(conn, 'pruned_seq') > self.last_seq:
+                # `current` may predate changes compacted away since our last poll
+                conn.execute('ROLLBACK')
+                return False, seen
+            if not claim_matches(field, seen, expected):
+                conn.execute('ROLLBACK')
+                return False, seen
+            seq = self._insert(conn, key, changes)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        self._committed(seq)
+        return True, seen
+
+    def poll(self):
+        """Changes committed by any worker since this process last polled"""
+        with self._poll_lock:
+            conn = self._connect()
+            if self._meta(conn, 'pruned_seq') > self.last_seq:
+                raise StaleStateError(
+                    'Shared crew log was compacted past this worker; reload the snapshot'
+                )
+            changes = self._changes_after(conn, self.last_seq)
+            if changes:
+                self.last_seq = changes[-1][0]
+            return changes
+
+    def needs_compaction(self):
+        return self.last_seq - self._meta(self._connect(), 'snapshot_seq') >= self.compact_every
+
+    def compact(self, crew_data):
+        """
+        Write crew_data as the new snapshot and prune the previous generation
+        crew_data must reflect every change up to self.last_seq; other writers
+        are blocked for the duration so nothing can slip in between.
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'crew_changes'").fetchone()
+            latest = row[0] if row else 0
+            if latest != self.last_seq:
+                # Another worker wrote after our last poll; let a later call compact
+                conn.execute('ROLLBACK')
+                return False
+
+            tmp_path = self.snapshot_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(crew_data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            _fsync_dir(os.path.dirname(os.path.abspath(self.snapshot_path)))
+
+            previous = self._meta(conn, 'snapshot_seq')
+            conn.execute('DELETE FROM crew_changes WHERE seq <= ?', (previous,))
+            # Claim values whose last change was just pruned live on in the
+            # snapshot alone; dropping them lets an edited snapshot (e.g.
+            # fix_all_availability.py) take effect on the next start
+            for table in ('crew_availability', 'crew_fields'):
+                conn.execute(
+                    f'DELETE FROM {table} WHERE emp_id NOT IN (SELECT emp_id FROM crew_changes)'
+                )
+            self._set_meta(conn, 'pruned_seq', previous)
+            self._set_meta(conn, 'snapshot_seq', latest)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        logger.info("Compacted shared crew log up to change %d into %s", latest, self.snapshot_path)
+        return True
+
+
+class StaleStateError(RuntimeError):
+    """Raised when a worker's in-memory roster is older than the compacted snapshot"""
@@ -0,0 +1,166 @@
+import json
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from benchmark import build_engine, load_app, make_synthetic_crew
+from crew_journal import CrewJournal
+from data_structures import FlightAggregates, FlightRouteIndex, assigned_flights
+
+
+def make_flights():
+    """AI-202 (duty 05:30-09:10) and AI-445 (duty 08:15-10:55) overlap"""
+    return [
+        {'flightNumber': 'AI-202', 'route': 'DEL → BOM', 'origin': 'DEL', 'destination': 'BOM',
+         'aircraft': 'Boeing 737', 'departure': '06:30', 'blockMinutes': 130,
+         'status': 'Crew Needed', 'priority': 'High', 'crewRequired': 6, 'crewAssigned': 0},
+        {'flightNumber': 'AI-445', 'route': 'BOM → DEL', 'origin': 'BOM', 'destination': 'DEL',
+         'aircraft': 'Boeing 737', 'departure': '09:15', 'blockMinutes': 70,
+         'status': 'Crew Needed', 'priority': 'Medium', 'crewRequired': 6, 'crewAssigned': 0},
+    ]
+
+
+@pytest.fixture
+def crewsync(tmp_path, monkeypatch):
+    """The Flask app serving a small synthetic roster, journaling under tmp_path"""
+    crewsync_app = load_app()
+    crew_data = [dict(c, availability='Available') for c in make_synthetic_crew(20)]
+    flights = make_flights()
+    snapshot = tmp_path / 'crew_data.json'
+    snapshot.write_text(json.dumps(crew_data))
+
+    engine = build_engine(crew_data, flights)
+    monkeypatch.setattr(crewsync_app, 'CREW_STATE', CrewJournal(str(snapshot)))
+    monkeypatch.setattr(crewsync_app, 'FLIGHT_DATA', flights)
+    monkeypatch.setattr(crewsync_app, 'FLIGHT_INDEX', {f['flightNumber']: f for f in flights})
+    monkeypatch.setattr(crewsync_app, 'FLIGHT_ROUTES', FlightRouteIndex(flights))
+    monkeypatch.setattr(crewsync_app, 'recommendation_engine', engine)
+    monkeypatch.setattr(crewsync_app, 'FLIGHT_STATS', FlightAggregates(flights, engine.aggregates.assigned_by_flight))
+    monkeypatch.setattr(crewsync_app, '_data_generation', crewsync_app._data_generation + 1)
+    return crewsync_app
+
+
+def scan_dashboard_stats(crewsync_app):
+    """What /api/dashboard/stats reports, recomputed from the roster in full"""
+    records = crewsync_app.recommendation_engine.export_crew()
+    assigned = Counter(number for c in records for number in assigned_flights(c))
+    needs = sum(
+        1 for f in crewsync_app.FLIGHT_DATA
+        if f.get('crewAssigned', 0) + assigned[f['flightNumber']] < f.get('crewRequired', 6)
+    )
+    available = sum(1 for c in records if c['availability'].lower() == 'available')
+    average = round(sum(c['performanceScore'] for c in records) / len(records) / 20, 1)
+    return {'totalFlights': len(crewsync_app.FLIGHT_DATA), 'availableCrew': available,
+            'needsAssignment': needs, 'avgPerformance': average}
+
+
+def assign(crewsync_app, emp_id, flight_number):
+    client = crewsync_app.app.test_client()
+    return client.post(f'/api/crew/{emp_id}/assign', json={'flight_number': flight_number})
+
+
+def test_assign_rejects_overlapping_duty(crewsync):
+    assert assign(crewsync, 1000, 'AI-202').status_code == 200
+    response = assign(crewsync, 1000, 'AI-445')
+    assert response.status_code == 400
+    assert 'overlaps flight AI-202' in response.get_json()['error']
+
+
+def test_concurrent_assigns_never_double_book(crewsync, monkeypatch):
+    engine = crewsync.recommendation_engine
+    schedule_conflict = engine.schedule_conflict
+
+    def slow_schedule_conflict(crew, flight):
+        # Widen the gap between the schedule check and the claim
+        conflict = schedule_conflict(crew, flight)
+        time.sleep(0.01)
+        return conflict
+
+    monkeypatch.setattr(engine, 'schedule_conflict', slow_schedule_conflict)
+
+    emp_ids = range(1000, 1010)
+    results = {}
+
+    def book(emp_id, flight_number):
+        results[emp_id, flight_number] = assign(crewsync, emp_id, flight_number).status_code
+
+    threads = [
+        threading.Thread(target=book, args=(emp_id, flight_number))
+        for emp_id in emp_ids for flight_number in ('AI-202', 'AI-445')
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for emp_id in emp_ids:
+        codes = sorted((results[emp_id, 'AI-202'], results[emp_id, 'AI-445']))
+        assert codes == [200, 400]
+        assert len(engine.timeline.flights(str(emp_id))) == 1
+
+
+def test_dashboard_stats_track_crew_changes(crewsync):
+    client = crewsync.app.test_client()
+    for emp_id in range(1000, 1006):
+        crewsync.apply_crew_change(emp_id, {
+            'availability': 'Assigned', 'assignedFlights': ['AI-202'], 'performanceScore': 77
+        })
+    crewsync.apply_crew_change(1005, {'availability': 'Available', 'assignedFlights': []})
+    crewsync.apply_crew_change(1006, {'availability': 'Assigned', 'assignedFlights': ['AI-202', 'AI-445']})
+
+    stats = client.get('/api/dashboard/stats').get_json()
+    assert stats == scan_dashboard_stats(crewsync)
+    assert stats['needsAssignment'] == 1  # AI-202 has its 6 crew, AI-445 has 1
+
+
+def test_concurrent_crew_changes_keep_flight_counts(crewsync, monkeypatch):
+    flight_stats = crewsync.FLIGHT_STATS
+    update_flight = flight_stats.update_flight
+    first = threading.Event()
+
+    def slow_update_flight(flight, assigned):
+        # The first writer stalls after reading its count, so later ones overtake it
+        if not first.is_set():
+            first.set()
+            time.sleep(0.05)
+        update_flight(flight, assigned)
+
+    monkeypatch.setattr(flight_stats, 'update_flight', slow_update_flight)
+    threads = [
+        threading.Thread(target=crewsync.apply_crew_change,
+                         args=(emp_id, {'availability': 'Assigned', 'assignedFlights': ['AI-202']}))
+        for emp_id in range(1000, 1006)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert flight_stats.assigned == {'AI-202': 6}
+    assert not flight_stats.needs_crew(crewsync.get_flight('AI-202'))
+    assert flight_stats.needs_assignment == 1
+
+
+def test_disruption_rejects_non_string_airport(crewsync):
+    client = crewsync.app.test_client()
+    for airport in (['BOM'], {'code': 'BOM'}, 7):
+        response = client.post('/api/disruptions/impact', json={'airport': airport})
+        assert response.status_code == 400
+        assert 'airport' in response.get_json()['error']
+
+    response = client.post('/api/disruptions/impact', json={'airport': 'BOM'})
+    assert response.status_code == 200
+    assert response.get_json()['affectedFlights'] == ['AI-202', 'AI-445']
+
+
+def test_flight_filters_match_a_full_scan(crewsync):
+    client = crewsync.app.test_client()
+    for args in ({'origin': 'DEL'}, {'destination': 'DEL'}, {'origin': 'BOM', 'destination': 'DEL'},
+                 {'origin': 'DEL', 'priority': 'Medium'}, {'origin': 'GOI'}, {'priority': 'High'}):
+        page = client.get('/api/flights', query_string=args).get_json()
+        expected = [f['flightNumber'] for f in crewsync.FLIGHT_DATA
+                    if all(f[field] == value for field, value in args.items())]
+        assert [f['flightNumber'] for f in page['items']] == expected
+        assert page['total'] == len(expected)
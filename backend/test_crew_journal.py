@@ -0,0 +1,100 @@
+import json
+import os
+
+import pytest
+
+from crew_journal import CrewJournal
+
+CREW = [
+    {'emp_id': 101, 'name': 'A', 'availability': 'Available'},
+    {'emp_id': 102, 'name': 'B', 'availability': 'Available'},
+    {'emp_id': '103', 'name': 'C', 'availability': 'Backup'},
+]
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    path = tmp_path / 'crew_data.json'
+    path.write_text(json.dumps(CREW))
+    return str(path)
+
+
+def load(snapshot):
+    with open(snapshot) as f:
+        return json.load(f)
+
+
+def test_replay_applies_records_in_order(snapshot):
+    journal = CrewJournal(snapshot)
+    journal.append(101, {'availability': 'Assigned', 'assignedFlight': 'AI-202'})
+    journal.append(101, {'assignedFlight': 'AI-445'})
+    journal.append(103, {'availability': 'Available'})  # Normalized ID matches the string '103'
+
+    crew = load(snapshot)
+    assert CrewJournal(snapshot).replay(crew) == 3
+    assert crew[0] == {**CREW[0], 'availability': 'Assigned', 'assignedFlight': 'AI-445'}
+    assert crew[1] == CREW[1]
+    assert crew[2]['availability'] == 'Available'
+
+
+def test_replay_drops_torn_tail(snapshot):
+    journal = CrewJournal(snapshot)
+    journal.append(101, {'availability': 'Assigned'})
+    with open(journal.journal_path, 'a') as f:
+        f.write('{"emp_id": 102, "chan')  # Crash mid-append
+
+    crew = load(snapshot)
+    replayed = CrewJournal(snapshot)
+    assert replayed.replay(crew) == 1
+    assert crew[0]['availability'] == 'Assigned'
+    assert crew[1]['availability'] == 'Available'
+
+    # The tail is truncated, so later appends start on a clean line
+    replayed.append(102, {'availability': 'Assigned'})
+    crew = load(snapshot)
+    assert CrewJournal(snapshot).replay(crew) == 2
+    assert crew[1]['availability'] == 'Assigned'
+
+
+def test_replay_stops_at_corrupt_record(snapshot):
+    journal = CrewJournal(snapshot)
+    journal.append(101, {'availability': 'Assigned'})
+    with open(journal.journal_path, 'a') as f:
+        f.write('not json\n')
+
+    assert CrewJournal(snapshot).replay(load(snapshot)) == 1
+    assert os.path.getsize(journal.journal_path) == len(
+        json.dumps({'emp_id': 101, 'changes': {'availability': 'Assigned'}}, separators=(',', ':'))
+    ) + 1
+
+
+def test_compact_folds_journal_into_snapshot(snapshot):
+    journal = CrewJournal(snapshot, compact_every=2)
+    journal.append(101, {'availability': 'Assigned'})
+    journal.append(102, {'availability': 'Assigned'})
+    assert journal.needs_compaction()
+
+    crew = load(snapshot)
+    CrewJournal(snapshot).replay(crew)
+    journal.compact(crew)
+
+    assert not journal.needs_compaction()
+    assert [c['availability'] for c in load(snapshot)] == ['Assigned', 'Assigned', 'Backup']
+    assert CrewJournal(snapshot).replay(load(snapshot)) == 0
+
+
+def test_claim_is_compare_and_set(snapshot):
+    journal = CrewJournal(snapshot)
+    assert journal.claim(101, {'availability': 'Assigned'}, current='Available') == (True, 'Available')
+    assert journal.claim(101, {'availability': 'Assigned'}, current='Available') == (False, 'Assigned')
+
+    # Later duties claim on the duty list
+    changes = {'assignedFlights': ['AI-202', 'AI-445']}
+    assert journal.claim(101, changes, expected=None, current=None, field='assignedFlights') == (True, None)
+    stale = journal.claim(101, {'assignedFlights': ['AI-202']}, expected=None, current=None, field='assignedFlights')
+    assert stale == (False, ['AI-202', 'AI-445'])
+
+    # A fresh journal learns the claimed values from replay
+    replayed = CrewJournal(snapshot)
+    replayed.replay(load(snapshot))
+    assert replayed.claim(101, {'availability': 'Assigned'}, current='Available') == (False, 'Assigned')
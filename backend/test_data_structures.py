@@ -0,0 +1,111 @@
+from data_structures import BackupCrewQueue, CrewMember, CrewTimeline
+
+MIN_REST = 60
+MAX_DUTY = 600
+
+
+def travel_time(origin, destination):
+    """Deadhead minutes: 90 between any two known airports, GOI unreachable"""
+    return None if 'GOI' in (origin, destination) else 90
+
+
+def conflict(timeline, start, end, origin='DEL', destination='BOM'):
+    return timeline.conflict('101', start, end, origin, destination, travel_time, MIN_REST, MAX_DUTY)
+
+
+def timeline_with(*duties, timed=True):
+    timeline = CrewTimeline()
+    timeline.set_duties('101', list(duties), timed)
+    return timeline
+
+
+def test_free_crew_fit_any_duty():
+    assert conflict(CrewTimeline(), 330, 550) is None
+
+
+def test_overlapping_duties_conflict():
+    timeline = timeline_with((330, 550, 'DEL', 'BOM', 'AI-202'))
+    assert conflict(timeline, 495, 655, 'BOM', 'DEL') == 'overlaps flight AI-202'
+    assert conflict(timeline, 200, 340, 'BLR', 'DEL') == 'overlaps flight AI-202'
+
+
+def test_gap_must_cover_rest_and_deadhead():
+    timeline = timeline_with((330, 550, 'DEL', 'BOM', 'AI-202'))
+    # Same airport: the minimum rest is enough
+    assert conflict(timeline, 610, 700, 'BOM', 'DEL') is None
+    assert conflict(timeline, 600, 700, 'BOM', 'DEL') == \
+        'needs 60 minutes between duties around flight AI-202, has 50'
+
+    # From BOM to a BLR departure: rest plus a 90-minute deadhead
+    assert conflict(timeline, 700, 800, 'BLR', 'DEL') is None
+    assert conflict(timeline, 690, 800, 'BLR', 'DEL') == \
+        'needs 150 minutes between duties around flight AI-202, has 140'
+
+    # Before the duty: the new flight must end in time to reach DEL
+    assert conflict(timeline, 100, 180, 'HYD', 'BLR') is None
+    assert conflict(timeline, 100, 200, 'HYD', 'BLR') == \
+        'needs 150 minutes between duties around flight AI-202, has 130'
+
+
+def test_unreachable_origin_conflicts():
+    timeline = timeline_with((330, 550, 'DEL', 'BOM', 'AI-202'))
+    assert conflict(timeline, 900, 1000, 'GOI', 'DEL') == 'cannot get from BOM to GOI around flight AI-202'
+
+
+def test_duty_limit_counts_every_duty():
+    timeline = timeline_with((0, 300, 'DEL', 'BOM', 'AI-100'), (400, 600, 'BOM', 'DEL', 'AI-101'))
+    assert conflict(timeline, 700, 810) == 'would exceed the 600-minute duty limit'
+    assert conflict(timeline, 700, 800) is None  # Exactly 600 minutes in total
+
+
+def test_untimed_duties_never_fit():
+    timeline = timeline_with(timed=False)
+    assert timeline.is_busy('101')
+    assert conflict(timeline, 330, 550) == 'has duties with no scheduled time'
+
+    timeline.set_duties('101', [])
+    assert not timeline.is_busy('101')
+    assert conflict(timeline, 330, 550) is None
+
+
+def backup_crew():
+    """(emp_id, base, fatigueScore) in arrival order"""
+    return [CrewMember({'emp_id': emp_id, 'name': f'Crew {emp_id}', 'designation': 'Pilot',
+                        'availability': 'Backup', 'baseLocation': base, 'fatigueScore': fatigue})
+            for emp_id, base, fatigue in [(1, 'DEL', 60), (2, 'BOM', 95), (3, 'DEL', 90),
+                                          (4, 'DEL', 90), (5, 'BOM', 70), (6, 'DEL', 75)]]
+
+
+def callout_order(queue, base=None):
+    return [crew.emp_id for crew in iter(lambda: queue.dequeue(base=base), None)]
+
+
+def test_backup_queue_fifo_prefers_crew_at_base():
+    queue = BackupCrewQueue()
+    for crew in backup_crew():
+        queue.enqueue(crew)
+    assert callout_order(queue, base='DEL') == [1, 3, 4, 6, 2, 5]
+
+
+def test_backup_queue_priority_applies_to_base_callouts():
+    queue = BackupCrewQueue('fatigue')
+    crews = backup_crew()
+    for crew in crews:
+        queue.enqueue(crew)
+    assert queue.peek() is crews[1]  # Most rested overall
+    # DEL crew most rested first (FIFO among equals), then everyone else by priority
+    assert callout_order(queue, base='DEL') == [3, 4, 6, 1, 2, 5]
+
+
+def test_backup_queue_skips_removed_and_refiles_changed_crew():
+    queue = BackupCrewQueue('fatigue')
+    crews = backup_crew()
+    for crew in crews:
+        queue.enqueue(crew)
+    queue.remove(crews[2])
+    crews[5].update({'fatigueScore': 100})
+    queue.refresh(crews[5])
+    crews[3].update({'baseLocation': 'BOM'})
+    queue.refresh(crews[3])
+    assert queue.size() == 5
+    assert callout_order(queue, base='DEL') == [6, 1, 2, 4, 5]
@@ -0,0 +1,85 @@
+import base64
+import json
+
+import pytest
+
+from listing import NUMBER, TEXT, paginate, parse_list_query
+
+SORTABLE = {'emp_id': NUMBER, 'name': TEXT, 'fatigueScore': NUMBER}
+
+CREW = [
+    {'emp_id': 1, 'name': 'Asha', 'fatigueScore': 80},
+    {'emp_id': 2, 'name': 'Ravi'},  # No fatigueScore
+    {'emp_id': 3, 'name': 'Meera', 'fatigueScore': 80},
+    {'emp_id': 4, 'name': 'Dev', 'fatigueScore': 55},
+    {'emp_id': 5, 'name': 'Kiran'},
+]
+
+
+def cursor(sort_value, primary_key):
+    return base64.urlsafe_b64encode(json.dumps([sort_value, primary_key]).encode()).decode()
+
+
+def query(**args):
+    return parse_list_query(args, SORTABLE, default_sort='emp_id', id_field='emp_id')
+
+
+def pages(sort, limit=2):
+    """Every page of CREW in order, following nextCursor"""
+    ids, next_cursor = [], None
+    while True:
+        args = {'sort': sort, 'limit': limit}
+        if next_cursor:
+            args['cursor'] = next_cursor
+        page = paginate(CREW, 'emp_id', **query(**args))
+        ids.append([c['emp_id'] for c in page['items']])
+        next_cursor = page['nextCursor']
+        if next_cursor is None:
+            return ids
+
+
+def test_pages_cover_every_record_once():
+    assert pages('emp_id') == [[1, 2], [3, 4], [5]]
+    assert pages('-name') == [[2, 3], [5, 4], [1]]
+
+
+def test_missing_values_sort_last_ascending_and_first_descending():
+    assert pages('fatigueScore') == [[4, 1], [3, 2], [5]]
+    assert pages('-fatigueScore') == [[5, 2], [3, 1], [4]]
+
+
+def test_cursor_with_null_sort_value_is_accepted():
+    parsed = query(sort='fatigueScore', cursor=cursor(None, 2))
+    assert parsed['cursor'] == (None, 2)
+    assert [c['emp_id'] for c in paginate(CREW, 'emp_id', **parsed)['items']] == [5]
+
+
+@pytest.mark.parametrize('sort, bad_cursor', [
+    ('fatigueScore', cursor('80', 1)),  # Text where the field is numeric
+    ('name', cursor(80, 1)),  # Number where the field is text
+    ('emp_id', cursor(True, 1)),  # Booleans are not numbers here
+    ('name', cursor('Asha', None)),  # The key is never null
+    ('name', cursor('Asha', '1')),
+    ('name', base64.urlsafe_b64encode(b'[1, 2, 3]').decode()),
+    ('name', 'not-a-cursor'),
+])
+def test_mistyped_cursor_is_rejected(sort, bad_cursor):
+    with pytest.raises(ValueError, match='invalid cursor'):
+        query(sort=sort, cursor=bad_cursor)
+
+
+def test_bad_limit_and_sort_are_rejected():
+    with pytest.raises(ValueError, match='limit must be an integer'):
+        query(limit='ten')
+    with pytest.raises(ValueError, match='limit must be between'):
+        query(limit='0')
+    with pytest.raises(ValueError, match='cannot sort by'):
+        query(sort='salary')
+
+
+def test_fields_project_each_item():
+    page = paginate(CREW, 'emp_id', **query(fields='fatigueScore, name', limit='2'))
+    assert page['items'] == [
+        {'emp_id': 1, 'fatigueScore': 80, 'name': 'Asha'},
+        {'emp_id': 2, 'name': 'Ravi'},
+    ]
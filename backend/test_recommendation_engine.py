@@ -0,0 +1,88 @@
+import random
+import threading
+import time
+
+from benchmark import AIRCRAFT, build_engine, make_synthetic_crew, make_synthetic_flights, sample_flight
+from data_structures import assigned_flights, minute_of_day
+
+
+def test_concurrent_reads_and_writes_keep_indexes_current():
+    engine = build_engine(make_synthetic_crew(300))
+    flight = sample_flight()
+    stop = threading.Event()
+    errors = []
+
+    def reader():
+        while not stop.is_set():
+            engine.get_recommendations(flight)
+            engine.most_rested(5)
+
+    def writer(seed):
+        rng = random.Random(seed)
+        while not stop.is_set():
+            crew = rng.choice(engine.crew_members)
+            engine.update_crew(crew.emp_id, {
+                'availability': rng.choice(['Available', 'Assigned', 'Backup']),
+                'certifications': rng.sample(AIRCRAFT, rng.randint(1, 2)),
+                'fatigueScore': rng.randint(50, 100),
+            })
+            standby = engine.backup_queue.dequeue()
+            if standby is not None:
+                engine.backup_queue.enqueue(standby)
+
+    def guarded(fn, *args):
+        try:
+            fn(*args)
+        except Exception as e:  # Any exception here is a race
+            errors.append(e)
+            stop.set()
+
+    threads = [threading.Thread(target=guarded, args=(reader,)) for _ in range(4)]
+    threads += [threading.Thread(target=guarded, args=(writer, seed)) for seed in range(2)]
+    for t in threads:
+        t.start()
+    time.sleep(1)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+
+    # Fatigue heap holds exactly the available crew, most rested first
+    rested = engine.most_rested(len(engine.crew_members))
+    available = {c.key: c['fatigueScore'] for c in engine.crew_members if c.availability.lower() == 'available'}
+    assert {c.key: score for c, score in rested} == available
+    assert [score for _, score in rested] == sorted(available.values(), reverse=True)
+
+    backups = {c.key for c in engine.crew_members if c.availability == 'Backup'}
+    assert set(engine.backup_queue.members) == backups
+    assert engine.get_recommendations(flight) == engine.compute_recommendations(flight)
+
+    for crew in engine.crew_members:
+        bit = 1 << crew.row
+        assert engine.bitmap_index.bitset('availability', crew.availability) & bit
+        for aircraft in AIRCRAFT:
+            certified = bool(engine.bitmap_index.bitset('certification', aircraft) & bit)
+            assert certified == (aircraft in crew.certifications)
+
+
+def test_rostered_day_respects_rest_and_duty_limit():
+    flights = make_synthetic_flights(200)
+    engine = build_engine(make_synthetic_crew(300), flights)
+    for flight in sorted(flights, key=lambda f: minute_of_day(f['departure'])):
+        for rec in engine.compute_recommendations(flight, top_k=3):
+            crew = engine.get_crew(rec['emp_id'])
+            assert engine.schedule_conflict(crew, flight) is None
+            engine.update_crew(crew.emp_id, {
+                'availability': 'Assigned',
+                'assignedFlight': flight['flightNumber'],
+                'assignedFlights': assigned_flights(crew) + [flight['flightNumber']],
+            })
+
+    travel_time = engine.location_graph.travel_time
+    assert any(len(duties) > 1 for _, duties in engine.timeline.duties.values())
+    for total, duties in engine.timeline.duties.values():
+        assert total <= engine.MAX_DUTY_MINUTES
+        for before, after in zip(duties, duties[1:]):
+            deadhead = travel_time(before[3], after[2]) if before[3] != after[2] else 0
+            assert after[0] - before[1] >= engine.MIN_REST_MINUTES + deadhead
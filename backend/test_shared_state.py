@@ -0,0 +1,139 @@
+import json
+import multiprocessing
+import random
+from collections import Counter
+
+import pytest
+
+from shared_state import SharedCrewState, StaleStateError
+
+EMP_IDS = list(range(1000, 1040))
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    path = tmp_path / 'crew_data.json'
+    path.write_text(json.dumps([{'emp_id': e, 'availability': 'Available'} for e in EMP_IDS]))
+    return str(path)
+
+
+def _claim_all(snapshot, emp_ids, seed):
+    """Worker process: try to book every crew member, in its own random order"""
+    state = SharedCrewState(snapshot)
+    order = list(emp_ids)
+    random.Random(seed).shuffle(order)
+    return [
+        emp_id for emp_id in order
+        if state.claim(emp_id, {'availability': 'Assigned'}, current='Available')[0]
+    ]
+
+
+def test_claim_books_each_crew_member_once_across_processes(snapshot):
+    SharedCrewState(snapshot)  # Create the schema before the workers race
+    with multiprocessing.Pool(4) as pool:
+        results = pool.starmap(_claim_all, [(snapshot, EMP_IDS, seed) for seed in range(4)])
+
+    bookings = Counter(emp_id for won in results for emp_id in won)
+    assert set(bookings) == set(EMP_IDS)
+    assert max(bookings.values()) == 1
+
+
+def test_poll_sees_other_instances_changes(snapshot):
+    first, second = SharedCrewState(snapshot), SharedCrewState(snapshot)
+    first.append(1000, {'availability': 'Backup'})
+    assert second.claim('1000', {'availability': 'Assigned'}) == (False, 'Backup')
+
+    changes = second.poll()
+    assert [(emp_id, fields) for _, emp_id, fields in changes] == [('1000', {'availability': 'Backup'})]
+    assert second.poll() == []
+
+
+def test_duty_list_claim_rejects_stale_value(snapshot):
+    first, second = SharedCrewState(snapshot), SharedCrewState(snapshot)
+    ok, seen = first.claim(1000, {'assignedFlights': ['AI-202']}, expected=None, field='assignedFlights')
+    assert (ok, seen) == (True, None)
+
+    # second still believes the duty list is empty
+    ok, seen = second.claim(1000, {'assignedFlights': ['AI-445']}, expected=None, field='assignedFlights')
+    assert (ok, seen) == (False, ['AI-202'])
+
+    changes = {'assignedFlights': ['AI-202', 'AI-445']}
+    assert second.claim(1000, changes, expected=['AI-202'], field='assignedFlights') == (True, ['AI-202'])
+
+
+def test_compaction_keeps_previous_generation_replayable(snapshot):
+    writer, lagging = SharedCrewState(snapshot), SharedCrewState(snapshot)
+    with open(snapshot) as f:
+        crew = json.load(f)
+
+    writer.append(1000, {'availability': 'Assigned'})
+    writer.poll()
+    crew[0]['availability'] = 'Assigned'
+    assert writer.compact(crew)
+
+    # One generation behind: the retained rows still replay
+    assert [emp_id for _, emp_id, _ in lagging.poll()] == ['1000']
+
+    writer.append(1001, {'availability': 'Assigned'})
+    assert not lagging.compact(crew)  # Unpolled write from another instance
+    writer.poll()
+    crew[1]['availability'] = 'Assigned'
+    assert writer.compact(crew)
+
+    stale = SharedCrewState(snapshot)
+    with pytest.raises(StaleStateError):
+        stale.poll()
+
+
+def test_claim_values_follow_an_edited_snapshot(snapshot):
+    state = SharedCrewState(snapshot)
+    with open(snapshot) as f:
+        crew = json.load(f)
+    assert state.claim(1000, {'availability': 'Assigned'}, current='Available')[0]
+    crew[0]['availability'] = 'Assigned'
+    assert state.compact(crew)
+    state.append(1001, {'availability': 'Backup'})
+    crew[1]['availability'] = 'Backup'
+    assert state.compact(crew)
+
+    # Reset in the snapshot, as fix_all_availability.py does, then restart
+    for record in crew:
+        record['availability'] = 'Available'
+    with open(snapshot, 'w') as f:
+        json.dump(crew, f)
+    restarted = SharedCrewState(snapshot)
+    with open(snapshot) as f:
+        crew = json.load(f)
+    restarted.replay(crew)
+
+    assert crew[0]['availability'] == 'Available'
+    assert restarted.claim(1000, {'availability': 'Assigned'}, current='Available') == (True, 'Available')
+    # 1001's change is still in the retained generation, so it still counts
+    assert restarted.claim(1001, {'availability': 'Assigned'}, current='Available') == (False, 'Backup')
+
+
+def test_own_changes_are_not_polled_back(snapshot):
+    first, second = SharedCrewState(snapshot), SharedCrewState(snapshot)
+    assert first.claim(1000, {'availability': 'Assigned'}, current='Available')[0]
+    first.append(1001, {'availability': 'Backup'})
+    assert first.poll() == []
+
+    # A change from another instance in between: poll returns it and ours after it
+    second.append(1002, {'availability': 'Backup'})
+    first.append(1003, {'availability': 'Backup'})
+    assert [emp_id for _, emp_id, _ in first.poll()] == ['1002', '1003']
+    # second was behind when it wrote, so its own change comes back in order
+    assert [emp_id for _, emp_id, _ in second.poll()] == ['1000', '1001', '1002', '1003']
+
+
+def test_claim_refuses_snapshot_value_older_than_the_log(snapshot):
+    writer, lagging = SharedCrewState(snapshot), SharedCrewState(snapshot)
+    with open(snapshot) as f:
+        crew = json.load(f)
+    for emp_id, record in zip((1000, 1001), crew):
+        writer.append(emp_id, {'availability': 'Assigned'})
+        record['availability'] = 'Assigned'
+        assert writer.compact(crew)
+
+    # lagging never polled: its 'Available' for 1000 predates both compactions
+    assert lagging.claim(1000, {'availability': 'Assigned'}, current='Available') == (False, 'Available')
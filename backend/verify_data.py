@@ -1,4 +1,5 @@
 import json
+from data_structures import RosterAggregates
 
 # Load and verify crew data
 with open('data/crew_data.json', 'r', encoding='utf-8') as f:
@@ -40,28 +41,16 @@ if missing_fields:
 else:
     print(f"\n✓ All {len(required_fields)} required fields present")
 
-# Statistics
-designations = {}
-locations = {}
-certifications_count = {}
-availability_status = {}
-
-for crew in crew_data:
-    # Designation distribution
-    desg = crew.get('designation', 'Unknown')
-    designations[desg] = designations.get(desg, 0) + 1
-    
-    # Location distribution
-    loc = crew.get('baseLocation', 'Unknown')
-    locations[loc] = locations.get(loc, 0) + 1
-    
-    # Availability status
-    avail = crew.get('availability', 'Unknown')
-    availability_status[avail] = availability_status.get(avail, 0) + 1
-    
-    # Certifications
-    for cert in crew.get('certifications', []):
-        certifications_count[cert] = certifications_count.get(cert, 0) + 1
+# Statistics (the same running counters the backend keeps for the dashboard)
+aggregates = RosterAggregates(crew_data)
+designations = aggregates.designation_counts
+locations = aggregates.base_counts
+certifications_count = aggregates.cert_counts
+# The counters label a missing status 'MISSING'; this report has always said 'Unknown'
+availability_status = {
+    'Unknown' if status == 'MISSING' else status: count
+    for status, count in aggregates.availability_counts.items()
+}
 
 print("\n" + "="*70)
 print("DATA DISTRIBUTION ANALYSIS")
@@ -84,9 +73,9 @@ for status, count in sorted(availability_status.items()):
     print(f"   {status}: {count} ({count/len(crew_data)*100:.1f}%)")
 
 # Score analysis
-avg_fatigue = sum(c.get('fatigueScore', 0) for c in crew_data) / len(crew_data)
-avg_performance = sum(c.get('performanceScore', 0) for c in crew_data) / len(crew_data)
-avg_reliability = sum(c.get('reliabilityScore', 0) for c in crew_data) / len(crew_data)
+avg_fatigue = aggregates.average('fatigueScore')
+avg_performance = aggregates.average('performanceScore')
+avg_reliability = aggregates.average('reliabilityScore')
 
 print("\nAverage Scores:")
 print(f"   Fatigue Score: {avg_fatigue:.2f}")
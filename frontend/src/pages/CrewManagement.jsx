@@ -3,20 +3,36 @@ import { useLocation } from 'react-router-dom';
 import CrewTable from '../components/CrewTable';
 import api from '../services/api';
 
+// Only the fields CrewTable renders
+const CREW_TABLE_FIELDS = [
+  'name', 'designation', 'baseLocation', 'hoursWorked7d', 'hoursWorked30d',
+  'performanceScore', 'reliabilityScore', 'yearsExperience', 'totalFlightHours',
+  'availability', 'assignedFlight',
+].join(',');
+const PAGE_SIZE = 100;
+
 export default function CrewManagement() {
   const [crew, setCrew] = useState([]);
+  const [total, setTotal] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const location = useLocation();
 
   useEffect(() => {
     loadCrew();
   }, [location]); // Refetch when navigating to this page
 
+  const fetchPage = (cursor) =>
+    api.getAllCrew({ limit: PAGE_SIZE, fields: CREW_TABLE_FIELDS, cursor: cursor || undefined });
+
   const loadCrew = async () => {
     setLoading(true);
     try {
-      const response = await api.getAllCrew();
-      setCrew(response.data);
+      const response = await fetchPage(null);
+      setCrew(response.data.items);
+      setTotal(response.data.total);
+      setNextCursor(response.data.nextCursor);
     } catch (error) {
       console.error('Error loading crew:', error);
     } finally {
@@ -24,6 +40,19 @@ export default function CrewManagement() {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await fetchPage(nextCursor);
+      setCrew((current) => [...current, ...response.data.items]);
+      setNextCursor(response.data.nextCursor);
+    } catch (error) {
+      console.error('Error loading crew:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading) {
     return (
       <div className="flex items-center justify-center h-96">
@@ -36,10 +65,21 @@ export default function CrewManagement() {
     <div className="max-w-7xl mx-auto px-6 py-8">
       <div className="mb-6">
         <h2 className="text-2xl font-bold text-gray-900 flex items-center gap-2">
-          👥 Crew Members ({crew.length})
+          👥 Crew Members ({total})
         </h2>
       </div>
       <CrewTable crew={crew} />
+      {nextCursor && (
+        <div className="flex justify-center mt-6">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="px-6 py-2 bg-blue-600 text-white rounded-lg font-semibold hover:bg-blue-700 disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : `Load more (${crew.length} of ${total})`}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
@@ -20,10 +20,10 @@ export default function Dashboard() {
     try {
       const [statsRes, flightsRes] = await Promise.all([
         api.getDashboardStats(),
-        api.getAllFlights(),
+        api.getAllFlights({ limit: 500 }),
       ]);
       setStats(statsRes.data);
-      setFlights(flightsRes.data);
+      setFlights(flightsRes.data.items);
     } catch (error) {
       console.error('Error loading dashboard data:', error);
     } finally {
@@ -27,8 +27,11 @@ export default function Recommendations() {
 
   const loadFlights = async () => {
     try {
-      const response = await api.getAllFlights();
-      setFlights(response.data);
+      const response = await api.getAllFlights({
+        limit: 500,
+        fields: 'flightNumber,route,aircraft,departure,crewRequired,crewAssigned',
+      });
+      setFlights(response.data.items);
     } catch (error) {
       console.error('Error loading flights:', error);
     }
@@ -6,16 +6,25 @@ export const api = {
   // Dashboard
   getDashboardStats: () => axios.get(`${API_BASE}/dashboard/stats`),
   
-  // Flights
-  getAllFlights: () => axios.get(`${API_BASE}/flights`),
+  // Flights (paginated: { items, nextCursor, total })
+  getAllFlights: (params) => axios.get(`${API_BASE}/flights`, { params }),
   getFlightById: (flightNumber) => axios.get(`${API_BASE}/flights/${flightNumber}`),
   
-  // Crew
-  getAllCrew: () => axios.get(`${API_BASE}/crew`),
+  // Crew (paginated: { items, nextCursor, total })
+  getAllCrew: (params) => axios.get(`${API_BASE}/crew`, { params }),
   getCrewById: (empId) => axios.get(`${API_BASE}/crew/${empId}`),
+  // Most rested available crew, highest fatigueScore first: { items, total }
+  getRestedCrew: (limit = 10) => axios.get(`${API_BASE}/crew/rested`, { params: { limit } }),
   
   // Recommendations
   getRecommendations: (flightNumber) => axios.get(`${API_BASE}/recommendations/${flightNumber}`),
+  // flights: array of flight numbers, or 'needs_crew' for every under-staffed flight
+  getBatchRecommendations: (flights = 'needs_crew', topK = 5) =>
+    axios.post(`${API_BASE}/recommendations/batch`, { flights, top_k: topK }),
+  
+  // Disruptions: { airport, start: 'HH:MM', end: 'HH:MM' } (airport, window, or both)
+  getDisruptionImpact: (disruption, topK = 5) =>
+    axios.post(`${API_BASE}/disruptions/impact`, { ...disruption, top_k: topK }),
   
   // Assignment - NEW
   assignCrewToFlight: (empId, flightNumber) => 